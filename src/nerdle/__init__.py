@@ -1,7 +1,18 @@
+import importlib
 import os
 from os.path import dirname, abspath
 d = dirname(dirname(abspath(__file__))) # /home/kristina/desire-directory
 
 DB_DIR = os.path.join(dirname(dirname(dirname(abspath(__file__)))), "db")
 
-from . import score, solver, analysis
+
+def __getattr__(name):
+    """Imports submodules on first access (nerdle.solver, nerdle.analysis, ...), so 'import nerdle' does not pay for
+    h5py, scipy, selenium or the native scorer until they are used."""
+    if not name.startswith("_"):
+        try:
+            return importlib.import_module("." + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != "{}.{}".format(__name__, name):
+                raise
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -1,87 +1,160 @@
 """Nerdle Game tree builder and analysis of distribution of #guesses over all answers."""
 import collections
+import multiprocessing
 import numpy as np
-import scipy.stats
-from typing import Iterable, Dict
+from typing import Dict, List, Optional, Tuple
 
 from . import solver
+from .parallel import SharedArray, attach_array
 
 
 class Node:
-    def __init__(self, key, guesses, answers, score, children, hint=None, parent=None):
+    """A game tree node. 'guesses' and 'answers' are root-level keys; scores are always read from the root score
+    matrix, so nodes do not hold score sub-matrices."""
+    __slots__ = ("key", "guesses", "answers", "hint", "children", "parent")
+
+    def __init__(self, key, guesses, answers, children, hint=None, parent=None):
         self.key = key
         self.guesses = guesses
         self.answers = answers
-        self.score = score
         self.hint = hint
         self.children = children
         self.parent = parent
 
     def __repr__(self):
-        return "Node[key={}, guesses={} answers={}{}, score={}, children={}]".format(
+        return "Node[key={}, guesses={} answers={}{}, children={}]".format(
             self.key, len(self.guesses), len(self.answers),
             " " + str(self.answers) if len(self.answers) <= 10 else "",
-            self.score.shape, len(self.children))
+            len(self.children))
 
     def __str__(self):
         return repr(self)
 
     def guess_key(self, key):
         """Returns the root-level index of guess key(s) (intt or np.ndarray) of this node."""
-        node = self
-        while node.parent:
-            node = node.parent
-            key = node.guesses[key]
-        return key
+        return self.guesses[key]
 
     def answer_key(self, key):
         """Returns the root-level index of answer key(s) (intt or np.ndarray) of this node."""
-        node = self
-        while node.parent:
-            node = node.parent
-            key = node.answers[key]
-        return key
+        return self.answers[key]
 
 
 class GameTreeBuilder:
     def __init__(self, solver_data, max_answers: int = 10000000):
         self._solver_data = solver_data
-        self._score_db = solver_data.score_db.copy()[:, :max_answers]
+        # A view, not a copy: worker processes wrap a shared score database.
+        self._score_db = solver_data.score_db[:, :max_answers]
         self._solver = solver.NerdleSolver(solver_data)
         self._all_keys = solver_data.all_keys
+        self._root_answers = np.arange(self._score_db.shape[1], dtype=int)
         self._n = len(solver_data.all_keys)
+        # Children are read off the hint-partition index of the score database when the solver data has one.
+        self._partition_index = solver_data.partition_index
 
     def build(self, debug: bool = False, strategy="minimax",
               min_sample_size: int = 2000, sample_factor: float = 1.7,
               guess_coarsening_factor: float = 4) -> Node:
-        if strategy == "minimax":
-            bucket_size_functor = max_bucket_sizes
-        elif strategy == "multilevel":
-            def bucket_size_functor(a):
-                if a.shape[1] <= min_sample_size:
-                    #print(a.shape, "max_bucket_sizes")
-                    return max_bucket_sizes(a)
-                else:
-                    print(a.shape, "min_biased_multilevel_sampling")
-                    return min_biased_multilevel_sampling(
-                        a, max_bucket_sizes, min_sample_size=min_sample_size,
-                        sample_factor=sample_factor)
-        else:
-            raise ValueError("Unknown max bucket calculation strategy {}".format(strategy))
-        quantity = lambda a: bucket_size_functor(a) / a.shape[1]
-        root = Node(None, self._all_keys, self._all_keys, self._score_db, [])
+        quantity = _bucket_quantity(strategy, min_sample_size, sample_factor)
+        root = Node(None, self._all_keys, self._root_answers, [])
         pre_traversal(root, lambda node: self._process_node(
             node, quantity, guess_coarsening_factor=guess_coarsening_factor), debug=debug)
         return root
 
-    def _process_node(self, node, bucket_size_functor, guess_coarsening_factor: float = 4):
+    def num_guesses(self, strategy="minimax", min_sample_size: int = 2000, sample_factor: float = 1.7,
+                    guess_coarsening_factor: float = 4, solution_paths: bool = False,
+                    num_processes: int = 0, min_parallel_size: int = 100, root_guess: Optional[int] = None,
+                    debug: bool = False) -> Tuple[collections.Counter, Optional[Dict[int, Tuple[int]]]]:
+        """Depth-first, memory-bounded alternative to build() + TreeDepthCalculator.
+
+        Processes the same nodes in the same order as build(), but drops every subtree once it is done, so only the
+        nodes on the stack (the current path and their pending siblings) are alive at any time.
+
+        Returns (freq, paths), where freq is the distribution of #guesses over all answers, and paths maps each answer
+        key to its solution path (tuple of guess keys, ending with the answer) if solution_paths is True, otherwise
+        None. A game ends as soon as a guess is the answer: a leaf whose answer is its parent's guess is not guessed
+        again, so its #guesses is its depth, not depth + 1 as in TreeDepthCalculator.
+
+        root_guess: the key of the first guess (e.g., an opener to evaluate); searched for like at any other node if
+        None.
+
+        num_processes > 0 --> the root is processed here, and the subtrees of its children with at least
+        'min_parallel_size' answers are farmed out to a pool of 'num_processes' worker processes that read a shared
+        score database; the smaller subtrees are processed here while the workers run. Subtrees are queued largest
+        first and each idle worker takes the next one. The result equals the serial result, except that random guess
+        coarsening and multilevel sampling draw from per-subtree seeds instead of one global random sequence."""
+        quantity = _bucket_quantity(strategy, min_sample_size, sample_factor)
+        root = Node(None, self._all_keys, self._root_answers, [])
+        if num_processes <= 0:
+            return self._depth_first_num_guesses(
+                root, quantity, guess_coarsening_factor, solution_paths=solution_paths, root_guess=root_guess,
+                debug=debug)
+
+        self._process_node(root, quantity, guess_coarsening_factor=guess_coarsening_factor, guess_key=root_guess)
+        freq = collections.Counter()
+        paths = {} if solution_paths else None
+        path = (root.key[0],) if solution_paths else ()
+        parent_guess = root.key[0]
+        children = sorted(root.children, key=lambda child: len(child.answers), reverse=True)
+        large = [child for child in children if len(child.answers) >= min_parallel_size]
+        small = [child for child in children if len(child.answers) < min_parallel_size]
+        # Seeds are drawn in the parent so that a seeded run is reproducible.
+        tasks = [(child.guesses, child.answers, path, parent_guess, seed)
+                 for child, seed in zip(large, np.random.randint(0, 2 ** 31, size=len(large)))]
+        root.children = []
+
+        options = dict(strategy=strategy, min_sample_size=min_sample_size, sample_factor=sample_factor,
+                       guess_coarsening_factor=guess_coarsening_factor, solution_paths=solution_paths)
+        with SharedArray(self._score_db) as score_db, multiprocessing.Pool(
+                processes=num_processes, initializer=_init_tree_worker,
+                initargs=(self._solver_data.num_slots, self._solver_data.answers, score_db.spec, options)) as pool:
+            results = pool.imap_unordered(_tree_worker_num_guesses, tasks, chunksize=1)
+            for child in small:
+                _merge_num_guesses(freq, paths, self._depth_first_num_guesses(
+                    child, quantity, guess_coarsening_factor, depth=1, path=path, parent_guess=parent_guess,
+                    solution_paths=solution_paths))
+            for result in results:
+                _merge_num_guesses(freq, paths, result)
+        return freq, paths
+
+    def _depth_first_num_guesses(self, root: Node, quantity, guess_coarsening_factor: float,
+                                 depth: int = 0, path: Tuple[int] = (), parent_guess: Optional[int] = None,
+                                 solution_paths: bool = False, root_guess: Optional[int] = None, debug: bool = False):
+        freq = collections.Counter()
+        paths = {} if solution_paths else None
+        stack = [(root, depth, path, parent_guess)]
+        while stack:
+            node, depth, path, parent_guess = stack.pop()
+            self._process_node(node, quantity, guess_coarsening_factor=guess_coarsening_factor,
+                               guess_key=root_guess if node is root else None)
+            if debug:
+                print("\t" * depth, node)
+            if not node.children:
+                # The parent's guess was the answer (its all-correct hint ended the game).
+                solved = node.answers[0] == parent_guess
+                freq[depth if solved else depth + 1] += 1
+                if solution_paths:
+                    paths[node.answers[0]] = path if solved else path + (node.answers[0],)
+            else:
+                child_path = path + (node.key[0],) if solution_paths else path
+                stack.extend((child, depth + 1, child_path, node.key[0]) for child in reversed(node.children))
+                # Release the subtree: the children are now only referenced by the stack.
+                node.children = []
+        return freq, paths
+
+    def _process_node(self, node, bucket_size_functor, guess_coarsening_factor: float = 4,
+                      guess_key: Optional[int] = None):
+        """Finds the node's guess (or uses 'guess_key' if not None) and creates its children."""
         if len(node.answers) == 1:
             guess_is_answer = np.where(node.guesses == node.answers[0])[0]
-            if len(guess_is_answer) != 1 or not self._solver.is_correct(node.score[guess_is_answer[0], 0]):
+            if len(guess_is_answer) != 1 or \
+                    not self._solver.is_correct(self._score_db[node.guesses[guess_is_answer[0]], node.answers[0]]):
                 raise ValueError("Failed to solve game")
+        elif guess_key is not None:
+            score_row = self._score_db[guess_key, node.answers]
+            bucket_size = np.unique(score_row, return_counts=True)[1].max() / len(node.answers)
+            self._create_children(node, node.guesses, guess_key, score_row, bucket_size)
         else:
             # Coarsen in rows (guesses).
-            score = node.score
             if guess_coarsening_factor > 1 and len(node.answers) <= 0.1 * self._n:
                 # Coarsen in rows.
                 guesses = np.sort(
@@ -90,89 +163,274 @@ class GameTreeBuilder:
                      np.random.choice(np.setdiff1d(node.guesses, node.answers),
                                       size=int((self._n - len(node.answers)) / guess_coarsening_factor),
                                       replace=False))))
-                score = score[np.where(np.in1d(node.guesses, guesses))[0]]
             else:
                 guesses = node.guesses
+            # A temporary sub-matrix of the root score matrix; not stored in the node.
+            score = self._sub_score(guesses, node.answers)
 
             # Find best next guess = argmin(max bucket size).
-            answer_index = np.arange(len(node.answers), dtype=int)
             bucket_sizes = bucket_size_functor(score)
-            feasible = np.logical_not(np.in1d(np.arange(len(bucket_sizes)), answer_index))
-            bucket_size, _, guess_index_opt = min((b, k_feasible, k)
-                                                  for k, (k_feasible, b) in enumerate(zip(feasible, bucket_sizes)))
+            feasible = np.arange(len(bucket_sizes)) >= len(node.answers)
+            guess_index_opt = np.lexsort((feasible, bucket_sizes))[0]
+            bucket_size = bucket_sizes[guess_index_opt]
             guess_opt = guesses[guess_index_opt]
+            self._create_children(node, guesses, guess_opt, score[guess_index_opt], bucket_size)
+
+    def _create_children(self, node, guesses: np.ndarray, guess_key: int, score_row: np.ndarray, bucket_size):
+        """Partitions the node's answers by their score for 'guess_key' (score_row = the scores of node.answers) into
+        child nodes with the guesses 'guesses'."""
+        # Note: num_guesses() traverses depth-first and only keeps the #guesses of leaves and solution paths to
+        # reduce the memory of storing the entire tree.
+        if self._partition_index is not None:
+            hints, buckets = self._partition_index.partition(
+                guess_key, None if len(node.answers) == self._partition_index.shape[1] else node.answers)
+        else:
+            hints, buckets = _partition(score_row)
+            buckets = [node.answers[bucket] for bucket in buckets]
+        node.key = (guess_key, self._solver_data.answers[guess_key], bucket_size)
+        node.children = [
+            Node(None, guesses, bucket, [], hint=hint, parent=node)
+            for hint, bucket in zip(hints, buckets)
+        ]
 
-            # TODO: use depth-first traversal and only keep leaf depth (=#guesses) and perhaps its solution path
-            # to reduce memory of storing entire tree.
-            info = _bucket_iterable(answer_index, score[guess_index_opt])
-            node.key = (guess_opt, self._solver_data.answers[guess_opt], bucket_size)
-            node.children = [
-                Node(None, guesses, node.answers[bucket], score[:, bucket], [], hint=hint, parent=node)
-                for hint, bucket in info.items()
-            ]
+    def _sub_score(self, guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+        """Returns the root score matrix restricted to the root-level keys 'guesses' x 'answers'."""
+        score = self._score_db if answers is self._root_answers else self._score_db[:, answers]
+        return score if guesses is self._all_keys else score[guesses]
+
+
+# Worker process state of GameTreeBuilder.num_guesses(num_processes > 0).
+_TREE_WORKER = {}
+
+
+def _init_tree_worker(num_slots: int, answers, score_db_spec, options: Dict):
+    data = solver.NerdleData.from_arrays(num_slots, answers, attach_array(score_db_spec))
+    _TREE_WORKER["builder"] = GameTreeBuilder(data)
+    _TREE_WORKER["options"] = options
+
+
+def _tree_worker_num_guesses(task):
+    guesses, answers, path, parent_guess, seed = task
+    builder, options = _TREE_WORKER["builder"], _TREE_WORKER["options"]
+    np.random.seed(seed)
+    node = Node(None, guesses, answers, [])
+    quantity = _bucket_quantity(options["strategy"], options["min_sample_size"], options["sample_factor"])
+    return builder._depth_first_num_guesses(node, quantity, options["guess_coarsening_factor"], depth=1, path=path,
+                                            parent_guess=parent_guess, solution_paths=options["solution_paths"])
+
+
+def _merge_num_guesses(freq: collections.Counter, paths: Optional[Dict], result):
+    subtree_freq, subtree_paths = result
+    freq.update(subtree_freq)
+    if paths is not None:
+        paths.update(subtree_paths)
+
+
+def _bucket_quantity(strategy: str, min_sample_size: int, sample_factor: float):
+    """Returns the functor of a score sub-matrix that GameTreeBuilder minimizes to select the next guess."""
+    max_bucket_fraction = lambda a: max_bucket_sizes(a) / a.shape[1]
+    if strategy == "minimax":
+        return max_bucket_fraction
+    elif strategy == "multilevel":
+        def quantity(a):
+            if a.shape[1] <= min_sample_size:
+                return max_bucket_fraction(a)
+            else:
+                print(a.shape, "min_biased_multilevel_sampling")
+                # Seeded from the global random state, so seeded builds are reproducible.
+                return min_biased_multilevel_sampling(
+                    a, max_bucket_fraction, min_sample_size=min_sample_size,
+                    sample_factor=sample_factor, rng=np.random.default_rng(np.random.randint(2 ** 31)))
+        return quantity
+    else:
+        raise ValueError("Unknown max bucket calculation strategy {}".format(strategy))
 
 
 def max_bucket_sizes(score) -> np.ndarray:
     if score.shape[1] <= 300:
         return np.array([collections.Counter(row).most_common(1)[0][1] for row in score])
     else:
+        # Imported here rather than at module level, so that importing this module does not load scipy.
+        import scipy.stats
         return scipy.stats.mode(score, axis=1, keepdims=False)[1]
 
 
 def min_biased_multilevel_sampling(
         score, quantity, min_sample_size: int = 2000, sample_factor: float = 1.7,
-        debug: bool = False):
-    """Quantity is a functor that depends on the set of values of a row (i.e., its values is independent of column
-    ordering."""
+        rng: Optional[np.random.Generator] = None, tolerance: Optional[float] = None, delta: float = 0.05,
+        return_bounds: bool = False, tie_break: Optional[np.ndarray] = None, debug: bool = False):
+    """Estimates quantity(score) for all rows, accurately only for the rows with small values.
+
+    Quantity is a functor that depends on the set of values of a row (i.e., its values is independent of column
+    ordering). The confidence bounds assume it is a frequency in [0, 1], e.g., max bucket size / #columns, which
+    changes by at most 1 / #columns per column.
+
+    Each level draws a new column sample from 'rng' (a fresh default_rng() if None), so results are reproducible given
+    a seeded generator. Independent samples keep one unlucky sample from biasing every later level.
+
+    Ties between rows with equal estimates are broken by 'tie_break' (one sort key per row, smaller first; none if
+    None), then by row index.
+
+    If 'tolerance' is None, the active rows are halved (keeping the first rows in tie order) while the sample grows by
+    'sample_factor', which keeps the cost linear in the matrix size. Otherwise, a row is dropped only when its lower
+    confidence bound exceeds the smallest upper bound, and sampling stops once the bounds are within tolerance / 2.
+
+    Returns the estimates, or (estimates, lower bounds, upper bounds, argmin) if return_bounds is True. argmin is the
+    row with the smallest estimate among the rows still active at the end; if 'tolerance' is given, then with
+    probability >= 1 - delta its true quantity is within 'tolerance' of the exact minimum."""
     # Ensure linear complexity.
     assert sample_factor < 2
     m, n = score.shape
+    tie_break = tie_break if tie_break is not None else np.zeros(m, dtype=int)
     if n <= min_sample_size:
-        return quantity(score)
+        result = quantity(score)
+        return (result, result, result, np.lexsort((tie_break, result))[0]) if return_bounds else result
+    rng = rng if rng is not None else np.random.default_rng()
+    # Union bound over the confidence intervals of all rows, buckets (<= n per row) and sampling levels.
+    num_levels = int(np.ceil(np.log(n / min_sample_size) / np.log(sample_factor))) + 1
+    log_term = np.log(2 * m * n * num_levels / delta)
     # 'rows' is the active set of rows. As we increase the sample, result[rows] becomes more accurate; we only
-    # need a high accuracy in small result values, so we keep halving 'rows' in the loop below while increasing
-    # the sample size. [log2(m)] + 1 repeats at most.
-    rows, cols, result = np.arange(m, dtype=int), np.arange(n, dtype=int), np.zeros((m, ))
+    # need a high accuracy in small result values, so we keep shrinking 'rows' in the loop below while increasing
+    # the sample size.
+    rows, result, half_width = np.arange(m, dtype=int), np.zeros((m, )), np.zeros((m, ))
     sample_size = min_sample_size
+    argmin = 0
     while rows.size:
         if debug:
             print("#rows", len(rows), "x sample_size", sample_size, "=", len(rows) * sample_size)
-        # Select a random sample of the rows of size 'sample_size'.
-        if sample_size > len(cols):
-            raise ValueError("sample_size {} > #cols {}".format(sample_size, len(cols)))
-        col_sample = np.random.choice(cols, size=sample_size, replace=False)
-        # Calculate max bucket sizes for all elements in 'rows' using the current sample (overriding some old values).
-        quantities = quantity(score[rows][:, col_sample])
+        # Calculate the quantity for all elements in 'rows' using the current sample (overriding some old values).
+        quantities = quantity(score[np.ix_(rows, rng.choice(n, size=sample_size, replace=False))])
         result[rows] = quantities
-        if sample_size == n:
+        # Hoeffding-Serfling bound for sampling 'sample_size' of 'n' columns without replacement.
+        eps = np.sqrt(log_term / (2 * sample_size) * (1 - (sample_size - 1) / n))
+        half_width[rows] = eps
+        # Rows are in increasing index order, and lexsort is stable, so index order breaks the remaining ties.
+        order = np.lexsort((tie_break[rows], quantities))
+        argmin = rows[order[0]]
+        if sample_size == n or (tolerance is not None and 2 * eps <= tolerance):
             break
-        # Restrict rows to the smaller half of quantity value.
-        #  If the quantity distribution is sufficiently spread so that the median is not repeated many times, the
-        # loop halves len(rows), so there ~ log2(m) repeats. But what happens when the median is repeated?
-        # Truncate the list 'i' to half the size of rows, filling it with values < median and some values = median.
-        q_median = np.median(quantities)
-        i = np.where(quantities < q_median)[0]
-        i = np.concatenate((i, np.where(quantities == q_median)[0][:len(rows) // 2 - len(i)]))
-        rows = rows[i]
+        if tolerance is None:
+            # Keep exactly the smaller half of the quantity values, even when the median is repeated.
+            rows = rows[order[:len(rows) // 2]]
+        else:
+            rows = rows[quantities - eps <= np.min(quantities + eps)]
         sample_size = min(int(sample_factor * sample_size), n)
+    if return_bounds:
+        return result, np.maximum(result - half_width, 0), np.minimum(result + half_width, 1), argmin
     return result
 
 
 class TreeDepthCalculator:
     def __init__(self, node: Node):
         self.depth = {}
-        self._current_depth = 0
         self._calculate_tree_depth(node)
 
     def _calculate_tree_depth(self, node: Node):
-        self._process(node)
-        self._current_depth += 1
-        for child in node.children:
-            self._calculate_tree_depth(child)
-        self._current_depth -= 1
+        # Explicit stack instead of recursion, so deep trees do not hit the recursion limit. Visits nodes in pre-order.
+        stack = [(node, 0)]
+        while stack:
+            node, depth = stack.pop()
+            self.depth[node] = depth
+            stack.extend((child, depth + 1) for child in reversed(node.children))
+
+
+class FlatGameTree:
+    """A game tree stored in flat arrays (breadth-first node order), e.g., memory-mapped from a file written by
+    save_tree(). Supports the traversal and depth queries of the Node tree without materializing Node objects.
+
+    Node i's children are nodes child_offset[i]:child_offset[i + 1]. guess[i] is the key of the guess made at an internal
+    node (-1 at leaves), answer[i] the answer key of a leaf (-1 at internal nodes), and hint[i] the score leading from
+    the parent to node i (-1 at the root)."""
+
+    def __init__(self, guess: np.ndarray, hint: np.ndarray, child_offset: np.ndarray, answer: np.ndarray):
+        self.guess = guess
+        self.hint = hint
+        self.child_offset = child_offset
+        self.answer = answer
+        self._parent = None
 
-    def _process(self, node):
-        self.depth[node] = self._current_depth
+    @property
+    def num_nodes(self) -> int:
+        return len(self.guess)
+
+    def children(self, node: int) -> range:
+        return range(self.child_offset[node], self.child_offset[node + 1])
+
+    @property
+    def parent(self) -> np.ndarray:
+        """Parent index of each node (-1 at the root)."""
+        if self._parent is None:
+            self._parent = np.concatenate(([-1], np.repeat(np.arange(self.num_nodes), np.diff(self.child_offset))))
+        return self._parent
+
+    def depth(self) -> np.ndarray:
+        """Depth of each node, computed level by level (each level is a contiguous range of nodes)."""
+        depth = np.zeros(self.num_nodes, dtype=int)
+        start, end, level = 0, 1, 0
+        while start < end:
+            depth[start:end] = level
+            start, end, level = end, self.child_offset[end], level + 1
+        return depth
+
+    def num_guesses(self) -> collections.Counter:
+        """Distribution of #guesses over all answers: leaf depth + 1, or the leaf depth if the parent's guess was the
+        answer (see GameTreeBuilder.num_guesses())."""
+        leaves = np.flatnonzero(self.answer >= 0)
+        parent = self.parent[leaves]
+        solved_by_parent = (parent >= 0) & (self.guess[parent] == self.answer[leaves])
+        return collections.Counter((self.depth()[leaves] + 1 - solved_by_parent).tolist())
+
+    def solution_path(self, answer_key: int) -> Tuple[int]:
+        """Returns the guess keys made to solve the answer 'answer_key', ending with the answer."""
+        node = np.where(self.answer == answer_key)[0][0]
+        node = self.parent[node]
+        # The answer is not guessed again if the parent's guess was the answer.
+        path = [] if node >= 0 and self.guess[node] == answer_key else [answer_key]
+        while node >= 0:
+            path.append(self.guess[node])
+            node = self.parent[node]
+        return tuple(int(x) for x in reversed(path))
+
+    def pre_traversal(self, process_node, node: int = 0, depth: int = 0):
+        """Calls process_node(node index, depth) on every node of the subtree of 'node' in pre-order."""
+        stack = [(node, depth)]
+        while stack:
+            node, depth = stack.pop()
+            process_node(node, depth)
+            stack.extend((child, depth + 1) for child in reversed(self.children(node)))
+
+
+def save_tree(root: Node, file_name: str):
+    """Saves a game tree built by GameTreeBuilder.build() to a h5py file in the FlatGameTree format. Datasets are
+    contiguous (not chunked or compressed), so load_tree() can memory-map them."""
+    guess, hint, num_children, answer = [], [], [], []
+    level = [root]
+    while level:
+        for node in level:
+            guess.append(node.key[0] if node.children else -1)
+            hint.append(-1 if node.hint is None else node.hint)
+            num_children.append(len(node.children))
+            answer.append(-1 if node.children else node.answers[0])
+        level = [child for node in level for child in node.children]
+    import h5py
+    with h5py.File(file_name, "w") as f:
+        f.create_dataset("guess", data=np.array(guess, dtype=np.int32))
+        f.create_dataset("hint", data=np.array(hint, dtype=np.int64))
+        f.create_dataset("child_offset", data=np.concatenate(([1], 1 + np.cumsum(num_children))).astype(np.int64))
+        f.create_dataset("answer", data=np.array(answer, dtype=np.int32))
+
+
+def load_tree(file_name: str) -> FlatGameTree:
+    """Loads a game tree saved by save_tree(). The arrays are memory-mapped, not read into memory."""
+    import h5py
+    arrays = {}
+    with h5py.File(file_name, "r") as f:
+        for name in ("guess", "hint", "child_offset", "answer"):
+            dataset = f[name]
+            offset = dataset.id.get_offset()
+            arrays[name] = np.memmap(file_name, dtype=dataset.dtype, mode="r", offset=offset, shape=dataset.shape) \
+                if offset is not None else dataset[:]
+    return FlatGameTree(**arrays)
 
 
 def pre_traversal(
@@ -180,15 +438,23 @@ def pre_traversal(
         process_node,
         depth: int = 0,
         debug: bool = False):
-    process_node(node)
-    if debug: # and depth <= 1:
-        print("\t" * depth, node)
-    for child in node.children:
-        pre_traversal(child, process_node, depth=depth + 1, debug=debug)
-
-
-def _bucket_iterable(answers: Iterable, score: Iterable) -> Dict:
-    s = collections.defaultdict(list)
-    for a, v in zip(answers, score):
-        s[v].append(a)
-    return s
+    # Explicit stack instead of recursion. Children are pushed after 'process_node' is called, since it may create them.
+    stack = [(node, depth)]
+    while stack:
+        node, depth = stack.pop()
+        process_node(node)
+        if debug: # and depth <= 1:
+            print("\t" * depth, node)
+        stack.extend((child, depth + 1) for child in reversed(node.children))
+
+
+def _partition(values: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Partitions the indices of 'values' by value with one argsort. Returns the distinct values and the
+    corresponding (ascending) index buckets, ordered by first occurrence of the value."""
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_values[1:] != sorted_values[:-1])))
+    buckets = np.split(order, starts[1:])
+    # The stable sort keeps each bucket ascending, so its first element is the value's first occurrence.
+    by_first_occurrence = np.argsort(order[starts], kind="stable")
+    return sorted_values[starts][by_first_occurrence], [buckets[i] for i in by_first_occurrence]
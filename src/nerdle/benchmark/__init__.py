@@ -0,0 +1 @@
+"""Nerdle solver performance benchmarks."""
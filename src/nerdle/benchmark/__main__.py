@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Runs the benchmark suite, writes the results as JSON, and optionally flags regressions against a baseline.
+
+Usage:
+    python -m nerdle.benchmark --num_slots 5 6 --output bench.json
+    python -m nerdle.benchmark --num_slots 5 6 --output bench.json --baseline baseline.json --threshold 0.2
+Import times are reported under the "import" key of the results. Exits with status 1 if any benchmark regressed."""
+import argparse
+import json
+import sys
+
+from nerdle.benchmark import suite
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Nerdle solver benchmark suite.")
+    parser.add_argument("--num_slots", default=[5, 6], type=int, nargs="+", help="Number of slots in answer.")
+    parser.add_argument("--output", default=None, help="Path of the JSON results file.")
+    parser.add_argument("--baseline", default=None, help="Path of a JSON results file to compare against.")
+    parser.add_argument("--threshold", default=0.2, type=float,
+                        help="Relative slowdown vs. the baseline that counts as a regression.")
+    parser.add_argument("--db_dir", default=None,
+                        help="Directory of existing score databases to reuse (default: build in a temporary dir).")
+    parser.add_argument("--max_answers", default=None, type=int, help="Cap on the score database size.")
+    parser.add_argument("--repeat", default=3, type=int, help="Number of repeats of each timing.")
+    parser.add_argument("--num_games", default=20, type=int, help="Number of games to solve.")
+    parser.add_argument("--no_tree", action="store_true", help="Skip the game tree benchmarks.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = dict(machine=suite.machine_info(), results={})
+    results["results"]["import"] = suite.import_times(repeat=args.repeat)
+    for name, t in results["results"]["import"].items():
+        print("{:<36} {:.3e} s".format(name, t))
+    for num_slots in args.num_slots:
+        times = suite.run_benchmarks(num_slots, db_dir=args.db_dir, repeat=args.repeat, num_games=args.num_games,
+                                     max_answers=args.max_answers, tree=not args.no_tree)
+        results["results"][str(num_slots)] = times
+        for name, t in times.items():
+            print("{} slots {:<28} {:.3e} s".format(num_slots, name, t))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = suite.compare(results, baseline, threshold=args.threshold)
+        for r in regressions:
+            print("REGRESSION {num_slots} slots {name}: {time:.3e} s vs. baseline {baseline:.3e} s "
+                  "({ratio:.2f}x)".format(**r))
+        if regressions:
+            sys.exit(1)
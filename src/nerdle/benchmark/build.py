@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Scaling of the parallel score database build with the number of worker processes.
+
+Usage: python -m nerdle.benchmark.build --num_slots 7 8 --num_processes 1 2 4 8 --max_answers 10000"""
+import argparse
+import multiprocessing
+import time
+from typing import Dict, List, Optional
+
+from nerdle import generator, solver
+
+
+def benchmark_build_scaling(
+        num_slots: int,
+        process_counts: List[int],
+        max_answers: Optional[int] = None,
+        dtype: str = "uint32") -> List[Dict]:
+    """Builds the score database of the (first 'max_answers') answers with each number of processes in
+    'process_counts'. Returns one result dict per count with the build time, and the speedup and parallel efficiency
+    relative to the first count."""
+    answers = sorted(generator.all_answers(num_slots))[:max_answers]
+    results = []
+    for num_processes in process_counts:
+        start = time.time()
+        solver.NerdleData._create_score_database_parallel(answers, num_processes=num_processes, dtype=dtype)
+        results.append(dict(num_processes=num_processes, num_answers=len(answers), time=time.time() - start))
+    for r in results:
+        r["speedup"] = results[0]["time"] / r["time"]
+        r["efficiency"] = r["speedup"] * results[0]["num_processes"] / r["num_processes"]
+    return results
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Parallel score database build scaling benchmark.")
+    parser.add_argument("--num_slots", default=[7], type=int, nargs="+", help="Number of slots in answer.")
+    parser.add_argument("--num_processes", default=[1, multiprocessing.cpu_count()], type=int, nargs="+",
+                        help="Numbers of worker processes to compare.")
+    parser.add_argument("--max_answers", default=None, type=int, help="Cap on the score database size.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    for num_slots in args.num_slots:
+        print("{} slots".format(num_slots))
+        print("{:>10} {:>8} {:>8} {:>8} {:>10}".format("processes", "answers", "time[s]", "speedup", "efficiency"))
+        for r in benchmark_build_scaling(num_slots, args.num_processes, max_answers=args.max_answers):
+            print("{num_processes:>10} {num_answers:>8} {time:>8.2f} {speedup:>8.2f} {efficiency:>10.2f}".format(**r))
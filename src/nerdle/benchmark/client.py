@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""Per-turn latency of NerdleClient (entering a guess + reading the grid) against the local stand-in game page, in a
+headless browser. Runs offline.
+
+Usage: python -m nerdle.benchmark.client --num_games 10"""
+import argparse
+import os
+import time
+import numpy as np
+from typing import List, Dict
+
+import nerdle
+from nerdle import client, solver
+
+
+def benchmark_client(nerdle_client: client.NerdleClient, solver_data, answers: List[str]) -> Dict:
+    """Plays a game for each answer on the local page and returns per-turn latency statistics [seconds]."""
+    latencies = []
+    with client.LocalGamePage() as page:
+        for answer in answers:
+            nerdle_client.load(page.url(answer))
+            hint_generator = client._NerdleWebHintGenerator(nerdle_client)
+
+            def timed_hint_generator(guess):
+                start = time.time()
+                hint = hint_generator(guess)
+                latencies.append(time.time() - start)
+                return hint
+
+            guess_history, _, _ = solver.NerdleSolver(solver_data).solve_adversary(
+                timed_hint_generator, initial_guess=client.INITIAL_GUESS)
+            if guess_history is None or guess_history[-1] != answer:
+                raise ValueError("Failed to solve {} on the local page".format(answer))
+    latencies = np.array(latencies)
+    return dict(num_games=len(answers), num_turns=len(latencies), mean=latencies.mean(),
+                p50=np.percentile(latencies, 50), p90=np.percentile(latencies, 90),
+                p99=np.percentile(latencies, 99))
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Nerdle web client latency benchmark.")
+    parser.add_argument("--num_games", default=10, type=int, help="Number of games to play.")
+    parser.add_argument(
+        "--score_db",
+        default=os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(client.NUM_SLOTS)),
+        help="Path to score database file name.")
+    parser.add_argument("--seed", default=0, type=int, help="Random seed of the answer sample.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.makedirs(os.path.dirname(args.score_db), exist_ok=True)
+    solver_data = solver.create_solver_data(client.NUM_SLOTS, args.score_db)
+    answers = np.random.default_rng(args.seed).choice(solver_data.answers, size=args.num_games, replace=False)
+    nerdle_client = client.NerdleClient(client.headless_chrome_driver())
+    with nerdle_client:
+        result = benchmark_client(nerdle_client, solver_data, list(answers))
+    print("{num_games} games, {num_turns} turns; per-turn latency [ms]: mean {:.1f} p50 {:.1f} p90 {:.1f} "
+          "p99 {:.1f}".format(*(1000 * result[k] for k in ("mean", "p50", "p90", "p99")), **result))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""Accuracy/time trade-off of min_biased_multilevel_sampling() vs. exact max_bucket_sizes() on a score database, and
+of the approximate NerdleSolver mode vs. the exact solver over sample games.
+
+Usage: python -m nerdle.benchmark.sampling --num_slots 7 8 --num_games 100"""
+import argparse
+import os
+import time
+import numpy as np
+from typing import List, Dict, Optional
+
+import nerdle
+from nerdle import analysis, solver
+
+
+def benchmark_sampling(
+        score_db: np.ndarray,
+        tolerances: List[Optional[float]] = (None, 0.02, 0.01, 0.005),
+        min_sample_size: int = 2000,
+        sample_factor: float = 1.7,
+        seed: int = 0) -> List[Dict]:
+    """Returns one result dict per sampling configuration (tolerance=None = halving), with the exact result first."""
+    quantity = lambda a: analysis.max_bucket_sizes(a) / a.shape[1]
+    start = time.time()
+    exact = quantity(score_db)
+    exact_time = time.time() - start
+    exact_min = exact.min()
+    results = [dict(method="exact", time=exact_time, min=exact_min, argmin=int(np.argmin(exact)), error=0.0)]
+    for tolerance in tolerances:
+        start = time.time()
+        approx, lower, upper, argmin = analysis.min_biased_multilevel_sampling(
+            score_db, quantity, min_sample_size=min_sample_size, sample_factor=sample_factor,
+            rng=np.random.default_rng(seed), tolerance=tolerance, return_bounds=True)
+        elapsed = time.time() - start
+        results.append(dict(
+            method="halving" if tolerance is None else "tolerance={}".format(tolerance),
+            time=elapsed,
+            speedup=exact_time / elapsed,
+            min=approx[argmin],
+            argmin=int(argmin),
+            # True quantity of the selected guess minus the exact minimum.
+            error=exact[argmin] - exact_min,
+            bound_width=upper[argmin] - lower[argmin]))
+    return results
+
+
+# Solver configurations compared by benchmark_approximate_solver(): NerdleSolver keyword arguments.
+SOLVER_OPTIONS = (
+    dict(),
+    dict(exact_threshold=500, guess_sample_size=2000),
+    dict(exact_threshold=500, guess_sample_size=2000, tolerance=0.02),
+)
+
+
+def benchmark_approximate_solver(
+        data: solver.NerdleData,
+        answers: List[str],
+        initial_guess: str,
+        solver_options: List[Dict] = SOLVER_OPTIONS,
+        seed: int = 0) -> List[Dict]:
+    """Solves the games of 'answers' with each NerdleSolver configuration in 'solver_options'. Returns one result dict
+    per configuration with its #guesses statistics and time per game."""
+    results = []
+    for options in solver_options:
+        start = time.time()
+        num_guesses = []
+        for answer in answers:
+            guess_history, _, _ = solver.NerdleSolver(data, seed=seed, **options).solve(
+                answer, initial_guess=initial_guess)
+            num_guesses.append(len(guess_history) if guess_history is not None else None)
+        elapsed = time.time() - start
+        solved = [n for n in num_guesses if n is not None]
+        results.append(dict(
+            options=options,
+            time_per_game=elapsed / max(len(answers), 1),
+            mean_guesses=float(np.mean(solved)) if solved else None,
+            max_guesses=max(solved) if solved else None,
+            failures=len(num_guesses) - len(solved)))
+    return results
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Multilevel max-bucket sampling benchmark.")
+    parser.add_argument("--num_slots", default=[7], type=int, nargs="+",
+                        help="Number of slots in answer.")
+    parser.add_argument("--min_sample_size", default=2000, type=int, help="Initial column sample size.")
+    parser.add_argument("--seed", default=0, type=int, help="Random generator seed.")
+    parser.add_argument("--num_games", default=0, type=int,
+                        help="Number of sample games to compare the approximate and exact solvers on (0 = skip).")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    openers = solver.load_openers()
+    for num_slots in args.num_slots:
+        file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(num_slots))
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        solver_data = solver.create_solver_data(num_slots, file_name)
+        print("{} slots, score_db {}".format(num_slots, solver_data.score_db.shape))
+        print("{:<18} {:>8} {:>8} {:>8} {:>9} {:>8}".format("method", "time[s]", "speedup", "min", "error", "width"))
+        for r in benchmark_sampling(solver_data.score_db, min_sample_size=args.min_sample_size, seed=args.seed):
+            print("{:<18} {:>8.2f} {:>8.1f} {:>8.4f} {:>9.5f} {:>8.4f}".format(
+                r["method"], r["time"], r.get("speedup", 1), r["min"], r["error"], r.get("bound_width", 0)))
+        if args.num_games:
+            rng = np.random.default_rng(args.seed)
+            answers = rng.choice(solver_data.answers, size=min(args.num_games, len(solver_data.answers)),
+                                 replace=False)
+            initial_guess = solver.default_initial_guess(num_slots, openers)
+            print("{:<70} {:>10} {:>6} {:>4} {:>8}".format("solver options", "time/game", "mean", "max", "failures"))
+            for r in benchmark_approximate_solver(solver_data, answers, initial_guess, seed=args.seed):
+                print("{:<70} {:>10.3f} {:>6.3f} {:>4} {:>8}".format(
+                    str(r["options"]) if r["options"] else "exact", r["time_per_game"], r["mean_guesses"],
+                    r["max_guesses"], r["failures"]))
@@ -0,0 +1,207 @@
+"""Benchmark suite: times package import, answer generation, scoring, score database build and load, guess
+selection, full-game solving and game tree building, and compares results against a stored baseline."""
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+import nerdle
+from nerdle import analysis, generator, solver
+from nerdle.partition import PartitionIndex
+from nerdle.score import native_scorer
+
+# Modules that must only be imported on first use, not by importing the package.
+HEAVY_MODULES = ("h5py", "scipy", "selenium")
+# Modules whose import time is benchmarked.
+IMPORT_MODULES = ("nerdle", "nerdle.score", "nerdle.solver", "nerdle.analysis")
+
+
+def timeit(func: Callable, repeat: int = 3) -> float:
+    """Returns the minimum run time of func() over 'repeat' runs [seconds]."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _import_in_subprocess(module: str) -> Dict:
+    """Imports a module in a fresh interpreter. Returns the import time [seconds] and the heavy modules it loaded."""
+    code = "import json, sys, time\n" \
+           "start = time.perf_counter()\n" \
+           "import {}\n" \
+           "elapsed = time.perf_counter() - start\n" \
+           "print(json.dumps(dict(time=elapsed, heavy=[m for m in {!r} if m in sys.modules])))".format(
+               module, HEAVY_MODULES)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (os.path.dirname(os.path.dirname(nerdle.__file__)), env.get("PYTHONPATH")) if p)
+    process = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+def heavy_imports(module: str) -> List[str]:
+    """Returns the HEAVY_MODULES loaded by importing 'module' in a fresh interpreter."""
+    return _import_in_subprocess(module)["heavy"]
+
+
+def import_times(repeat: int = 3) -> Dict[str, float]:
+    """Returns the minimum time over 'repeat' fresh interpreters of importing each of IMPORT_MODULES [seconds], keyed
+    by 'import_<module>'."""
+    return {"import_{}".format(module): min(_import_in_subprocess(module)["time"] for _ in range(repeat))
+            for module in IMPORT_MODULES}
+
+
+def run_benchmarks(num_slots: int, db_dir: Optional[str] = None, repeat: int = 3, num_games: int = 20,
+                   max_answers: Optional[int] = None, tree: bool = True, seed: int = 0) -> Dict[str, float]:
+    """Runs all benchmarks for one #slots. Returns a dict of benchmark name -> time [seconds]: per call for
+    'score_single', 'filter_score_row', 'filter_bitset' and 'filter_partition', per guess row (scored against all
+    answers) for 'score_batch', per turn for 'make_guess' and 'make_guess_4_boards', per game for 'solve', and per run
+    otherwise.
+
+    The score database is built in a temporary directory unless 'db_dir' is given, in which case an existing database
+    file there is reused for all benchmarks except 'db_build' if it has the same answers as the build (otherwise the
+    build is used). max_answers caps the database size (e.g., for 8 slots)."""
+    results = {}
+    results["generate"] = timeit(lambda: list(generator.all_answers(num_slots)), repeat=repeat)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(db_dir or tmp_dir, "nerdle{}.db".format(num_slots))
+        build_file_name = os.path.join(tmp_dir, "build{}.db".format(num_slots))
+        results["db_build"] = timeit(lambda: solver.create_solver_data(
+            num_slots, build_file_name, overwrite=True, max_answers=max_answers, num_processes=0), repeat=1)
+        if os.path.exists(file_name) and not np.array_equal(_stored_answers(file_name),
+                                                            _stored_answers(build_file_name)):
+            # The existing database was built for another answer list (e.g., another max_answers): benchmark this
+            # build instead, leaving the existing file alone.
+            file_name = os.path.join(tmp_dir, "nerdle{}.db".format(num_slots))
+        if not os.path.exists(file_name):
+            # Not os.replace(): db_dir may be on another file system than the temporary directory.
+            shutil.move(build_file_name, file_name)
+        # The block-partitioned builder with a worker per core.
+        results["db_build_parallel"] = timeit(lambda: solver.create_solver_data(
+            num_slots, build_file_name, overwrite=True, max_answers=max_answers,
+            num_processes=multiprocessing.cpu_count(), min_parallel_n=0), repeat=1)
+        results["db_load"] = timeit(lambda: solver.create_solver_data(num_slots, file_name), repeat=repeat)
+        data = solver.create_solver_data(num_slots, file_name)
+
+    scorer = native_scorer()
+    answers = [str(x).encode() for x in data.answers]
+    guess = answers[0]
+    n = len(answers)
+    results["score_single"] = timeit(lambda: [scorer.score_guess(guess, answer) for answer in answers],
+                                     repeat=repeat) / n
+    results["score_batch"] = timeit(
+        lambda: [[scorer.score_guess(g, answer) for answer in answers] for g in answers[:100]], repeat=repeat) / \
+        min(100, n)
+
+    # Filtering all answers by one hint: scanning the guess's score database row vs. the bitset index vs. the
+    # hint-partition index (per call).
+    index, guess_key = data.index, 0
+    score = data.score_db[guess_key, n // 2]
+    results["filter_score_row"] = timeit(
+        lambda: [np.flatnonzero(data.score_db[guess_key] == score) for _ in range(100)], repeat=repeat) / 100
+    results["filter_bitset"] = timeit(
+        lambda: [index.answers_of_score(data.answers[guess_key], score) for _ in range(100)], repeat=repeat) / 100
+    partition_index = PartitionIndex.build(data.score_db)
+    results["filter_partition"] = timeit(
+        lambda: [partition_index.answers_of_score(guess_key, score) for _ in range(100)], repeat=repeat) / 100
+
+    # Per-turn guess selection and full games over a fixed answer sample.
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(data.answers, size=min(num_games, n), replace=False)
+    initial_guess = solver.INITIAL_GUESS.get(num_slots, data.answers[0])
+    if initial_guess not in set(data.answers):
+        initial_guess = data.answers[0]
+    turn_times = []
+    for answer in sample:
+        s = solver.NerdleSolver(data)
+        make_guess = s.make_guess
+
+        def timed_make_guess(guess_key, score):
+            start = time.perf_counter()
+            result = make_guess(guess_key, score)
+            turn_times.append(time.perf_counter() - start)
+            return result
+
+        s.make_guess = timed_make_guess
+        s.solve(answer, initial_guess=initial_guess)
+    results["make_guess"] = float(np.mean(turn_times)) if turn_times else 0.0
+
+    # Per-turn guess selection of a 4-board game over the same answers.
+    turn_times = []
+    for i in range(0, len(sample) - 3, 4):
+        s = solver.MultiBoardNerdleSolver(data, 4)
+        make_guess = s.make_guess
+
+        def timed_make_guess(guess_key, scores):
+            start = time.perf_counter()
+            result = make_guess(guess_key, scores)
+            turn_times.append(time.perf_counter() - start)
+            return result
+
+        s.make_guess = timed_make_guess
+        s.solve(list(sample[i:i + 4]), initial_guess=initial_guess)
+    if turn_times:
+        results["make_guess_4_boards"] = float(np.mean(turn_times))
+    results["solve"] = timeit(
+        lambda: [solver.NerdleSolver(data).solve(answer, initial_guess=initial_guess) for answer in sample],
+        repeat=1) / len(sample)
+
+    if tree:
+        def build_tree():
+            np.random.seed(seed)
+            analysis.GameTreeBuilder(data).build()
+        results["tree_build"] = timeit(build_tree, repeat=1)
+        num_processes = multiprocessing.cpu_count()
+        if num_processes > 1:
+            def num_guesses_parallel():
+                np.random.seed(seed)
+                analysis.GameTreeBuilder(data).num_guesses(num_processes=num_processes)
+            results["tree_num_guesses_parallel"] = timeit(num_guesses_parallel, repeat=1)
+    return results
+
+
+def _stored_answers(file_name: str) -> np.ndarray:
+    """Returns the answer list stored in a score database file, without loading its scores."""
+    import h5py
+    with h5py.File(file_name, "r") as f:
+        return f["answers"][:]
+
+
+def machine_info() -> Dict[str, str]:
+    info = dict(
+        platform=platform.platform(),
+        processor=platform.processor(),
+        python=platform.python_version(),
+        numpy=np.__version__,
+        cpu_count=multiprocessing.cpu_count())
+    try:
+        info["commit"] = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return info
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = 0.2) -> List[Dict]:
+    """Compares two benchmark result files' 'results' sections. Returns the list of regressions: benchmarks present in
+    both that are slower than the baseline by more than a factor of 1 + threshold."""
+    regressions = []
+    for num_slots, times in results["results"].items():
+        baseline_times = baseline["results"].get(num_slots, {})
+        for name, t in times.items():
+            baseline_time = baseline_times.get(name)
+            if baseline_time and t > (1 + threshold) * baseline_time:
+                regressions.append(dict(num_slots=num_slots, name=name, time=t, baseline=baseline_time,
+                                        ratio=t / baseline_time))
+    return regressions
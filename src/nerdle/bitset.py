@@ -0,0 +1,97 @@
+"""Packed bitset index over an answer list, for filtering candidates by a hint without a score database.
+
+Bit i of a bitset (bit i % 64 of np.uint64 word i // 64) stands for answer i. The index holds one bitset per (slot,
+symbol) -- the answers with that symbol in that slot -- and one per (symbol, k) -- the answers with at least k
+occurrences of the symbol. The answers consistent with a (guess, score) pair are then a few AND / AND NOT operations:
+    CORRECT in slot i:           AND (i, guess[i])
+    PRESENT or ABSENT in slot i: AND NOT (i, guess[i])
+    symbol c with f = #CORRECT + #PRESENT hints on c: AND (c, f); if c also has an ABSENT hint, AND NOT (c, f + 1),
+    i.e., the answer has exactly f c's.
+This matches the scorer for any guess string (in the answer list or not) and any score it returns.
+"""
+import numpy as np
+from typing import Optional
+
+from .score import Hint, score_to_hints
+
+WORD_BITS = 64
+
+
+class BitsetIndex:
+    """Bitset index of an answer list. Bitsets are np.uint64 arrays; filter() and the other methods take and return
+    them, so successive hints can be applied without converting to answer keys in between."""
+
+    def __init__(self, answers):
+        """answers: array or sequence of answer strings (or bytes) of the same size."""
+        answers = np.asarray(answers)
+        self.num_answers = len(answers)
+        self.num_slots = len(answers[0]) if self.num_answers else 0
+        chars = np.ascontiguousarray(answers, dtype="S{}".format(self.num_slots)).view(np.uint8).reshape(
+            self.num_answers, self.num_slots)
+        # Symbols that appear in some answer; other symbols (e.g., in a guess) match no answer.
+        self._symbols = np.unique(chars)
+        self._symbol_index = {chr(symbol): i for i, symbol in enumerate(self._symbols)}
+        self._position = np.stack([np.stack([self._pack(chars[:, slot] == symbol) for symbol in self._symbols])
+                                   for slot in range(self.num_slots)])
+        counts = np.stack([(chars == symbol).sum(axis=1) for symbol in self._symbols])
+        self._min_count = np.stack([np.stack([self._pack(count >= k) for k in range(self.num_slots + 2)])
+                                    for count in counts])
+        self._empty = np.zeros(self._num_words, dtype=np.uint64)
+
+    @property
+    def _num_words(self) -> int:
+        return (self.num_answers + WORD_BITS - 1) // WORD_BITS
+
+    def _pack(self, mask: np.ndarray) -> np.ndarray:
+        bits = np.zeros(self._num_words * 8, dtype=np.uint8)
+        packed = np.packbits(mask, bitorder="little")
+        bits[:len(packed)] = packed
+        return bits.view(np.uint64)
+
+    def all(self) -> np.ndarray:
+        """Returns the bitset of all answers."""
+        return self._pack(np.ones(self.num_answers, dtype=bool))
+
+    def filter(self, guess: str, score: int, bits: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns the bitset of the answers in 'bits' (all if None) whose score for 'guess' is 'score'."""
+        bits = self.all() if bits is None else bits.copy()
+        found, absent = {}, set()
+        for slot, (symbol, hint) in enumerate(zip(guess, score_to_hints(score, len(guess)))):
+            position = self._position_bits(slot, symbol)
+            if hint == Hint.CORRECT:
+                bits &= position
+            else:
+                bits &= ~position
+            if hint == Hint.ABSENT:
+                absent.add(symbol)
+            found[symbol] = found.get(symbol, 0) + (hint != Hint.ABSENT)
+        for symbol, count in found.items():
+            if count > 0:
+                bits &= self._min_count_bits(symbol, count)
+            if symbol in absent:
+                bits &= ~self._min_count_bits(symbol, count + 1)
+        return bits
+
+    def _position_bits(self, slot: int, symbol: str) -> np.ndarray:
+        i = self._symbol_index.get(symbol)
+        return self._empty if i is None else self._position[slot, i]
+
+    def _min_count_bits(self, symbol: str, count: int) -> np.ndarray:
+        i = self._symbol_index.get(symbol)
+        return self._empty if i is None or count > self.num_slots else self._min_count[i, count]
+
+    def keys(self, bits: np.ndarray) -> np.ndarray:
+        """Returns the answer keys (indices) in a bitset, in increasing order."""
+        # Only unpack the nonzero words, since filtered bitsets are sparse.
+        words = np.flatnonzero(bits)
+        word, bit = np.nonzero(np.unpackbits(bits[words].view(np.uint8), bitorder="little").reshape(-1, WORD_BITS))
+        return words[word] * WORD_BITS + bit
+
+    def answers_of_score(self, guess: str, score: int, bits: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns the keys of the answers in 'bits' (all if None) whose score for 'guess' is 'score'."""
+        return self.keys(self.filter(guess, score, bits))
+
+    @staticmethod
+    def count(bits: np.ndarray) -> int:
+        """Returns the number of answers in a bitset."""
+        return int(np.unpackbits(bits.view(np.uint8)).sum())
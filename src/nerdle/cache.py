@@ -0,0 +1,92 @@
+"""Transposition cache of best guesses across games.
+
+Games often reach the same set of remaining answers through different guess/hint paths. The best guess depends only
+on that set (and the solver options), so it is cached under a fingerprint of the sorted answer keys: a bounded
+in-process LRU, optionally backed by a sqlite file that several processes (e.g., service replicas or evaluation
+workers) can share.
+"""
+import collections
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from typing import Dict, Optional
+
+
+class GuessCache:
+    """Bounded LRU cache of guess keys by candidate-set fingerprint, with an optional on-disk sqlite store.
+
+    Thread-safe. Use as a context manager (or call close()) to close the store."""
+
+    def __init__(self, max_size: int = 100000, file_name: Optional[str] = None):
+        """max_size: maximum #entries kept in memory. file_name: sqlite file of the shared store (none if None); entries
+        evicted from memory stay in the store."""
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = None
+        if file_name is not None:
+            self._db = sqlite3.connect(file_name, timeout=60, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS guesses (key BLOB PRIMARY KEY, guess INTEGER NOT NULL)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    @staticmethod
+    def fingerprint(answer_keys: np.ndarray, namespace: str = "") -> bytes:
+        """Returns the cache key of a candidate set: a hash of 'namespace' (e.g., the solver options and database) and
+        the sorted answer keys, so it does not depend on the path that led to the set."""
+        h = hashlib.blake2b(namespace.encode(), digest_size=16)
+        h.update(np.sort(np.asarray(answer_keys, dtype=np.int64)).tobytes())
+        return h.digest()
+
+    def get(self, key: bytes) -> Optional[int]:
+        """Returns the cached guess key, or None if not cached."""
+        with self._lock:
+            guess = self._entries.get(key)
+            if guess is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return guess
+            if self._db is not None:
+                row = self._db.execute("SELECT guess FROM guesses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._insert(key, row[0])
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, guess: int):
+        guess = int(guess)
+        with self._lock:
+            self._insert(key, guess)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO guesses (key, guess) VALUES (?, ?)", (key, guess))
+
+    def _insert(self, key: bytes, guess: int):
+        self._entries[key] = guess
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        """Returns the #lookups served from memory ('hits') and from the store ('disk_hits'), the #misses, the hit rate
+        over all lookups, and the #entries in memory."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return dict(hits=self.hits, disk_hits=self.disk_hits, misses=self.misses,
+                        hit_rate=(self.hits + self.disk_hits) / lookups if lookups else 0.0, size=len(self._entries))
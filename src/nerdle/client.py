@@ -1,14 +1,16 @@
 #!/usr/bin/env python
-"""Web client for interactively solving the Nerdle game on nerdlegame.com."""
+"""Web client for interactively solving the Nerdle game on nerdlegame.com, and a pool of browser sessions for playing
+many games concurrently (e.g., on practice or local game pages)."""
 import argparse
+import concurrent.futures
+import functools
+import http.server
 import numpy as np
 import os
-from selenium import webdriver
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+import queue
+import threading
+import urllib.parse
+from typing import Callable, Dict, List, Optional, Tuple
 
 import nerdle
 from nerdle.score import OPERATIONS, EQUALS, Hint, HINT_STRING, hints_to_score, score_to_hint_string
@@ -25,7 +27,7 @@ EMPTY = 3
 # Game grid size.
 NUM_SLOTS = 8
 MAX_GUESSES = 6
-# We use a fixed initial guess to play.
+# The initial guess to play unless another one (e.g. an opener saved by nerdle.opener) is passed in.
 INITIAL_GUESS = "9*8-7=65"
 
 BUTTON_LABEL_TO_HINT = {
@@ -36,25 +38,61 @@ STATUS_STRING = dict(list(HINT_STRING.items()) + [(EMPTY, ".")])
 
 
 SQUARE_ATTRIBUTE = "aria-label"
+# Directory of the local stand-in of the Nerdle game page (see LocalGamePage).
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Each script below replaces a WebDriver round trip per element by a single execute_script() call.
+# Returns the labels of all buttons in document order.
+_BUTTONS_SCRIPT = """
+return Array.from(document.querySelectorAll("button")).map(b => b.getAttribute(arguments[0]));
+"""
+# Clicks the buttons at a list of document-order indices, in order, if they have the expected labels; otherwise
+# (the page layout changed) clicks nothing. Returns whether the buttons were clicked.
+_CLICK_SCRIPT = """
+const buttons = document.querySelectorAll("button");
+const [indices, labels, attribute] = arguments;
+if (!indices.every((i, j) => i < buttons.length && buttons[i].getAttribute(attribute) === labels[j])) {
+  return false;
+}
+for (const i of indices) { buttons[i].click(); }
+return true;
+"""
+# Returns the labels of all grid squares in row-major order.
+_GRID_LABELS_SCRIPT = """
+return Array.from(document.querySelectorAll("div[class*='pb-grid'] div[role]")).map(e => e.getAttribute(arguments[0]));
+"""
 
 
 class NerdleClient:
     def __init__(self, driver):
         self._driver = driver
+        # Button map of the loaded page: button action -> (document-order index, label).
         self._actions = None
+        # Button maps by page (URL without query), so reloading a page does not scan its buttons again. Indices, not
+        # elements, are cached, since elements go stale when the page is reloaded.
+        self._button_maps = {}
 
     def __enter__(self):
-        pass
+        return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._driver.quit()
 
+    @property
+    def driver(self):
+        return self._driver
+
     def load(self, url):
         self._driver.get(url)
         self._wait_for_page_load()
-        button_elements = self._driver.find_elements("xpath", "//button")
-        self._actions = dict((_parse_button_label(x), x)
-                             for x in button_elements)
+        page = urllib.parse.urlsplit(url)._replace(query="", fragment="").geturl()
+        if page not in self._button_maps:
+            self._button_maps[page] = self._scan_buttons()
+        self._actions = self._button_maps[page]
+
+    def _scan_buttons(self) -> Dict[str, Tuple[int, str]]:
+        labels = self._driver.execute_script(_BUTTONS_SCRIPT, SQUARE_ATTRIBUTE)
+        return dict((_parse_button_label(label), (i, label)) for i, label in enumerate(labels) if label is not None)
 
     def exit_welcome_screen(self):
         close_button = [
@@ -64,16 +102,24 @@ class NerdleClient:
         self._click(close_button)
 
     def input_guess(self, guess):
-        for c in guess:
-            self._insert(c)
-        self._insert(ENTER)
+        if not self._click_actions(list(guess) + [ENTER]):
+            # The cached button map does not match the page: rescan it.
+            self._actions.clear()
+            self._actions.update(self._scan_buttons())
+            if not self._click_actions(list(guess) + [ENTER]):
+                raise ValueError("Failed to click the buttons of {}".format(guess))
+
+    def _click_actions(self, actions: List[str]) -> bool:
+        if not all(action in self._actions for action in actions):
+            return False
+        buttons = [self._actions[action] for action in actions]
+        return self._driver.execute_script(
+            _CLICK_SCRIPT, [i for i, _ in buttons], [label for _, label in buttons], SQUARE_ATTRIBUTE)
 
     def grid_values(self):
-        square_elements = self._driver.find_elements(
-            "xpath", "//div[contains(@class, 'pb-grid')]//div[@role]")
-        square_elements = np.array(square_elements).reshape(6, 8)
-        info = [[_parse_square(e.get_attribute(SQUARE_ATTRIBUTE))
-                 for e in row] for row in square_elements]
+        labels = self._driver.execute_script(_GRID_LABELS_SCRIPT, SQUARE_ATTRIBUTE)
+        labels = np.array(labels).reshape(MAX_GUESSES, NUM_SLOTS)
+        info = [[_parse_square(label) for label in row] for row in labels]
         value = np.array([[x[0] for x in row] for row in info])
         status = np.array([[x[1] for x in row] for row in info], dtype=int)
         return value, status
@@ -84,13 +130,13 @@ class NerdleClient:
         print("\n".join("".join(map(STATUS_STRING.get, row))
               for row in status))
 
-    def play_game(self, solver, url, live: bool = True):
+    def play_game(self, solver, url, live: bool = True, initial_guess: Optional[str] = None):
         self.load(url)
         if live:
             self.exit_welcome_screen()
         hint_generator = _NerdleWebHintGenerator(self)
 
-        guess = INITIAL_GUESS
+        guess = initial_guess if initial_guess is not None else INITIAL_GUESS
         guesses_left = MAX_GUESSES
         hint_history = []
         guess_history = [guess]
@@ -110,15 +156,17 @@ class NerdleClient:
         return success, guess_history, hint_history
 
     def _wait_for_page_load(self):
+        # selenium is imported here rather than at module level, so that importing this module does not load it.
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
         try:
             WebDriverWait(self._driver, 1).until(
                 EC.presence_of_element_located((By.CLASS_NAME, 'pb-grid')))
         except TimeoutException:
             raise TimeoutException("Loading took too much time!")
 
-    def _insert(self, symbol):
-        self._click(self._actions[symbol])
-
     def _click(self, button):
         self._driver.execute_script("arguments[0].click();", button)
 
@@ -136,9 +184,179 @@ class _NerdleWebHintGenerator:
         return hint
 
 
-def _parse_button_label(element):
-    return element.get_attribute(
-        SQUARE_ATTRIBUTE).strip().replace("minus", "-")
+def headless_chrome_driver():
+    """Returns a headless Chrome WebDriver."""
+    from selenium import webdriver
+    options = webdriver.ChromeOptions()
+    for option in (
+        "headless",
+        "disable-gpu",
+        "window-size=1920,1080",
+        "ignore-certificate-errors",
+        "no-sandbox",
+            "disable-dev-shm-usage"):
+        options.add_argument(option)
+    return webdriver.Chrome(options=options)
+
+
+class SessionPool:
+    """A pool of warmed browser sessions (NerdleClients) that plays many games concurrently, one game per session at a
+    time, with all games' solvers sharing one NerdleData.
+
+    A session that fails with a WebDriver error (e.g., a crashed or hung browser) is quit and replaced by a new one,
+    and its game is replayed on another session up to 'max_retries' times.
+
+    with SessionPool(4, warm_url=page.url("2+1+8=11")) as pool:
+        results = pool.play_games(solver_data, [page.url(answer) for answer in answers])
+    """
+
+    def __init__(self, size: int, driver_factory: Callable = headless_chrome_driver, warm_url: Optional[str] = None,
+                 max_retries: int = 1):
+        """driver_factory() returns a new WebDriver. warm_url: a page that each new session loads, so that its browser
+        is started and the page's button map is cached before the first game."""
+        self.size = size
+        self.max_retries = max_retries
+        self._driver_factory = driver_factory
+        self._warm_url = warm_url
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._clients = []
+        # Number of sessions replaced after a WebDriver error.
+        self.num_recycled = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(self._new_client) for _ in range(size)]
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        for future in futures:
+            if future.exception() is None:
+                self._add(future.result())
+        if errors:
+            self.close()
+            raise errors[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Quits all sessions."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            _quit(client)
+
+    def _new_client(self) -> NerdleClient:
+        client = NerdleClient(self._driver_factory())
+        if self._warm_url is not None:
+            try:
+                client.load(self._warm_url)
+            except BaseException:
+                _quit(client)
+                raise
+        return client
+
+    def _add(self, client: NerdleClient):
+        with self._lock:
+            self._clients.append(client)
+        self._idle.put(client)
+
+    def _recycle(self, client: NerdleClient):
+        with self._lock:
+            self._clients.remove(client)
+            self.num_recycled += 1
+        _quit(client)
+        try:
+            self._add(self._new_client())
+        except Exception:
+            with self._lock:
+                if not self._clients:
+                    # Wakes up the games waiting for a session: none is left.
+                    self._idle.put(None)
+            raise
+
+    def play_game(self, solver_data, url: str, live: bool = False, initial_guess: Optional[str] = None,
+                  solver_options: Optional[Dict] = None) -> Tuple[bool, List[str], List[int]]:
+        """Plays the game at 'url' on an idle session (waiting for one if all are busy) with a new
+        NerdleSolver(solver_data, **solver_options). Returns NerdleClient.play_game()'s result."""
+        # selenium is imported here rather than at module level, so that importing this module does not load it.
+        from selenium.common.exceptions import WebDriverException
+        for attempt in range(self.max_retries + 1):
+            client = self._idle.get()
+            if client is None:
+                self._idle.put(None)
+                raise RuntimeError("No browser session left")
+            try:
+                result = client.play_game(nerdle.solver.NerdleSolver(solver_data, **(solver_options or {})), url,
+                                          live=live, initial_guess=initial_guess)
+            except WebDriverException:
+                self._recycle(client)
+                if attempt == self.max_retries:
+                    raise
+                continue
+            except BaseException:
+                self._idle.put(client)
+                raise
+            self._idle.put(client)
+            return result
+
+    def play_games(self, solver_data, urls: List[str], live: bool = False, initial_guess: Optional[str] = None,
+                   solver_options: Optional[Dict] = None) -> List[Dict]:
+        """Plays the game at each URL, spread over all sessions. Returns a result per URL, in order: the game's
+        success, guesses and hints, or the error of a game that failed on all its attempts."""
+        def play(url):
+            try:
+                success, guesses, hints = self.play_game(
+                    solver_data, url, live=live, initial_guess=initial_guess, solver_options=solver_options)
+                return dict(url=url, success=success, guesses=guesses, hints=hints)
+            except Exception as e:
+                return dict(url=url, success=False, error="{}: {}".format(type(e).__name__, e))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(play, urls))
+
+
+def _quit(client: NerdleClient):
+    """Quits a session's browser, ignoring errors (e.g., it has already crashed)."""
+    try:
+        client.driver.quit()
+    except Exception:
+        pass
+
+
+class LocalGamePage:
+    """Serves the local stand-in of the Nerdle game page (static/nerdle.html) over HTTP in a background thread, so
+    that the client can be tested and benchmarked offline.
+
+    with LocalGamePage() as page:
+        client.play_game(solver, page.url("2+1+8=11"), live=False)
+    """
+
+    def __init__(self, port: int = 0):
+        handler = functools.partial(_QuietRequestHandler, directory=STATIC_DIR)
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def url(self, answer: str) -> str:
+        return "http://127.0.0.1:{}/nerdle.html?answer={}".format(
+            self._server.server_address[1], urllib.parse.quote(answer))
+
+
+class _QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _parse_button_label(label):
+    return label.strip().replace("minus", "-")
 
 
 def _parse_square(label):
@@ -171,40 +389,55 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Nerdle web client.")
     parser.add_argument(
         "--path",
-        required=True,
+        default="https://nerdlegame.com",
         help="Nerdle game website URL.")
     parser.add_argument(
         "--score_db",
-        default=os.path.join(nerdle.DB_DIR, "nerdle8.db".format(num_slots)),
+        default=os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS)),
         help="Path to score database file name.")
+    parser.add_argument(
+        "--time_budget",
+        default=None,
+        type=float,
+        help="Guess search time budget per turn [seconds] (default: unlimited).")
+    parser.add_argument(
+        "--local_answers",
+        default=None,
+        help="Comma-separated answers to play on the local game page instead of the live game at --path.")
+    parser.add_argument(
+        "--num_sessions",
+        default=4,
+        type=int,
+        help="Number of concurrent browser sessions playing the local games.")
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-
-    options = webdriver.ChromeOptions()
-    for option in (
-        "headless",
-        "disable-gpu",
-        "window-size=1920,1080",
-        "ignore-certificate-errors",
-        "no-sandbox",
-            "disable-dev-shm-usage"):
-        options.add_argument(option)
-    driver = webdriver.Chrome(options=options)
-
     os.makedirs(os.path.dirname(args.score_db), exist_ok=True)
-    solver_data = solver.create_solver_data(NUM_SLOTS, args.score_db)
-
-    client = NerdleClient(driver)
-    solver = solver.NerdleSolver(solver_data)
-    success, guess_history, hint_history = client.play_game(
-        solver, "https://nerdlegame.com", live=True)
-
-    print(
-        "Game result: {}, {} guesses".format(
-            "Success! :)" if success else "Failure :(",
-            len(guess_history)))
-    for guess, hint in zip(guess_history, hint_history):
-        print("{} {}".format(guess, score_to_hint_string(hint, NUM_SLOTS)))
+    solver_data = nerdle.solver.create_solver_data(NUM_SLOTS, args.score_db)
+    solver_options = dict(time_budget=args.time_budget)
+    initial_guess = nerdle.solver.load_openers().get(NUM_SLOTS, INITIAL_GUESS)
+
+    if args.local_answers:
+        answers = args.local_answers.split(",")
+        with LocalGamePage() as page, \
+                SessionPool(min(args.num_sessions, len(answers)), warm_url=page.url(answers[0])) as pool:
+            results = pool.play_games(solver_data, [page.url(answer) for answer in answers],
+                                      initial_guess=initial_guess, solver_options=solver_options)
+        for answer, result in zip(answers, results):
+            print("{} {}".format(answer, result.get("error") or " ".join(result["guesses"])))
+        print("Solved {}/{} games, {} sessions recycled".format(
+            sum(result["success"] for result in results), len(results), pool.num_recycled))
+    else:
+        with NerdleClient(headless_chrome_driver()) as client:
+            success, guess_history, hint_history = client.play_game(
+                nerdle.solver.NerdleSolver(solver_data, **solver_options), args.path, live=True,
+                initial_guess=initial_guess)
+
+        print(
+            "Game result: {}, {} guesses".format(
+                "Success! :)" if success else "Failure :(",
+                len(guess_history)))
+        for guess, hint in zip(guess_history, hint_history):
+            print("{} {}".format(guess, score_to_hint_string(hint, NUM_SLOTS)))
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""Evaluates a solver strategy (initial guess + NerdleSolver options) over all answers or a sample of them.
+
+Games are played by a pool of worker processes that read a shared score database. Per-answer results are appended to
+a JSONL file as they complete, one line per game:
+    {"answer": "54/9=6", "guesses": ["12+3=15", ..., "54/9=6"], "num_guesses": 3}
+("guesses" and "num_guesses" are null for a failed game), so an interrupted run resumes where it stopped: answers
+already in the file are skipped, and the summary covers all of them. The file starts with a header line holding the
+strategy that produced it,
+    {"config": {"num_slots": 7, "initial_guess": "12+3=15", "max_guesses": 6, "solver_options": {}}}
+and a run with a different strategy refuses to resume it.
+
+Usage:
+    python -m nerdle.evaluate --num_slots 7 --output eval7.jsonl --num_processes 4
+    python -m nerdle.evaluate --num_slots 8 --output eval8.jsonl --sample_size 1000 --exact_threshold 500
+"""
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+import nerdle
+from . import solver
+from .parallel import SharedArray, attach_array
+
+
+def evaluate(data: solver.NerdleData,
+             answers: Optional[Iterable[str]] = None,
+             output: Optional[str] = None,
+             initial_guess: Optional[str] = None,
+             max_guesses: int = 6,
+             solver_options: Optional[Dict] = None,
+             num_processes: int = 0,
+             chunksize: int = 16) -> Dict:
+    """Solves the game of each answer in 'answers' (default: all answers of 'data') with a fresh
+    NerdleSolver(data, **solver_options), starting from 'initial_guess' (default: INITIAL_GUESS of the #slots).
+
+    output: JSONL file that per-answer results are appended to; answers already in it are not played again. Raises
+    ValueError if it was written with a different #slots, initial guess, max_guesses or solver options.
+    num_processes > 0 --> games are played by a pool of that many worker processes sharing the score database;
+    otherwise they are played in this process.
+
+    Returns the summary() of all results (including previously saved ones), plus 'elapsed' [seconds] and
+    'games_per_second' of the games played by this call."""
+    initial_guess = initial_guess if initial_guess is not None else solver.INITIAL_GUESS[data.num_slots]
+    solver_options = solver_options or {}
+    answers = list(data.answers if answers is None else answers)
+    results = {}
+    if output:
+        _truncate_partial_line(output)
+        _check_config(output, dict(num_slots=data.num_slots, initial_guess=initial_guess, max_guesses=max_guesses,
+                                   solver_options=solver_options))
+        results = load_results(output)
+    todo = [answer for answer in answers if answer not in results]
+
+    start = time.time()
+    with open(output, "a") if output else _NullFile() as f:
+        for result in _play(data, todo, initial_guess, max_guesses, solver_options, num_processes, chunksize):
+            results[result["answer"]] = result
+            f.write(json.dumps(result) + "\n")
+            # Flushed per game, so that at most the game in progress is lost if the run is interrupted.
+            f.flush()
+    elapsed = time.time() - start
+
+    summary_ = summary(results[answer] for answer in answers)
+    summary_["elapsed"] = elapsed
+    summary_["games_per_second"] = len(todo) / elapsed if elapsed > 0 else 0.0
+    return summary_
+
+
+def _play(data: solver.NerdleData, answers: List[str], initial_guess: str, max_guesses: int, solver_options: Dict,
+          num_processes: int, chunksize: int):
+    """Yields the result of each answer's game, in completion order."""
+    if num_processes <= 0 or not answers:
+        for answer in answers:
+            yield _solve(data, answer, initial_guess, max_guesses, solver_options)
+        return
+    options = dict(initial_guess=initial_guess, max_guesses=max_guesses, solver_options=solver_options)
+    with SharedArray(data.score_db) as score_db, multiprocessing.Pool(
+            processes=num_processes, initializer=_init_worker,
+            initargs=(data.num_slots, data.answers, score_db.spec, options)) as pool:
+        yield from pool.imap_unordered(_worker_solve, answers, chunksize=chunksize)
+
+
+def _solve(data: solver.NerdleData, answer: str, initial_guess: str, max_guesses: int, solver_options: Dict) -> Dict:
+    guess_history, _, _ = solver.NerdleSolver(data, **solver_options).solve(
+        answer, max_guesses=max_guesses, initial_guess=initial_guess)
+    return dict(answer=answer, guesses=guess_history,
+                num_guesses=len(guess_history) if guess_history is not None else None)
+
+
+# Worker process state of evaluate(num_processes > 0).
+_WORKER = {}
+
+
+def _init_worker(num_slots: int, answers, score_db_spec, options: Dict):
+    _WORKER["data"] = solver.NerdleData.from_arrays(num_slots, answers, attach_array(score_db_spec))
+    _WORKER["options"] = options
+
+
+def _worker_solve(answer: str) -> Dict:
+    return _solve(_WORKER["data"], answer, **_WORKER["options"])
+
+
+class _NullFile:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def write(self, s: str):
+        pass
+
+    def flush(self):
+        pass
+
+
+def _check_config(file_name: str, config: Dict):
+    """Writes the header line of a new (or empty) results file; otherwise checks that the file's header matches
+    'config'."""
+    config = json.loads(json.dumps(config))
+    if not os.path.exists(file_name) or os.path.getsize(file_name) == 0:
+        with open(file_name, "w") as f:
+            f.write(json.dumps(dict(config=config)) + "\n")
+        return
+    saved = load_config(file_name)
+    if saved != config:
+        raise ValueError("Results file {} was written with config {}, not {}; use another output file".format(
+            file_name, saved, config))
+
+
+def load_config(file_name: str) -> Optional[Dict]:
+    """Returns the config in the header line of a results file (None if it has none)."""
+    with open(file_name) as f:
+        try:
+            record = json.loads(f.readline())
+        except json.JSONDecodeError:
+            return None
+    return record.get("config") if isinstance(record, dict) else None
+
+
+def _truncate_partial_line(file_name: str):
+    """Removes a truncated last line left by an interrupted run, so that appended results start on a new line."""
+    if not os.path.exists(file_name):
+        return
+    with open(file_name, "rb+") as f:
+        data = f.read()
+        f.truncate(data.rfind(b"\n") + 1)
+
+
+def load_results(file_name: str) -> Dict[str, Dict]:
+    """Loads a JSONL results file into a dict of answer -> result. A missing file has no results; the header line and a
+    truncated last line (from an interrupted run) are ignored."""
+    results = {}
+    if not os.path.exists(file_name):
+        return results
+    with open(file_name) as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "answer" in result:
+                results[result["answer"]] = result
+    return results
+
+
+def summary(results: Iterable[Dict]) -> Dict:
+    """Returns the #guesses histogram, mean and worst case over the solved games, and the failed answers."""
+    num_guesses = collections.Counter()
+    failures = []
+    for result in results:
+        if result["num_guesses"] is None:
+            failures.append(result["answer"])
+        else:
+            num_guesses[result["num_guesses"]] += 1
+    num_solved = sum(num_guesses.values())
+    return dict(
+        num_games=num_solved + len(failures),
+        num_guesses=dict(sorted(num_guesses.items())),
+        mean_guesses=sum(k * v for k, v in num_guesses.items()) / num_solved if num_solved else None,
+        max_guesses=max(num_guesses) if num_guesses else None,
+        failures=failures)
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Evaluates the Nerdle solver over all answers or a sample.")
+    parser.add_argument("--num_slots", default=6, type=int, help="Number of slots in answer.")
+    parser.add_argument("--score_db", default=None, help="Path to score database file name.")
+    parser.add_argument("--output", default=None, help="Path of the JSONL results file (appended to / resumed).")
+    parser.add_argument("--initial_guess", default=None, help="Initial guess (default: saved opener of #slots).")
+    parser.add_argument("--max_guesses", default=6, type=int, help="Maximum #guesses per game.")
+    parser.add_argument("--sample_size", default=None, type=int, help="Evaluate a random sample of answers.")
+    parser.add_argument("--seed", default=0, type=int, help="Answer sample random seed.")
+    parser.add_argument("--num_processes", default=multiprocessing.cpu_count(), type=int,
+                        help="Number of worker processes (0: play in this process).")
+    parser.add_argument("--exact_threshold", default=None, type=int,
+                        help="NerdleSolver approximate mode threshold (default: exact search).")
+    parser.add_argument("--guess_sample_size", default=None, type=int, help="NerdleSolver approximate mode option.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    score_db = args.score_db or os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(args.num_slots))
+    os.makedirs(os.path.dirname(score_db), exist_ok=True)
+    solver_data = solver.create_solver_data(args.num_slots, score_db)
+    answers = solver_data.answers
+    if args.sample_size is not None:
+        answers = np.random.default_rng(args.seed).choice(
+            answers, size=min(args.sample_size, len(answers)), replace=False).tolist()
+    solver_options = {key: getattr(args, key) for key in ("exact_threshold", "guess_sample_size")
+                      if getattr(args, key) is not None}
+    initial_guess = args.initial_guess or solver.default_initial_guess(args.num_slots, solver.load_openers())
+    print(json.dumps(evaluate(solver_data, answers, output=args.output, initial_guess=initial_guess,
+                              max_guesses=args.max_guesses, solver_options=solver_options,
+                              num_processes=args.num_processes), indent=2))
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+"""Local headless Nerdle game server (HTTP/JSON) for load-testing solvers, and a load generator that plays many
+concurrent NerdleSolver games against it.
+
+API:
+    POST /games                  {"num_slots": 6, "answer": optional}  --> {"game_id", "num_slots", "max_guesses"}
+    POST /games/<game_id>/guess  {"guess": "54/9=6"}                   --> {"score", "hint", "solved", "guesses_left"}
+
+Usage:
+    python -m nerdle.game_server serve --port 8000
+    python -m nerdle.game_server load --url http://127.0.0.1:8000 --num_slots 6 --num_games 1000 --concurrency 8
+"""
+import argparse
+import concurrent.futures
+import http.server
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import urllib.request
+import numpy as np
+from typing import Dict, List, Optional
+
+import nerdle
+from . import generator, solver
+from .score import MAX_SLOTS, score_guess, score_to_hint_string, hints_to_score, Hint
+
+MAX_GUESSES = 6
+# Largest #slots whose answer list is generated to draw random answers from (10 slots take about a minute).
+MAX_GENERATED_SLOTS = 10
+
+
+class _Game:
+    def __init__(self, answer: str, max_guesses: int):
+        self.answer = answer
+        self.guesses_left = max_guesses
+        self.solved = False
+
+
+class GameServer:
+    """Serves Nerdle games over HTTP in a background thread. Games are independent and may be played concurrently.
+
+    with GameServer() as server:
+        client = GameClient(server.url)
+    """
+
+    def __init__(self, port: int = 0, answers: Optional[Dict[int, List[str]]] = None, max_guesses: int = MAX_GUESSES,
+                 seed: Optional[int] = None):
+        """answers: answer list by #slots. Slot counts not in 'answers' are generated on first use, up to
+        MAX_GENERATED_SLOTS; games with more slots must be started with an answer."""
+        self.max_guesses = max_guesses
+        self._answers = dict(answers) if answers else {}
+        self._games = {}
+        self._game_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _handler(self))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self._server.server_address[1])
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def new_game(self, num_slots: int, answer: Optional[str] = None) -> Dict:
+        if not 5 <= num_slots <= MAX_SLOTS:
+            raise ValueError("Unsupported #slots {}".format(num_slots))
+        if answer is None and num_slots not in self._answers and num_slots > MAX_GENERATED_SLOTS:
+            raise ValueError("Too many answers to generate for {} slots; pass an answer".format(num_slots))
+        if answer is not None and len(answer) != num_slots:
+            raise ValueError("Answer {} does not have {} slots".format(answer, num_slots))
+        if answer is None:
+            with self._lock:
+                generate = num_slots not in self._answers
+            if generate:
+                # Generated outside the lock (10 slots take about a minute), so that other games are not blocked.
+                # Concurrent first requests may each generate the list; the first one stored is kept.
+                answers = list(generator.all_answers(num_slots))
+                with self._lock:
+                    self._answers.setdefault(num_slots, answers)
+        with self._lock:
+            if answer is None:
+                answer = self._random.choice(self._answers[num_slots])
+            game_id = str(next(self._game_ids))
+            self._games[game_id] = _Game(answer, self.max_guesses)
+        return dict(game_id=game_id, num_slots=num_slots, max_guesses=self.max_guesses)
+
+    def guess(self, game_id: str, guess: str) -> Dict:
+        with self._lock:
+            # Finished games are removed, so guessing in them is the same as in an unknown game (KeyError).
+            game = self._games[game_id]
+            if len(guess) != len(game.answer):
+                raise ValueError("Guess {} does not have {} slots".format(guess, len(game.answer)))
+            game.guesses_left -= 1
+            score = score_guess(guess, game.answer)
+            game.solved = score == hints_to_score([Hint.CORRECT] * len(game.answer))
+            if game.solved or game.guesses_left == 0:
+                # Keeps memory bounded under load.
+                del self._games[game_id]
+            return dict(score=score, hint=score_to_hint_string(score, len(game.answer)), solved=game.solved,
+                        guesses_left=game.guesses_left)
+
+
+def _handler(server: GameServer):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            parts = self.path.strip("/").split("/")
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("Request body must be a JSON object")
+                if parts == ["games"]:
+                    self._reply(200, server.new_game(int(body.get("num_slots", 8)), body.get("answer")))
+                elif len(parts) == 3 and parts[0] == "games" and parts[2] == "guess":
+                    self._reply(200, server.guess(parts[1], body["guess"]))
+                else:
+                    self._reply(404, dict(error="Unknown path {}".format(self.path)))
+            except KeyError as e:
+                self._reply(404, dict(error="Unknown game or missing field {}".format(e)))
+            except (TypeError, ValueError) as e:
+                self._reply(400, dict(error=str(e)))
+
+        def _reply(self, status: int, message: Dict):
+            data = json.dumps(message).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class GameClient:
+    """JSON client of a GameServer."""
+
+    def __init__(self, url: str):
+        self._url = url.rstrip("/")
+
+    def new_game(self, num_slots: int, answer: Optional[str] = None) -> Dict:
+        message = dict(num_slots=num_slots)
+        if answer is not None:
+            message["answer"] = answer
+        return self._post("/games", message)
+
+    def guess(self, game_id: str, guess: str) -> Dict:
+        return self._post("/games/{}/guess".format(game_id), dict(guess=guess))
+
+    def _post(self, path: str, message: Dict) -> Dict:
+        request = urllib.request.Request(self._url + path, data=json.dumps(message).encode(),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+
+def run_load(url: str, solver_data, num_games: int, concurrency: int = 8, initial_guess: Optional[str] = None) -> Dict:
+    """Plays 'num_games' NerdleSolver games against a game server, 'concurrency' at a time, sharing 'solver_data'.
+
+    Returns throughput (games per second), latency percentiles [seconds] of guess requests and of whole games, the
+    #guesses histogram and the number of failed (unsolved) games."""
+    num_slots = solver_data.num_slots
+    initial_guess = initial_guess if initial_guess is not None else solver.INITIAL_GUESS[num_slots]
+    client = GameClient(url)
+
+    def play(_):
+        game_id = client.new_game(num_slots)["game_id"]
+        request_latencies = []
+
+        def hint_generator(guess):
+            start = time.time()
+            score = client.guess(game_id, guess)["score"]
+            request_latencies.append(time.time() - start)
+            return score
+
+        start = time.time()
+        guess_history, _, _ = solver.NerdleSolver(solver_data).solve_adversary(
+            hint_generator, initial_guess=initial_guess)
+        return time.time() - start, guess_history, request_latencies
+
+    start = time.time()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(play, range(num_games)))
+    elapsed = time.time() - start
+
+    game_latencies = np.array([r[0] for r in results])
+    request_latencies = np.array([x for r in results for x in r[2]])
+    num_guesses = [len(r[1]) for r in results if r[1] is not None]
+    return dict(
+        num_games=num_games,
+        games_per_second=num_games / elapsed,
+        failures=num_games - len(num_guesses),
+        num_guesses=dict(sorted((k, num_guesses.count(k)) for k in set(num_guesses))),
+        request_latency=_percentiles(request_latencies),
+        game_latency=_percentiles(game_latencies))
+
+
+def _percentiles(x: np.ndarray) -> Dict[str, float]:
+    return dict(zip(("p50", "p90", "p99", "max"), np.percentile(x, [50, 90, 99, 100]).tolist()))
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Local Nerdle game server and solver load generator.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve", help="Run the game server.")
+    serve.add_argument("--port", default=8000, type=int, help="Server port.")
+    serve.add_argument("--seed", default=None, type=int, help="Answer selection random seed.")
+    load = subparsers.add_parser("load", help="Play concurrent solver games against a game server.")
+    load.add_argument("--url", default="http://127.0.0.1:8000", help="Game server URL.")
+    load.add_argument("--num_slots", default=6, type=int, help="Number of slots in answer.")
+    load.add_argument("--num_games", default=100, type=int, help="Number of games to play.")
+    load.add_argument("--concurrency", default=8, type=int, help="Number of concurrent games.")
+    load.add_argument("--score_db", default=None, help="Path to score database file name.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "serve":
+        server = GameServer(port=args.port, seed=args.seed)
+        print("Serving Nerdle games at {}".format(server.url))
+        server.serve_forever()
+    else:
+        score_db = args.score_db or os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(args.num_slots))
+        os.makedirs(os.path.dirname(score_db), exist_ok=True)
+        solver_data = solver.create_solver_data(args.num_slots, score_db)
+        initial_guess = solver.default_initial_guess(args.num_slots, solver.load_openers())
+        print(json.dumps(run_load(args.url, solver_data, args.num_games, concurrency=args.concurrency,
+                                  initial_guess=initial_guess), indent=2))
@@ -1,14 +1,17 @@
 """Generates the pace of answers of a Nerdle game."""
+import collections
 import itertools
-from typing import Tuple, List
+from typing import Tuple, List, Iterable, Iterator, Dict, Optional, Set
 
-from .score import OPERATIONS, EQUALS
+from .score import OPERATIONS, EQUALS, Hint, score_to_hints
+
+DIGITS = "0123456789"
+SYMBOLS = DIGITS + OPERATIONS + EQUALS
 
 
 def all_answers(num_slots: int, debug: bool = False) -> List[str]:
     """Generates all possible Nerdle answers of size 'num_slots'."""
     # TODO: prune the combinations we loop over.
-    # TODO: use direct evaluation instead of eval()?
 
     # If num_slots is odd, we have a corner case: X=X expressions with no ops.
     if num_slots % 2 == 1:
@@ -32,13 +35,205 @@ def all_answers(num_slots: int, debug: bool = False) -> List[str]:
                 param_lens = [(n - 1) for n in diff((-1,) + op_slot + (num_param,))]
                 if debug:
                     print("\t\t", "o".join("X" * n for n in param_lens) + " = " + "X" * num_result_slots)
-                for param_values in itertools.product(*(list(itertools.chain.from_iterable(
-                        tuple((range(10 ** (n - 1), 10 ** n), OPERATIONS) for n in param_lens)))[:-1])):
-                    s = "".join(map(str, param_values))
-                    result = eval(s)
-                    if result_range[0] <= result < result_range[1] and \
-                            (isinstance(result, int) or result.is_integer()):
-                        yield s + EQUALS + str(int(result))
+                operands = [[str(x) for x in range(10 ** (n - 1), 10 ** n)] for n in param_lens]
+                for lhs, result in _expressions(operands, [OPERATIONS] * num_ops, result_range):
+                    yield lhs + EQUALS + str(result)
+
+
+def consistent_answers(num_slots: int, history: Iterable[Tuple[str, int]], debug: bool = False) -> Iterator[str]:
+    """Generates all Nerdle answers of size 'num_slots' that are consistent with a guess history, without generating
+    the full answer list first.
+
+    'history' is a sequence of (guess, score) pairs. The per-slot and per-symbol-count constraints implied by the hints
+    are applied while looping over operation layouts and operands, so entire layouts and operand prefixes that violate
+    them are skipped. Yields answers in the same order as all_answers(num_slots), i.e., with an empty history this is
+    equivalent to all_answers(num_slots)."""
+    allowed, min_count, max_count = _hint_constraints(num_slots, history)
+
+    # X=X expressions (odd num_slots, no ops).
+    if num_slots % 2 == 1:
+        num_result_slots = num_slots // 2
+        if EQUALS in allowed[num_result_slots]:
+            for x in _numbers(allowed[:num_result_slots], lone_zero=num_result_slots == 1):
+                answer = x + EQUALS + x
+                if _satisfies_counts(answer, min_count, max_count) and \
+                        _matches(x, allowed[num_result_slots + 1:]):
+                    yield answer
+
+    for num_param in range(3, num_slots - 1):
+        if EQUALS not in allowed[num_param]:
+            continue
+        num_result_slots = num_slots - num_param - 1
+        result_allowed = allowed[num_param + 1:]
+        # The smallest and largest results whose digits satisfy the per-slot constraints.
+        result_digits = _digits(result_allowed, lone_zero=num_result_slots == 1)
+        if not all(result_digits):
+            continue
+        result_range = (int("".join(d[0] for d in result_digits)), int("".join(d[-1] for d in result_digits)) + 1)
+        for num_ops in range(1, (num_param - 1) // 2 + 1):
+            for op_slot in (combination for combination in itertools.combinations(range(1, num_param - 1), num_ops)
+                            if len(combination) == 1 or all(x > 1 for x in diff(combination))):
+                # Skip the entire layout if an op slot admits no operation.
+                ops = [[op for op in OPERATIONS if op in allowed[slot]] for slot in op_slot]
+                if not all(ops):
+                    continue
+                # Operand values compatible with the per-slot constraints; skip the layout if any operand has none.
+                bounds = (0,) + tuple(x + 1 for x in op_slot)
+                ends = op_slot + (num_param,)
+                operands = [list(_numbers(allowed[start:end], lone_zero=False)) for start, end in zip(bounds, ends)]
+                if not all(operands):
+                    continue
+                if debug:
+                    print("\t\t", "o".join("X" * (end - start) for start, end in zip(bounds, ends)) + " = " +
+                          "X" * num_result_slots, [len(x) for x in operands])
+                for lhs, result in _expressions(operands, ops, result_range, max_count):
+                    result = str(result)
+                    answer = lhs + EQUALS + result
+                    if _matches(result, result_allowed) and _satisfies_counts(answer, min_count, max_count):
+                        yield answer
+
+
+def _hint_constraints(num_slots: int, history: Iterable[Tuple[str, int]]) -> \
+        Tuple[List[Set[str]], Dict[str, int], Dict[str, int]]:
+    """Converts a guess history into per-slot allowed symbol sets and per-symbol min/max occurrence counts. A candidate
+    satisfying all of these is exactly a candidate whose score against each guess equals the recorded score."""
+    allowed = [set(SYMBOLS) for _ in range(num_slots)]
+    min_count = collections.defaultdict(int)
+    max_count = {}
+    for guess, score in history:
+        hints = score_to_hints(score, num_slots)
+        found = collections.Counter()
+        absent = set()
+        for slot, (symbol, hint) in enumerate(zip(guess, hints)):
+            if hint == Hint.CORRECT:
+                allowed[slot] &= {symbol}
+                found[symbol] += 1
+            else:
+                allowed[slot].discard(symbol)
+                if hint == Hint.PRESENT:
+                    found[symbol] += 1
+                else:
+                    absent.add(symbol)
+        for symbol, count in found.items():
+            min_count[symbol] = max(min_count[symbol], count)
+        # An ABSENT hint caps the symbol's count at the number of CORRECT + PRESENT occurrences in the guess.
+        for symbol in absent:
+            max_count[symbol] = min(max_count.get(symbol, num_slots), found[symbol])
+    for symbol, count in max_count.items():
+        if count == 0:
+            for slot_allowed in allowed:
+                slot_allowed.discard(symbol)
+    return allowed, dict(min_count), max_count
+
+
+def _numbers(allowed: List[Set[str]], lone_zero: bool) -> Iterator[str]:
+    """Yields the numbers (in increasing order) whose digits satisfy the per-slot constraints 'allowed'. No leading
+    zeros; a single 0 is allowed only if lone_zero is True."""
+    return ("".join(x) for x in itertools.product(*_digits(allowed, lone_zero)))
+
+
+def _digits(allowed: List[Set[str]], lone_zero: bool) -> List[List[str]]:
+    """Returns the digits (in increasing order) allowed in each slot of a number."""
+    digits = [[d for d in DIGITS if d in slot_allowed] for slot_allowed in allowed]
+    if not (len(digits) == 1 and lone_zero):
+        digits[0] = [d for d in digits[0] if d != "0"]
+    return digits
+
+
+def _expressions(operands: List[List[str]], ops: List[Iterable[str]], result_range: Tuple[int, int],
+                 max_count: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, int]]:
+    """Yields (lhs, result) for all left-hand sides lhs = operand op operand ... op operand, with one element of each
+    of 'operands' (numbers in increasing order) and of 'ops', whose value is an integer in result_range. Yields in the
+    order of itertools.product() over the interleaved parts, skipping every prefix that already exceeds a maximum
+    symbol count.
+
+    Values are computed exactly as eval(lhs) computes them (same operations in the same order, int or float), but
+    incrementally along the prefix instead of parsing every string. Since operands are positive, the value is monotone
+    in the last operand, so the range of last operands with a value in result_range is found by bisection."""
+    values = [[(x, int(x)) for x in operand] for operand in operands]
+    for x, value in values[0]:
+        if _within_counts(x, max_count):
+            yield from _expand(values, ops, result_range, max_count, 0, x, None, None, value)
+
+
+def _expand(values: List[List[Tuple[str, int]]], ops: List[Iterable[str]], result_range: Tuple[int, int],
+            max_count: Optional[Dict[str, int]], i: int, prefix: str, completed, pending: Optional[str], term) -> \
+        Iterator[Tuple[str, int]]:
+    """Expands the prefix 'operand op ... operand' of operands 0..i. Its value is 'completed pending term', where
+    'completed' is the value of the completed +/- terms (None if there are none), 'pending' is the +/- operation
+    before the current term, and 'term' is the current term, which following * and / operations apply to."""
+    last = len(values) - 1
+    for op in ops[i]:
+        s = prefix + op
+        if not _within_counts(s, max_count):
+            continue
+        if i + 1 == last:
+            yield from _last_operand(values[last], result_range, s, completed, pending, term, op)
+            continue
+        for x, value in values[i + 1]:
+            t = s + x
+            if not _within_counts(t, max_count):
+                continue
+            if op in "+-":
+                yield from _expand(values, ops, result_range, max_count, i + 1, t,
+                                   _combine(completed, pending, term), op, value)
+            else:
+                yield from _expand(values, ops, result_range, max_count, i + 1, t, completed, pending,
+                                   term * value if op == "*" else term / value)
+
+
+def _last_operand(values: List[Tuple[str, int]], result_range: Tuple[int, int], prefix: str, completed,
+                  pending: Optional[str], term, op: str) -> Iterator[Tuple[str, int]]:
+    if op in "+-":
+        base = _combine(completed, pending, term)
+        f = (lambda c: base + c) if op == "+" else (lambda c: base - c)
+        increasing = op == "+"
+    elif op == "*":
+        def f(c): return _combine(completed, pending, term * c)
+        increasing = pending != "-"
+    else:
+        def f(c): return _combine(completed, pending, term / c)
+        increasing = pending == "-"
+    low, high = result_range
+    if increasing:
+        start, end = _bisect(values, lambda c: f(c) >= low), _bisect(values, lambda c: f(c) >= high)
+    else:
+        start, end = _bisect(values, lambda c: f(c) < high), _bisect(values, lambda c: f(c) < low)
+    for x, c in values[start:end]:
+        result = f(c)
+        if low <= result < high and (isinstance(result, int) or result.is_integer()):
+            yield prefix + x, int(result)
+
+
+def _combine(completed, op: Optional[str], term):
+    if completed is None:
+        return term
+    return completed + term if op == "+" else completed - term
+
+
+def _bisect(values: List[Tuple[str, int]], predicate) -> int:
+    """Returns the first index whose value satisfies a predicate that is monotone (False, ..., False, True, ...)."""
+    start, end = 0, len(values)
+    while start < end:
+        middle = (start + end) // 2
+        if predicate(values[middle][1]):
+            end = middle
+        else:
+            start = middle + 1
+    return start
+
+
+def _within_counts(s: str, max_count: Optional[Dict[str, int]]) -> bool:
+    return not max_count or all(s.count(symbol) <= count for symbol, count in max_count.items())
+
+
+def _matches(s: str, allowed: List[Set[str]]) -> bool:
+    return len(s) == len(allowed) and all(c in slot_allowed for c, slot_allowed in zip(s, allowed))
+
+
+def _satisfies_counts(answer: str, min_count: Dict[str, int], max_count: Dict[str, int]) -> bool:
+    return all(answer.count(symbol) >= count for symbol, count in min_count.items()) and \
+        all(answer.count(symbol) <= count for symbol, count in max_count.items())
 
 
 def diff(x: Tuple[int]) -> Tuple[int]:
@@ -0,0 +1,134 @@
+"""Solver instrumentation: per-turn metrics sinks, an aggregating exporter, and a sampling profiler.
+
+NerdleSolver reports one record per make_guess() call to its metrics sink:
+    game: game id (one per solver), turn: turn index within the game,
+    filter, restrict, search: phase times [seconds] of answers_of_score(), restrict_by_answers() and the guess search,
+    candidates_before, candidates_after: #possible answers before/after filtering,
+    bytes_allocated: bytes of the arrays allocated by the restriction copy,
+    rows_evaluated: #guess rows evaluated by the search,
+    exact: whether the search evaluated all guesses (False if it was cut short by the solver's time budget).
+"""
+import collections
+import itertools
+import json
+import os
+import sys
+import threading
+import numpy as np
+from typing import Dict, List, Tuple
+
+PHASES = ("filter", "restrict", "search")
+
+
+class MetricsSink:
+    """Default sink: records nothing. The solver skips building records when 'enabled' is False."""
+    enabled = False
+
+    def new_game(self) -> int:
+        return 0
+
+    def record_turn(self, record: Dict):
+        pass
+
+
+class MetricsAggregator(MetricsSink):
+    """Collects the turn records of any number of games (solvers) and summarizes them."""
+    enabled = True
+
+    def __init__(self):
+        self.records = []
+        self._game_ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def new_game(self) -> int:
+        with self._lock:
+            return next(self._game_ids)
+
+    def record_turn(self, record: Dict):
+        with self._lock:
+            self.records.append(record)
+
+    def summary(self) -> Dict:
+        """Returns aggregate statistics over all recorded turns: per-phase time percentiles and totals, candidate
+        counts, allocation and rows evaluated, the #searches truncated by a time budget, and the mean turn time by
+        turn index."""
+        records = list(self.records)
+        result = dict(num_games=len(set(r["game"] for r in records)), num_turns=len(records))
+        if not records:
+            return result
+        result["phases"] = {phase: _stats([r[phase] for r in records]) for phase in PHASES}
+        result["turn_time"] = _stats([sum(r[phase] for phase in PHASES) for r in records])
+        result["candidates_before"] = _stats([r["candidates_before"] for r in records])
+        result["candidates_after"] = _stats([r["candidates_after"] for r in records])
+        result["bytes_allocated"] = _stats([r["bytes_allocated"] for r in records])
+        result["rows_evaluated"] = _stats([r["rows_evaluated"] for r in records])
+        result["truncated"] = sum(1 for r in records if not r.get("exact", True))
+        by_turn = collections.defaultdict(list)
+        for r in records:
+            by_turn[r["turn"]].append(sum(r[phase] for phase in PHASES))
+        result["mean_turn_time_by_turn"] = {turn: float(np.mean(t)) for turn, t in sorted(by_turn.items())}
+        return result
+
+    def export(self, file_name: str):
+        """Writes the summary and the raw records as JSON."""
+        with open(file_name, "w") as f:
+            json.dump(dict(summary=self.summary(), records=self.records), f, indent=2)
+
+
+def _stats(x: List[float]) -> Dict[str, float]:
+    x = np.array(x, dtype=float)
+    return dict(mean=float(x.mean()), p50=float(np.percentile(x, 50)), p95=float(np.percentile(x, 95)),
+                max=float(x.max()), total=float(x.sum()))
+
+
+class SamplingProfiler:
+    """Samples the stack of the thread that entered it every 'interval' seconds, from a background thread.
+
+    Used as a context manager around the code to profile, e.g., passed to NerdleSolver(profiler=...) to profile the
+    guess search. Samples accumulate over all entries."""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        # Innermost frame (file:function:line) -> #samples, and function (anywhere on the stack) -> #samples.
+        self.self_counts = collections.Counter()
+        self.total_counts = collections.Counter()
+        self.num_samples = 0
+        self._thread_id = None
+        self._stop = None
+        self._sampler = None
+
+    def __enter__(self):
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+            self.num_samples += 1
+            self.self_counts[_frame_name(frame, line=True)] += 1
+            functions = set()
+            while frame is not None:
+                functions.add(_frame_name(frame))
+                frame = frame.f_back
+            self.total_counts.update(functions)
+
+    def top(self, n: int = 10, cumulative: bool = False) -> List[Tuple[str, float]]:
+        """Returns the n most sampled frames (or functions anywhere on the stack if cumulative) and their fraction of
+        the samples."""
+        counts = self.total_counts if cumulative else self.self_counts
+        return [(name, count / max(self.num_samples, 1)) for name, count in counts.most_common(n)]
+
+
+def _frame_name(frame, line: bool = False) -> str:
+    code = frame.f_code
+    name = "{}:{}".format(os.path.basename(code.co_filename), code.co_name)
+    return "{}:{}".format(name, frame.f_lineno) if line else name
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Optimal opener (first guess) search.
+
+Evaluating an opener exactly means solving the game of every answer after it, so all guesses are first screened
+cheaply by the statistics of the hint buckets they split all answers into:
+    max_bucket: the largest bucket size (the worst-case #answers left after the opener),
+    num_buckets: the number of distinct hints,
+    expected_bucket: the expected #answers left, sum(bucket size^2) / #answers,
+and the 'top_k' guesses with the smallest expected bucket size (ties broken by max_bucket) are then evaluated fully:
+the game tree of each, rooted at the opener, is traversed by GameTreeBuilder.num_guesses(), by a pool of worker
+processes sharing the score database. Openers are ranked by (#failures, mean #guesses, max #guesses).
+
+The best opener can be saved as the initial guess of its #slots (see solver.save_opener()). The command-line entry
+points (evaluation, load test, benchmarks, solver service and web client) load the saved openers once and pass them on.
+
+Usage:
+    python -m nerdle.opener --num_slots 7 --top_k 20 --num_processes 4 --save
+"""
+import argparse
+import multiprocessing
+import os
+import numpy as np
+from typing import Dict, List
+
+import nerdle
+from . import analysis, solver
+from .parallel import SharedArray, attach_array
+
+
+def screen(score_db: np.ndarray, max_chunk_size: int = 1 << 24) -> Dict[str, np.ndarray]:
+    """Returns the first-turn bucket statistics (see the module docstring) of every guess (row) of the score database,
+    sorting chunks of at most 'max_chunk_size' entries at a time."""
+    num_guesses, n = score_db.shape
+    max_bucket = np.zeros(num_guesses, dtype=np.int64)
+    num_buckets = np.zeros(num_guesses, dtype=np.int64)
+    sum_squares = np.zeros(num_guesses, dtype=np.int64)
+    chunk_size = max(1, max_chunk_size // max(n, 1))
+    for start in range(0, num_guesses, chunk_size):
+        end = min(start + chunk_size, num_guesses)
+        max_bucket[start:end], num_buckets[start:end], sum_squares[start:end] = \
+            solver._max_bucket_sizes(np.asarray(score_db[start:end]), return_statistics=True)
+    return dict(max_bucket=max_bucket, num_buckets=num_buckets, expected_bucket=sum_squares / max(n, 1))
+
+
+def evaluate_opener(data: solver.NerdleData, guess_key: int, max_guesses: int = 6, seed: int = 0,
+                    strategy: str = "minimax") -> Dict:
+    """Returns the #guesses histogram, mean and max #guesses, and #failures (games taking more than 'max_guesses'
+    guesses) of the games of all answers played by the game tree rooted at the guess 'guess_key'."""
+    np.random.seed(seed)
+    freq, _ = analysis.GameTreeBuilder(data).num_guesses(strategy=strategy, root_guess=guess_key)
+    num_games = sum(freq.values())
+    return dict(
+        guess=data.answers[guess_key],
+        num_guesses=dict(sorted(freq.items())),
+        mean_guesses=sum(k * v for k, v in freq.items()) / num_games,
+        max_guesses=max(freq),
+        failures=sum(v for k, v in freq.items() if k > max_guesses))
+
+
+def search_openers(data: solver.NerdleData, top_k: int = 10, max_guesses: int = 6, num_processes: int = 0,
+                   seed: int = 0, strategy: str = "minimax") -> List[Dict]:
+    """Screens all guesses and fully evaluates the 'top_k' best screened ones (see the module docstring).
+    num_processes > 0 --> openers are evaluated by a pool of that many worker processes sharing the score database.
+
+    Returns the ranked table: one dict per evaluated opener, best first, with its screening statistics and
+    evaluate_opener() results."""
+    stats = screen(data.score_db)
+    order = np.lexsort((stats["max_bucket"], stats["expected_bucket"]))
+    candidates = [int(key) for key in order[:top_k]]
+    options = dict(max_guesses=max_guesses, seed=seed, strategy=strategy)
+    if num_processes <= 0:
+        results = [evaluate_opener(data, key, **options) for key in candidates]
+    else:
+        with SharedArray(data.score_db) as score_db, multiprocessing.Pool(
+                processes=num_processes, initializer=_init_worker,
+                initargs=(data.num_slots, data.answers, score_db.spec, options)) as pool:
+            # One opener per task: each is a full tree traversal, so the tasks are few and long.
+            results = pool.map(_worker_evaluate, candidates, chunksize=1)
+
+    table = []
+    for rank, (key, result) in enumerate(zip(candidates, results)):
+        row = dict(result, screen_rank=rank + 1, max_bucket=int(stats["max_bucket"][key]),
+                   num_buckets=int(stats["num_buckets"][key]),
+                   expected_bucket=float(stats["expected_bucket"][key]))
+        table.append(row)
+    return sorted(table, key=lambda row: (row["failures"], row["mean_guesses"], row["max_guesses"]))
+
+
+# Worker process state of search_openers(num_processes > 0).
+_WORKER = {}
+
+
+def _init_worker(num_slots: int, answers, score_db_spec, options: Dict):
+    _WORKER["data"] = solver.NerdleData.from_arrays(num_slots, answers, attach_array(score_db_spec))
+    _WORKER["options"] = options
+
+
+def _worker_evaluate(guess_key: int) -> Dict:
+    return evaluate_opener(_WORKER["data"], guess_key, **_WORKER["options"])
+
+
+def format_table(table: List[Dict]) -> str:
+    """Formats the search_openers() table as aligned text, one opener per line."""
+    lines = ["{:>4} {:<14} {:>8} {:>5} {:>8} {:>6} {:>10} {:>7}".format(
+        "rank", "guess", "mean", "max", "failures", "screen", "max_bucket", "buckets")]
+    for rank, row in enumerate(table):
+        lines.append("{:>4} {:<14} {:>8.4f} {:>5} {:>8} {:>6} {:>10} {:>7}".format(
+            rank + 1, row["guess"], row["mean_guesses"], row["max_guesses"], row["failures"], row["screen_rank"],
+            row["max_bucket"], row["num_buckets"]))
+    return "\n".join(lines)
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Searches for the best Nerdle opener (first guess).")
+    parser.add_argument("--num_slots", default=6, type=int, help="Number of slots in answer.")
+    parser.add_argument("--score_db", default=None, help="Path to score database file name.")
+    parser.add_argument("--top_k", default=10, type=int, help="Number of screened openers to evaluate fully.")
+    parser.add_argument("--max_guesses", default=6, type=int, help="Games taking more guesses are failures.")
+    parser.add_argument("--num_processes", default=multiprocessing.cpu_count(), type=int,
+                        help="Number of worker processes (0: evaluate in this process).")
+    parser.add_argument("--seed", default=0, type=int, help="Game tree random seed.")
+    parser.add_argument("--save", action="store_true",
+                        help="Save the best opener as the default initial guess of #slots.")
+    parser.add_argument("--openers_file", default=None, help="Path of the saved openers file.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    score_db = args.score_db or os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(args.num_slots))
+    os.makedirs(os.path.dirname(score_db), exist_ok=True)
+    solver_data = solver.create_solver_data(args.num_slots, score_db)
+    table = search_openers(solver_data, top_k=args.top_k, max_guesses=args.max_guesses,
+                           num_processes=args.num_processes, seed=args.seed)
+    print(format_table(table))
+    if args.save and table:
+        solver.save_opener(args.num_slots, table[0]["guess"], args.openers_file)
+        print("Saved opener {} for {} slots".format(table[0]["guess"], args.num_slots))
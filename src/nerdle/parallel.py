@@ -0,0 +1,43 @@
+"""Helpers for process pools that read or write large numpy arrays (e.g., the score database) without copying them
+into every worker. Arrays are backed by a memory-mapped temporary .npy file, so all processes share the same pages
+of the OS page cache."""
+import numpy as np
+import os
+import shutil
+import tempfile
+from typing import Tuple, Optional
+
+
+class SharedArray:
+    """A numpy array backed by a memory-mapped temporary file. Workers attach to it by its picklable 'spec'.
+
+    Use as a context manager in the parent process; the file is deleted on exit."""
+
+    def __init__(self, array: Optional[np.ndarray] = None, shape: Optional[Tuple[int, ...]] = None, dtype=None,
+                 dir: Optional[str] = None):
+        """Copies 'array' into shared memory, or creates an uninitialized shared array of shape 'shape' and dtype
+        'dtype' (for worker processes to write into) if 'array' is None."""
+        if array is not None:
+            shape, dtype = array.shape, array.dtype
+        self._dir = tempfile.mkdtemp(prefix="nerdle_shared_", dir=dir)
+        self.spec = os.path.join(self._dir, "array.npy")
+        self.array = np.lib.format.open_memmap(self.spec, mode="w+", dtype=dtype, shape=shape)
+        if array is not None:
+            self.array[...] = array
+            self.array.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.array = None
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+def attach_array(spec, writable: bool = False) -> np.ndarray:
+    """Returns a memory-mapped view of a SharedArray created in another process, given its spec. Does not copy the
+    data."""
+    return np.load(spec, mmap_mode="r+" if writable else "r")
@@ -0,0 +1,124 @@
+"""Hint-partition index of a score database: for each guess, its answers grouped by hint, in CSR layout.
+
+keys[g] holds the answer keys of guess g sorted by score (ascending keys within each score), and guess g's distinct
+scores are hints[hint_ptr[g]:hint_ptr[g + 1]] (ascending), with the bucket of the i-th one starting at
+keys[g, starts[hint_ptr[g] + i]] and ending where the next one starts (or at the end of the row). The answers of a
+(guess, score) pair are then a slice of keys[g] instead of a scan of the guess's score row.
+
+The index is saved to a h5py sidecar file next to the score database (see sidecar_file_name()), whose datasets are
+memory-mapped on load."""
+import os
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def sidecar_file_name(score_db_file_name: str) -> str:
+    """Returns the file name of the partition index of a score database file."""
+    return score_db_file_name + ".partition"
+
+
+class PartitionIndex:
+    """Hint-partition index arrays (see the module docstring). 'keys' may be memory-mapped."""
+
+    def __init__(self, keys: np.ndarray, hint_ptr: np.ndarray, hints: np.ndarray, starts: np.ndarray):
+        self.keys = keys
+        self.hint_ptr = hint_ptr
+        self.hints = hints
+        self.starts = starts
+
+    @classmethod
+    def build(cls, score_db: np.ndarray, max_chunk_size: int = 1 << 24) -> "PartitionIndex":
+        """Builds the index of a (guesses x answers) score database, argsorting chunks of at most 'max_chunk_size'
+        entries at a time."""
+        num_guesses, n = score_db.shape
+        keys = np.empty((num_guesses, n), dtype=np.min_scalar_type(max(n - 1, 0)))
+        hints, starts, num_hints = [], [], np.zeros(num_guesses, dtype=np.int64)
+        chunk_size = max(1, max_chunk_size // max(n, 1))
+        for start in range(0, num_guesses, chunk_size):
+            rows = np.asarray(score_db[start:start + chunk_size])
+            order = np.argsort(rows, axis=1, kind="stable")
+            keys[start:start + len(rows)] = order
+            sorted_rows = np.take_along_axis(rows, order, axis=1)
+            first = np.ones(sorted_rows.shape, dtype=bool)
+            first[:, 1:] = sorted_rows[:, 1:] != sorted_rows[:, :-1]
+            row, column = np.nonzero(first)
+            hints.append(sorted_rows[row, column])
+            starts.append(column)
+            num_hints[start:start + len(rows)] = first.sum(axis=1)
+        hint_ptr = np.concatenate(([0], np.cumsum(num_hints)))
+        hints = np.concatenate(hints) if hints else np.zeros(0, dtype=score_db.dtype)
+        starts = np.concatenate(starts).astype(np.int64) if starts else np.zeros(0, dtype=np.int64)
+        return cls(keys, hint_ptr, hints, starts)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.keys.shape
+
+    def _bucket(self, guess: int, i: int) -> slice:
+        end = self.hint_ptr[guess + 1]
+        return slice(self.starts[i], self.starts[i + 1] if i + 1 < end else self.keys.shape[1])
+
+    def answers_of_score(self, guess: int, score: int) -> np.ndarray:
+        """Returns the keys of the answers whose score for the guess (key) is 'score', in increasing order (a view)."""
+        begin, end = self.hint_ptr[guess], self.hint_ptr[guess + 1]
+        i = begin + np.searchsorted(self.hints[begin:end], score)
+        if i == end or self.hints[i] != score:
+            return self.keys[guess, :0]
+        return self.keys[guess, self._bucket(guess, i)]
+
+    def partition(self, guess: int, answers: Optional[np.ndarray] = None) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Partitions the answer keys 'answers' (all if None) by their score for the guess (key). Returns the distinct
+        scores and the corresponding ascending answer key (int64) buckets, ordered by their smallest key (the order of
+        analysis._partition() on the guess's score row restricted to sorted 'answers')."""
+        begin, end = self.hint_ptr[guess], self.hint_ptr[guess + 1]
+        row = self.keys[guess].astype(np.int64)
+        hints = self.hints[begin:end]
+        starts = self.starts[begin:end]
+        if answers is not None:
+            if not len(answers):
+                return hints[:0], []
+            mask = np.zeros(self.keys.shape[1], dtype=bool)
+            mask[answers] = True
+            in_answers = mask[row]
+            # Bucket sizes after the restriction, then the restricted buckets' starts within the restricted row.
+            counts = np.add.reduceat(in_answers, starts) if len(starts) else np.zeros(0, dtype=int)
+            row = row[in_answers]
+            nonempty = counts > 0
+            hints, counts = hints[nonempty], counts[nonempty]
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        buckets = np.split(row, starts[1:])
+        by_first_key = np.argsort([bucket[0] for bucket in buckets], kind="stable")
+        return hints[by_first_key], [buckets[i] for i in by_first_key]
+
+    def save(self, file_name: str):
+        """Saves the index to a h5py file. Datasets are contiguous, so load() can memory-map them."""
+        import h5py
+        with h5py.File(file_name, "w") as f:
+            for name in ("keys", "hint_ptr", "hints", "starts"):
+                f.create_dataset(name, data=getattr(self, name))
+
+    @classmethod
+    def load(cls, file_name: str) -> "PartitionIndex":
+        """Loads an index saved by save(). The arrays are memory-mapped, not read into memory."""
+        import h5py
+        arrays = {}
+        with h5py.File(file_name, "r") as f:
+            for name in ("keys", "hint_ptr", "hints", "starts"):
+                dataset = f[name]
+                offset = dataset.id.get_offset()
+                arrays[name] = np.memmap(file_name, dtype=dataset.dtype, mode="r", offset=offset,
+                                         shape=dataset.shape) if offset is not None else dataset[:]
+        return cls(**arrays)
+
+
+def load_or_build(score_db_file_name: str, score_db: np.ndarray) -> PartitionIndex:
+    """Returns the partition index of a score database from its sidecar file, or builds and saves it if the file does
+    not exist, is older than the database file or does not match the database's shape."""
+    file_name = sidecar_file_name(score_db_file_name)
+    if os.path.exists(file_name) and os.path.getmtime(file_name) >= os.path.getmtime(score_db_file_name):
+        index = PartitionIndex.load(file_name)
+        if index.shape == score_db.shape:
+            return index
+    index = PartitionIndex.build(score_db)
+    index.save(file_name)
+    return index
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""Streaming replay of recorded game logs through the solver, e.g., to re-score logged play against a new solver
+version.
+
+Input: a JSONL log, one game per line, with the guesses played and either the answer or the hints received:
+    {"id": "g1", "answer": "4*3=12", "guesses": ["54/9=6", "10-5=5", "4*3=12"]}
+    {"id": "g2", "guesses": ["54/9=6", "4*7=28"], "hints": ["-?--?-", "++++++"]}
+("id" is optional; hints may be hint strings or scores). Output: one JSONL line per game, in input order:
+    {"id": "g1", "logged": [...], "decisions": [...], "diverged_at": 1, "logged_num_guesses": 3,
+     "solver_num_guesses": 3}
+where decisions[t] is the solver's guess after the first t + 1 logged (guess, hint) turns (None once solved),
+diverged_at is the first turn t + 1 whose logged guess differs from decisions[t] (None if the play matches), and
+solver_num_guesses is the #guesses of the solver playing the game by itself from the same first guess (answer logs
+only; None if it fails). A game that cannot be replayed (including a line that is not a JSON object) is output with an
+"error" instead.
+
+Records are read lazily and processed in batches by a pool of workers sharing the score database, with a bounded
+number of batches in flight, so memory does not grow with the log size.
+
+Usage:
+    python -m nerdle.replay --num_slots 6 --input games.jsonl --output replay.jsonl --num_processes 4
+    cat games.jsonl | python -m nerdle.replay --num_slots 6 > replay.jsonl
+"""
+import argparse
+import collections
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+import nerdle
+from . import solver
+from .parallel import SharedArray, attach_array
+from .score import hint_string_to_score, score_guess
+
+
+def read_records(lines: Iterable[str]) -> Iterator[Union[Dict, str]]:
+    """Lazily parses game records from JSONL lines, skipping blank lines. A line that is not valid JSON is yielded as
+    is, so that replay_game() reports it as an error instead of stopping the stream."""
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield line
+
+
+def replay_game(data: solver.NerdleData, record: Union[Dict, str], max_guesses: int = 6) -> Dict:
+    """Replays one game record (see the module docstring), or a JSONL line of one. Returns its output record."""
+    result = dict(id=None)
+    try:
+        if isinstance(record, str):
+            record = json.loads(record)
+        if not isinstance(record, dict):
+            raise TypeError("Expected a JSON object, got {}".format(type(record).__name__))
+        result["id"] = record.get("id")
+        logged = list(record["guesses"])
+        answer = record.get("answer")
+        for guess in logged + ([answer] if answer is not None else []):
+            if len(guess) != data.num_slots:
+                raise ValueError("{} does not have {} slots".format(guess, data.num_slots))
+        if answer is not None:
+            hints = [score_guess(guess, answer) for guess in logged]
+        else:
+            hints = [hint_string_to_score(h) if isinstance(h, str) else int(h) for h in record["hints"]]
+        if not logged or len(hints) != len(logged):
+            raise ValueError("Expected one hint per guess, got {} guesses and {} hints".format(
+                len(logged), len(hints)))
+        s = solver.NerdleSolver(data)
+        decisions, diverged_at = [], None
+        for turn, (guess, score) in enumerate(zip(logged, hints)):
+            s.update_with_guess(guess, score)
+            if s.num_answers == 0:
+                raise ValueError("No answer is consistent with the hints up to turn {}".format(turn))
+            decision = None if s.is_correct(score) else s.guess_value(s.best_guess())
+            decisions.append(decision)
+            if diverged_at is None and turn + 1 < len(logged) and logged[turn + 1] != decision:
+                diverged_at = turn + 1
+        result.update(logged=logged, decisions=decisions, diverged_at=diverged_at,
+                      logged_num_guesses=len(logged) if s.is_correct(hints[-1]) else None)
+        if answer is not None:
+            result["solver_num_guesses"] = _solver_num_guesses(data, answer, logged[0], max_guesses)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        result["error"] = "{}: {}".format(type(e).__name__, e)
+    return result
+
+
+def _solver_num_guesses(data: solver.NerdleData, answer: str, opener: str, max_guesses: int) -> Optional[int]:
+    """Returns the #guesses the solver takes to solve 'answer' after the logged 'opener' (None if it fails). The
+    opener is played with update_with_guess(), so it need not be in the answer list."""
+    if opener == answer:
+        return 1
+    s = solver.NerdleSolver(data)
+    s.update_with_guess(opener, score_guess(opener, answer))
+    guess_history, _, _ = s.solve(answer, max_guesses=max_guesses - 1, initial_guess=s.guess_value(s.best_guess()))
+    return 1 + len(guess_history) if guess_history is not None else None
+
+
+def replay(data: solver.NerdleData,
+           records: Iterable[Dict],
+           output,
+           max_guesses: int = 6,
+           num_processes: int = 0,
+           batch_size: int = 64,
+           max_batches_in_flight: Optional[int] = None) -> Dict:
+    """Replays the game 'records' (any iterable, consumed lazily), writing one JSON line per game to the text stream
+    'output' in input order. num_processes > 0 --> batches of 'batch_size' records are replayed by a pool of worker
+    processes sharing the score database, at most 'max_batches_in_flight' (default: 2 per process) at a time.
+
+    Returns summary statistics: #games, #errors, #games whose play diverged from the solver's, the divergence turn
+    histogram, and the mean logged and solver #guesses over the solved answer logs."""
+    stats = _ReplayStats()
+    batches = _batches(records, batch_size)
+    if num_processes <= 0:
+        for batch in batches:
+            for record in batch:
+                result = replay_game(data, record, max_guesses=max_guesses)
+                stats.add(result)
+                output.write(json.dumps(result) + "\n")
+        return stats.summary()
+
+    max_batches_in_flight = max_batches_in_flight or 2 * num_processes
+    with SharedArray(data.score_db) as score_db, multiprocessing.Pool(
+            processes=num_processes, initializer=_init_worker,
+            initargs=(data.num_slots, data.answers, score_db.spec, max_guesses)) as pool:
+        while True:
+            # Pool.imap() would read ahead through the whole input, so batches are submitted in bounded groups.
+            group = list(itertools.islice(batches, max_batches_in_flight))
+            if not group:
+                break
+            for batch_results in pool.imap(_worker_replay, group):
+                for result in batch_results:
+                    stats.add(result)
+                    output.write(json.dumps(result) + "\n")
+            output.flush()
+    return stats.summary()
+
+
+def _batches(records: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    records = iter(records)
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class _ReplayStats:
+    """Running totals of the replayed games (constant size)."""
+
+    def __init__(self):
+        self.num_games = 0
+        self.num_errors = 0
+        self.divergence = collections.Counter()
+        self.num_compared = 0
+        self.logged_num_guesses = 0
+        self.solver_num_guesses = 0
+
+    def add(self, result: Dict):
+        self.num_games += 1
+        if "error" in result:
+            self.num_errors += 1
+            return
+        if result["diverged_at"] is not None:
+            self.divergence[result["diverged_at"]] += 1
+        if result.get("solver_num_guesses") is not None and result["logged_num_guesses"] is not None:
+            self.num_compared += 1
+            self.logged_num_guesses += result["logged_num_guesses"]
+            self.solver_num_guesses += result["solver_num_guesses"]
+
+    def summary(self) -> Dict:
+        n = self.num_compared
+        return dict(
+            num_games=self.num_games,
+            num_errors=self.num_errors,
+            num_diverged=sum(self.divergence.values()),
+            diverged_at=dict(sorted(self.divergence.items())),
+            mean_logged_guesses=self.logged_num_guesses / n if n else None,
+            mean_solver_guesses=self.solver_num_guesses / n if n else None)
+
+
+# Worker process state of replay(num_processes > 0).
+_WORKER = {}
+
+
+def _init_worker(num_slots: int, answers, score_db_spec, max_guesses: int):
+    _WORKER["data"] = solver.NerdleData.from_arrays(num_slots, answers, attach_array(score_db_spec))
+    _WORKER["max_guesses"] = max_guesses
+
+
+def _worker_replay(batch: List[Dict]) -> List[Dict]:
+    return [replay_game(_WORKER["data"], record, max_guesses=_WORKER["max_guesses"]) for record in batch]
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Replays recorded Nerdle games through the solver.")
+    parser.add_argument("--num_slots", default=6, type=int, help="Number of slots in answer.")
+    parser.add_argument("--score_db", default=None, help="Path to score database file name.")
+    parser.add_argument("--input", default="-", help="Path of the JSONL game log ('-': stdin).")
+    parser.add_argument("--output", default="-", help="Path of the JSONL replay output ('-': stdout).")
+    parser.add_argument("--max_guesses", default=6, type=int, help="Maximum #guesses of the solver's own games.")
+    parser.add_argument("--num_processes", default=multiprocessing.cpu_count(), type=int,
+                        help="Number of worker processes (0: replay in this process).")
+    parser.add_argument("--batch_size", default=64, type=int, help="Number of games per worker task.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    score_db = args.score_db or os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(args.num_slots))
+    os.makedirs(os.path.dirname(score_db), exist_ok=True)
+    solver_data = solver.create_solver_data(args.num_slots, score_db)
+    with open(args.input) if args.input != "-" else sys.stdin as f, \
+            open(args.output, "w") if args.output != "-" else sys.stdout as out:
+        summary = replay(solver_data, read_records(f), out, max_guesses=args.max_guesses,
+                         num_processes=args.num_processes, batch_size=args.batch_size)
+    print(json.dumps(summary, indent=2), file=sys.stderr)
@@ -1,10 +1,13 @@
 """Conversion from score to hint array and back."""
+import ctypes
 import itertools
 import functools
 import os
 
 
 SCORE_GUESS_SO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "score_guess.so")
+# Maximum #slots: a score has 2 bits per slot, and the C++ implementation returns 32-bit scores.
+MAX_SLOTS = 16
 
 
 class Hint:
@@ -21,6 +24,40 @@ OPERATIONS = "+-*/"
 EQUALS = "="
 
 
+@functools.lru_cache(maxsize=None)
+def native_scorer() -> ctypes.CDLL:
+    """Returns the C++ scorer library, loaded on first use."""
+    lib = ctypes.CDLL(SCORE_GUESS_SO)
+    lib.score_guess.argtypes = (ctypes.c_char_p, ctypes.c_char_p)
+    lib.score_guess.restype = ctypes.c_uint32
+    lib.score_guesses.argtypes = (ctypes.c_char_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_size_t, ctypes.c_void_p)
+    lib.score_guesses.restype = None
+    return lib
+
+
+def score_guess(guess: str, answer: str) -> int:
+    """Returns the score of a guess against an answer (C++ implementation)."""
+    return native_scorer().score_guess(str(guess).encode(), str(answer).encode())
+
+
+def score_guesses(guess: str, answers):
+    """Returns the scores of a guess against an array of answers (str or bytes) as a uint32 numpy array (C++
+    implementation)."""
+    import numpy as np
+    guess = str(guess)
+    answers = np.ascontiguousarray(answers, dtype="S{}".format(len(guess)))
+    scores = np.empty(len(answers), dtype=np.uint32)
+    native_scorer().score_guesses(guess.encode(), answers.ctypes.data, len(answers), len(guess), scores.ctypes.data)
+    return scores
+
+
+def score_dtype(num_slots: int) -> str:
+    """Returns the narrowest unsigned integer (numpy) type that holds the scores of 'num_slots'-slot guesses."""
+    if num_slots > MAX_SLOTS:
+        raise ValueError("Unsupported #slots {} > {}".format(num_slots, MAX_SLOTS))
+    return "uint16" if num_slots <= 8 else "uint32"
+
+
 def hints_to_score(hints):
     return functools.reduce(lambda x, y: x | y, (hint << (2 * idx)
                             for idx, hint in enumerate(hints)), 0)
@@ -1,73 +1,84 @@
 /* C++ implementation of the guess scoring function. */
-#include <string>
+#include <cstdint>
+#include <cstring>
 using namespace std;
 
 static const int ABSENT = 0; // Nerdle black: not in the answer.
 static const int CORRECT = 1;   // Nerdle green: in the correct spot.
 static const int PRESENT = 2; // Nerdle purple: in the answer, but not in the correct spot.
 
-// This allows us to accommodate Nerdle with up to 8 slots, since this has 16 bits. This cuts down
-// storage in half; in the future set to int to solve with more slots.
-#define SCORE unsigned short
-// Maximum Nerdle expression size.
-#define MAX_SLOTS 8
+// 2 bits per slot, so this accommodates Nerdle with up to 16 slots (e.g., 10- and 12-slot Maxi Nerdle). Score
+// databases may still be stored with a narrower type (e.g., 16 bits for up to 8 slots).
+#define SCORE uint32_t
 
-#ifdef __cplusplus
-extern "C" SCORE score_guess(const char guess[MAX_SLOTS], const char answer[MAX_SLOTS]) {
-#else
-SCORE score_guess(const char guess[MAX_SLOTS], const char answer[MAX_SLOTS]) {
-#endif
+static SCORE score(const char *guess, const char *answer, size_t num_slots) {
   /*
     Returns the score of a guess.
     A score is an encoded int, where each 2 bits represent a hint (first LSBs = first slot, etc.).
-    
+
     :param guess: Guess string.
     :param answer: Answer string.
+    :param num_slots: Guess and answer size.
     :return: Hint string, coded as a binary number. First 2 LSBs = first slot hint, etc.
-    
+
     Code below uses the assumptions that ABSENT=0 (the default value of a hint 2-bit pair) and there
     are 2 bits of feedback per hint.
   */
-  
-  // Iterates through guess and answer lists element-by-element. Whenever it finds a match,
-  // removes the value from a copy of answer so that nothing is double counted.
+
+  // Counts the answer symbols that are not CORRECT matches. Indexed by symbol, so no buffers depend on the
+  // number of slots.
   SCORE hints = 0;
-  const size_t num_slots = strlen(answer);
-  string answer_no_match(MAX_SLOTS, ' ');
-  size_t idx_no_match[MAX_SLOTS];  // Indices of 'guess_no_match' characters.
-  int num_no_match = 0;
-  
-  for (int idx = 0; idx < num_slots; ++idx) {
-    char guess_elem = guess[idx];
-    char ans_elem = answer[idx];
-    if (guess_elem == ans_elem) {
-      hints |= (CORRECT << (2 * idx));
+  unsigned char num_no_match[256] = {0};
+  for (size_t idx = 0; idx < num_slots; ++idx) {
+    if (guess[idx] == answer[idx]) {
+      hints |= ((SCORE) CORRECT << (2 * idx));
     } else {
-      answer_no_match[num_no_match] = ans_elem;
-      idx_no_match[num_no_match] = idx;
-      num_no_match += 1;
+      ++num_no_match[(unsigned char) answer[idx]];
     }
   }
 
   // PRESENT characters are flagged left-to-right, i.e., if there are two PRESENT "1"s in the guess and one
   // "1" in the answer, the first "1" in the guess will be PRESENT, the second ABSENT.
-  // Note: only uses the first 'num_no_match' elements in the work arrays.
-  // Truncate 'answer_no_match_str' to the first 'num_no_match' elements.
-  answer_no_match[num_no_match] = '\0';
-  for (int i = 0; i < num_no_match; ++i) {
-    int idx = idx_no_match[i];
-    char guess_elem = guess[idx];
-    int match_idx = answer_no_match.find(guess_elem);
-    if (match_idx != string::npos) {
+  for (size_t idx = 0; idx < num_slots; ++idx) {
+    unsigned char guess_elem = guess[idx];
+    if (guess_elem != (unsigned char) answer[idx] && num_no_match[guess_elem] > 0) {
       // Found 'guess_elem' in the not-matched part of the answer.
-      hints |= (PRESENT << (2 * idx));
-      answer_no_match.erase(match_idx, 1);
+      hints |= ((SCORE) PRESENT << (2 * idx));
+      --num_no_match[guess_elem];
     }
   }
-
   return hints;
 }
 
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+SCORE score_guess(const char *guess, const char *answer) {
+  /* Returns the score of a guess. guess and answer are null-terminated strings of the same size. */
+  return score(guess, answer, strlen(answer));
+}
+
+void score_guesses(const char *guess, const char *answers, size_t num_answers, size_t num_slots, SCORE *scores) {
+  /*
+    Scores a guess against many answers.
+
+    :param guess: Guess string (num_slots characters).
+    :param answers: Answers, packed into num_answers * num_slots characters with no separators (e.g., the buffer of
+      a numpy 'S<num_slots>' array).
+    :param num_answers: Number of answers.
+    :param num_slots: Guess and answer size.
+    :param scores: Output array of size num_answers.
+  */
+  for (size_t i = 0; i < num_answers; ++i) {
+    scores[i] = score(guess, answers + i * num_slots, num_slots);
+  }
+}
+
+#ifdef __cplusplus
+}
+#endif
+
 
 // WIP: parallelize a loop over multiple score_guess() calls.
 //#include <vector>
@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""Long-running Nerdle solver service. Loads the score databases once and answers "next guess for this history"
+requests over HTTP/JSON.
+
+API:
+    POST /next_guess {"num_slots": 6, "history": [["54/9=6", "-?--?-"], ...]}  --> {"guess", "num_answers"}
+    If the service has a time budget, the reply also has "exact": whether the guess search completed.
+
+Hints may be hint strings ("+", "?", "-" per slot) or scores. An empty history returns the initial guess; a history
+ending with an all-correct hint returns a null guess.
+
+Usage: python -m nerdle.service --num_slots 6 7 --port 8001
+"""
+import argparse
+import concurrent.futures
+import http.server
+import json
+import os
+import threading
+import urllib.request
+from typing import Dict, List, Optional, Tuple, Union
+
+import nerdle
+from . import solver
+from .cache import GuessCache
+from .score import hint_string_to_score
+
+
+class SolverService:
+    """Computes next guesses from game histories, sharing the loaded data of each #slots across all requests.
+
+    Concurrent requests for the same (#slots, history) state are batched: the first one computes the guess and the
+    others wait for its result, so each state is computed once however many games are in it at the same time."""
+
+    def __init__(self, data: Dict[int, solver.NerdleData], initial_guess: Optional[Dict[int, str]] = None,
+                 cache: Optional[GuessCache] = None, time_budget: Optional[float] = None):
+        """cache: a transposition cache of best guesses shared by all requests (see nerdle.cache), so that a remaining
+        answer set reached by different histories is only searched once.
+        time_budget: per-request guess search budget [seconds] (NerdleSolver anytime mode); unlimited if None."""
+        self._data = data
+        self.cache = cache
+        self.time_budget = time_budget
+        self._initial_guess = {**solver.INITIAL_GUESS, **(initial_guess or {})}
+        self._lock = threading.Lock()
+        self._pending = {}
+        # Number of next_guess() requests and of actual guess computations.
+        self.num_requests = 0
+        self.num_computations = 0
+
+    def next_guess(self, num_slots: int, history: List[Tuple[str, Union[str, int]]]) -> Tuple[Optional[str], int]:
+        """Returns the next guess (None if the game is solved) and the number of answers still possible."""
+        return self.next_guess_status(num_slots, history)[:2]
+
+    def next_guess_status(self, num_slots: int, history: List[Tuple[str, Union[str, int]]]) -> \
+            Tuple[Optional[str], int, bool]:
+        """Like next_guess(), and also returns whether the guess search was exact (False if it was cut short by the
+        time budget)."""
+        if num_slots not in self._data:
+            raise ValueError("No score database for {} slots".format(num_slots))
+        state = (num_slots, tuple((guess, _score(hint)) for guess, hint in history))
+        with self._lock:
+            self.num_requests += 1
+            future = self._pending.get(state)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._pending[state] = future
+        if owner:
+            try:
+                future.set_result(self._compute(*state))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._pending[state]
+        return future.result()
+
+    def _compute(self, num_slots: int, history: Tuple[Tuple[str, int]]) -> Tuple[Optional[str], int, bool]:
+        with self._lock:
+            self.num_computations += 1
+        s = solver.NerdleSolver(self._data[num_slots], cache=self.cache, time_budget=self.time_budget)
+        if not history:
+            return self._initial_guess[num_slots], s.num_answers, True
+        # Replay the history: only the last turn needs a guess search.
+        for guess, score in history:
+            s.update(s.guess_key(guess), score)
+        if s.is_correct(history[-1][1]):
+            return None, s.num_answers, True
+        guess = s.guess_value(s.best_guess())
+        return guess, s.num_answers, s.last_guess_exact
+
+
+def _score(hint: Union[str, int]) -> int:
+    return hint_string_to_score(hint) if isinstance(hint, str) else int(hint)
+
+
+class SolverServer:
+    """Serves a SolverService over HTTP in a background thread (or in the foreground with serve_forever())."""
+
+    def __init__(self, service: SolverService, port: int = 0):
+        self.service = service
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", port), _handler(service))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self._server.server_address[1])
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+def _handler(service: SolverService):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path.rstrip("/") != "/next_guess":
+                    self._reply(404, dict(error="Unknown path {}".format(self.path)))
+                    return
+                if not isinstance(body, dict):
+                    raise ValueError("Request body must be a JSON object")
+                guess, num_answers, exact = service.next_guess_status(
+                    int(body["num_slots"]), body.get("history", []))
+                reply = dict(guess=guess, num_answers=num_answers)
+                if service.time_budget is not None:
+                    reply["exact"] = exact
+                self._reply(200, reply)
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                self._reply(400, dict(error="{}: {}".format(type(e).__name__, e)))
+
+        def _reply(self, status: int, message: Dict):
+            data = json.dumps(message).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class SolverClient:
+    """JSON client of a SolverServer."""
+
+    def __init__(self, url: str):
+        self._url = url.rstrip("/")
+
+    def next_guess(self, num_slots: int, history: List[Tuple[str, Union[str, int]]]) -> Dict:
+        request = urllib.request.Request(
+            self._url + "/next_guess", data=json.dumps(dict(num_slots=num_slots, history=history)).encode(),
+            headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+
+
+def parse_args():
+    """Defines and parses command-line flags."""
+    parser = argparse.ArgumentParser(description="Nerdle solver service.")
+    parser.add_argument("--num_slots", default=[6], type=int, nargs="+",
+                        help="Number of slots of each score database to serve.")
+    parser.add_argument("--db_dir", default=nerdle.DB_DIR, help="Directory of the score database files.")
+    parser.add_argument("--port", default=8001, type=int, help="Server port.")
+    parser.add_argument("--cache_size", default=100000, type=int,
+                        help="Maximum #best guesses cached in memory (0: no cache).")
+    parser.add_argument("--cache_file", default=None, help="Path of a sqlite best-guess store shared across processes.")
+    parser.add_argument("--time_budget", default=None, type=float,
+                        help="Guess search time budget per request [seconds] (default: unlimited).")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.makedirs(args.db_dir, exist_ok=True)
+    data = {num_slots: solver.create_solver_data(
+        num_slots, os.path.join(args.db_dir, "nerdle{}.db".format(num_slots))) for num_slots in args.num_slots}
+    cache = GuessCache(args.cache_size, args.cache_file) if args.cache_size > 0 else None
+    service = SolverService(data, initial_guess=solver.load_openers(), cache=cache, time_budget=args.time_budget)
+    server = SolverServer(service, port=args.port)
+    print("Serving next guesses for {} slots at {}".format(args.num_slots, server.url))
+    server.serve_forever()
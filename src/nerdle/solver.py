@@ -29,17 +29,31 @@ References:
 """
 import argparse
 import collections
-import ctypes
-import h5py
-import itertools
+import hashlib
+import json
 import multiprocessing
 import numpy as np
 import os
-from typing import Tuple, List, Optional
-
-from . import generator
-from .score import score_to_hint_string, Hint, hints_to_score, SCORE_GUESS_SO
-sgo = ctypes.CDLL(SCORE_GUESS_SO)    # C++ implementation.
+import time
+from typing import Dict, Tuple, List, Optional
+
+import nerdle
+from . import generator, partition
+from .bitset import BitsetIndex
+from .cache import GuessCache
+from .metrics import MetricsSink
+from .parallel import SharedArray, attach_array
+from .score import score_to_hint_string, Hint, hints_to_score, native_scorer, score_guess, score_guesses
+
+# A default initial guess for each #slots.
+INITIAL_GUESS = {5: "3+2=5", 6: "54/9=6", 7: "12+3=15", 8: "9*8-7=65", 10: "17-9+54=62", 12: "17-9+54-3=59"}
+# JSON file of the openers found by nerdle.opener for each #slots. Entry points load it (see load_openers()) and pass
+# the opener on; the solvers themselves default to INITIAL_GUESS.
+OPENERS_FILE = os.path.join(nerdle.DB_DIR, "openers.json")
+# Anytime NerdleSolver search: #score entries evaluated between time budget checks.
+ANYTIME_CHUNK_SIZE = 1 << 16
+# update_score_database() copies kept scores in blocks while the kept answers form at most this many runs.
+MAX_BLOCK_RUNS = 64
 
 
 class NerdleData:
@@ -53,24 +67,37 @@ class NerdleData:
             overwrite: bool = False,
             max_answers: Optional[int] = None,
             num_processes: Optional[int] = None,
-            min_parallel_n: int = 20000):
-        """num_processes = 0 --> serial run."""
+            min_parallel_n: int = 20000,
+            score_dtype=int,
+            update: bool = False,
+            partition_index: bool = False):
+        """num_processes = 0 --> serial run.
+        score_dtype: type of the score database entries written to a new file, e.g., score.score_dtype(num_slots) for
+        the narrowest type. An existing file is loaded with its stored type.
+        update: if the file exists, first brings it up to date with the current answer list (the generator's answers,
+        capped at max_answers) by update_score_database(), which only scores the added answers.
+        partition_index: if True, answers_of_score() reads the hint-partition index (see nerdle.partition) of the
+        score database, loaded from its sidecar file (built and saved there if missing or stale)."""
         self.num_slots = num_slots
         self._file_name = file_name
         self._answers = None
+        self._index = None
+        self._fingerprint = None
+        # Imported here rather than at module level, so that importing the solver does not load h5py.
+        import h5py
+        if update and not overwrite and os.path.exists(self._file_name):
+            update_score_database(self._file_name, NerdleData._all_answers(num_slots, max_answers))
         if overwrite or not os.path.exists(self._file_name):
             with h5py.File(self._file_name, "w") as f:
-                self.answers = sorted(generator.all_answers(self.num_slots))
-                if max_answers is not None:
-                    self.answers = self.answers[:max_answers]
+                self.answers = NerdleData._all_answers(num_slots, max_answers)
                 if num_processes == 0 or len(self.answers) <= min_parallel_n:
                     create_score_database = NerdleData._create_score_database_serial
                 else:
                     def create_score_database(answers): return NerdleData._create_score_database_parallel(
-                        answers, num_processes=num_processes)
+                        answers, num_processes=num_processes, dtype=score_dtype)
                 self.score_db = np.array(
                     create_score_database(
-                        self.answers), dtype=int)
+                        self.answers), dtype=score_dtype)
                 # Storing answers as bytearray since h5py does not support numpy strings.
                 # TODO: just work with bytearrays instead of strings
                 # everywhere.
@@ -82,18 +109,43 @@ class NerdleData:
             with h5py.File(self._file_name, "r") as f:
                 self.answers = np.array([x.decode() for x in f["answers"][:]])
                 self.score_db = f["score_db"][:, :]
+        self.partition_index = partition.load_or_build(self._file_name, self.score_db) if partition_index else None
+
+    @staticmethod
+    def _all_answers(num_slots: int, max_answers: Optional[int] = None) -> List[str]:
+        answers = sorted(generator.all_answers(num_slots))
+        return answers[:max_answers] if max_answers is not None else answers
+
+    @classmethod
+    def from_arrays(cls, num_slots: int, answers: np.ndarray, score_db: np.ndarray) -> "NerdleData":
+        """Wraps existing arrays (e.g., a score database shared with worker processes) without reading a file."""
+        data = cls.__new__(cls)
+        data.num_slots = num_slots
+        data._file_name = None
+        data._index = None
+        data._fingerprint = None
+        data.partition_index = None
+        data.answers = np.asarray(answers)
+        data.score_db = score_db
+        return data
 
     @staticmethod
     def _create_score_database_parallel(
-            answers, num_processes: Optional[int] = None):
+            answers, num_processes: Optional[int] = None, dtype=int, blocks_per_process: int = 4) -> np.ndarray:
+        """Scores all (guess, answer) pairs with a pool of 'num_processes' workers. Each worker gets the encoded answer
+        list once, and scores contiguous blocks of guess rows with the native batch scorer directly into a shared
+        memory-mapped output matrix, so only the block bounds are sent between processes."""
         n = len(answers)
         if num_processes is None:
             num_processes = multiprocessing.cpu_count()
-        with multiprocessing.Pool(processes=num_processes) as pool:
-            score = pool.map(
-                _score_guess, itertools.product(
-                    answers, repeat=2))
-            return np.array(score).reshape(n, n)
+        encoded = np.array([str(x).encode() for x in answers])
+        # A few blocks per process balance the load; blocks are still large enough to amortize the task overhead.
+        bounds = np.linspace(0, n, min(n, num_processes * blocks_per_process) + 1).astype(int)
+        with SharedArray(shape=(n, n), dtype=dtype) as score_db, multiprocessing.Pool(
+                processes=num_processes, initializer=_init_score_worker, initargs=(encoded, score_db.spec)) as pool:
+            for _ in pool.imap_unordered(_score_rows, zip(bounds[:-1], bounds[1:])):
+                pass
+            return np.array(score_db.array)
 
     @staticmethod
     def _create_score_database_serial(answers):
@@ -101,12 +153,13 @@ class NerdleData:
         n = len(answers)
         print_frequency = n // 20
         score_db = [[0] * n for _ in range(n)]
+        score_guess_encoded = native_scorer().score_guess
         for i, guess in enumerate(answers):
             if print_frequency > 0 and i % print_frequency == 0:
                 print("{} / {} ({:.1f}%) completed".format(i, n, (100 * i) / n))
             guess_encoded = str(guess).encode()
             score_db[i] = [
-                sgo.score_guess(
+                score_guess_encoded(
                     guess_encoded,
                     str(answer).encode()) for answer in answers]
         return score_db
@@ -132,9 +185,42 @@ class NerdleData:
             answers: np.ndarray,
             answer_keys: np.ndarray,
             score: int):
+        if self.partition_index is not None:
+            # Intersects the (guess, score) bucket with the remaining answer keys, which are kept in increasing order.
+            keys = self.partition_index.answers_of_score(guess, score)
+            if not len(answer_keys):
+                return answer_keys[:0], answer_keys[:0]
+            index = np.minimum(np.searchsorted(answer_keys, keys), len(answer_keys) - 1)
+            index = index[answer_keys[index] == keys]
+            return index, answer_keys[index]
         index = np.where(score_db[guess, answers] == score)[0]
         return index, answer_keys[index]
 
+    @property
+    def fingerprint(self) -> str:
+        """A hash of the answer list, which identifies what the answer (and guess) keys stand for; computed on first
+        use."""
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            for answer in self.answers:
+                h.update(str(answer).encode() + b"\n")
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    @property
+    def index(self) -> BitsetIndex:
+        """Bitset index of the answers (see nerdle.bitset), built on first use."""
+        if self._index is None:
+            self._index = BitsetIndex(self.answers)
+        return self._index
+
+    def answers_of_guess(self, guess: str, answer_keys: np.ndarray, score: int):
+        """Like answers_of_score(), for any guess string, including guesses outside the answer list: returns the
+        indices into 'answer_keys' of the answers whose score for 'guess' is 'score', and their keys. Uses the bitset
+        index instead of a score database row."""
+        index = np.flatnonzero(np.isin(answer_keys, self.index.answers_of_score(guess, score), assume_unique=True))
+        return index, answer_keys[index]
+
     def restrict_by_answers(self, score_db, answer_index: List[int]):
         score_db = score_db[:, answer_index]
         answer_index = np.arange(score_db.shape[1], dtype=int)
@@ -147,8 +233,35 @@ class NerdleSolver:
     Note: modifies the internal data structures during solve() calls, so cannot be reused after solve() is called.
     """
 
-    def __init__(self, data: NerdleData):
+    def __init__(self, data: NerdleData, metrics: Optional[MetricsSink] = None, profiler=None,
+                 exact_threshold: Optional[int] = None, guess_sample_size: Optional[int] = None,
+                 answer_sample_size: int = 2000, tolerance: Optional[float] = None, seed: Optional[int] = None,
+                 cache: Optional[GuessCache] = None, time_budget: Optional[float] = None,
+                 preferred_guesses: Optional[List[str]] = None):
+        """metrics: receives one record per make_guess() call (see nerdle.metrics); records nothing by default.
+        profiler: an optional context manager (e.g., metrics.SamplingProfiler) entered around each guess search.
+
+        Approximate mode: while more than 'exact_threshold' and 'answer_sample_size' answers remain (never if
+        exact_threshold is None, the default), the guess search is restricted to a random sample of
+        'guess_sample_size' guesses (all if None), and their max bucket sizes are estimated by
+        analysis.min_biased_multilevel_sampling() on answer samples of at least 'answer_sample_size' columns, with ties
+        broken as in the exact search. 'tolerance' is the accuracy/latency knob: None halves the candidate guesses at
+        each sampling level (fastest); a tolerance picks a guess whose max bucket fraction is within 'tolerance' of the
+        sampled guesses' minimum with probability >= 95%.
+
+        cache: a cache.GuessCache shared across solvers (games); best_guess() serves a remaining answer set seen
+        before with the same options from it instead of searching.
+
+        Anytime mode: if 'time_budget' [seconds] is set, the exact search evaluates guesses in chunks, in the order
+        possible answers, then 'preferred_guesses' (default: the INITIAL_GUESS of the #slots, a strong opener), then
+        the rest, and returns the best guess found so far once the budget runs out (after at least one chunk).
+        last_guess_exact tells whether the last best_guess() evaluated all guesses. The result equals the exact search
+        when the budget suffices."""
         self._data = data
+        self._metrics = metrics if metrics is not None else MetricsSink()
+        self._profiler = profiler
+        self._game = self._metrics.new_game()
+        self._turn = 0
         # A working copy of data.score_db entries modified within solve().
         self._score_db = data.score_db
         self._all_answers = self._data.answers
@@ -157,18 +270,36 @@ class NerdleSolver:
         self._answers = self._data.initial_answers
         self._num_slots = len(next(iter(self._all_answers)))
         self._all_correct = hints_to_score([Hint.CORRECT] * self._num_slots)
+        self._exact_threshold = exact_threshold
+        self._guess_sample_size = guess_sample_size
+        self._answer_sample_size = answer_sample_size
+        self._tolerance = tolerance
+        self._random = np.random.default_rng(seed)
+        # Number of guess rows evaluated by the last best_guess() call.
+        self._rows_evaluated = 0
+        self._cache = cache
+        self._time_budget = time_budget
+        if preferred_guesses is None:
+            preferred_guesses = [INITIAL_GUESS[self._num_slots]] if self._num_slots in INITIAL_GUESS else []
+        self._preferred_keys = np.flatnonzero(np.isin(self._all_answers, preferred_guesses))
+        # Whether the last best_guess() call evaluated all guesses (False if it stopped at the time budget).
+        self.last_guess_exact = True
+        # Cached guesses are keys into the answer list, so the namespace identifies the list by its hash rather than its
+        # size (an updated database may have as many answers, but different ones). The seed only matters to the
+        # approximate search.
+        self._cache_namespace = "{}:{}:{}:{}:{}:{}:{}".format(
+            self._num_slots, data.fingerprint, exact_threshold, guess_sample_size, answer_sample_size, tolerance,
+            seed if exact_threshold is not None else None) if cache is not None else None
 
     def solve(self,
               answer: str,
               max_guesses: int = 6,
-              initial_guess: str = "0+12/3=4",
+              initial_guess: Optional[str] = None,
               debug: bool = False) -> Tuple[List[str],
                                             List[int],
                                             List[int]]:
         return self.solve_adversary(
-            lambda guess: sgo.score_guess(
-                str(guess).encode(),
-                str(answer).encode()),
+            lambda guess: score_guess(guess, answer),
             max_guesses=max_guesses,
             initial_guess=initial_guess,
             debug=debug)
@@ -185,14 +316,14 @@ class NerdleSolver:
     def solve_adversary(self,
                         hint_generator,
                         max_guesses: int = 6,
-                        initial_guess: str = "0+12/3=4",
+                        initial_guess: Optional[str] = None,
                         debug: bool = False) -> Tuple[List[str],
                                                       List[int],
                                                       List[int]]:
         guesses_left = max_guesses
         hint_history = []
         answer_size_history = []
-        guess = initial_guess
+        guess = initial_guess if initial_guess is not None else INITIAL_GUESS[self._num_slots]
         guess_key = self.guess_key(guess)
         guess_history = [guess]
 
@@ -225,14 +356,75 @@ class NerdleSolver:
         return None, None, None
 
     def make_guess(self, guess: str, score: int) -> Optional[str]:
-        # Restrict possible_score_db to only include possible answers. This creates a new dictionary,
-        # so it does not override self.score_db.
+        if not self._metrics.enabled and self._profiler is None:
+            self.update(guess, score)
+            if score == self._all_correct:
+                return None
+            return self.best_guess()
+
+        candidates_before = len(self._answers)
+        start = time.perf_counter()
+        self._filter(guess, score)
+        filtered = time.perf_counter()
+        self._restrict()
+        restricted = time.perf_counter()
+        if score == self._all_correct:
+            guess_key, rows_evaluated = None, 0
+        elif self._profiler is not None:
+            with self._profiler:
+                guess_key = self.best_guess()
+            rows_evaluated = self._rows_evaluated
+        else:
+            guess_key, rows_evaluated = self.best_guess(), self._rows_evaluated
+        if self._metrics.enabled:
+            self._metrics.record_turn(dict(
+                game=self._game, turn=self._turn,
+                filter=filtered - start, restrict=restricted - filtered, search=time.perf_counter() - restricted,
+                candidates_before=candidates_before, candidates_after=len(self._answers),
+                bytes_allocated=self._score_db.nbytes + self._answers.nbytes + self._answer_keys.nbytes,
+                rows_evaluated=rows_evaluated, exact=self.last_guess_exact))
+        self._turn += 1
+        return guess_key
+
+    def update(self, guess: int, score: int):
+        """Restricts the possible answers to those consistent with the score of the guess (key)."""
+        self._filter(guess, score)
+        self._restrict()
+
+    def update_with_guess(self, guess: str, score: int):
+        """Like update(), for any guess string (e.g., one outside the answer list, which has no score database row)."""
+        self._answers, self._answer_keys = self._data.answers_of_guess(guess, self._answer_keys, score)
+        self._restrict()
+
+    def _filter(self, guess: int, score: int):
+        """Filters the possible answers by the score of the guess (key)."""
         self._answers, self._answer_keys = self._data.answers_of_score(
             guess, self._score_db, self._answers, self._answer_keys, score)
+
+    def _restrict(self):
+        """Restricts the score database columns to the possible answers."""
+        # Restrict possible_score_db to only include possible answers. This creates a new dictionary,
+        # so it does not override self.score_db.
         self._score_db, self._answers = self._data.restrict_by_answers(
             self._score_db, self._answers)
-        if score == self._all_correct:
-            return None
+
+    def best_guess(self) -> int:
+        """Returns the key of the best next guess given the current possible answers."""
+        if self._cache is None:
+            return self._search_best_guess()
+        key = GuessCache.fingerprint(self._answer_keys, self._cache_namespace)
+        guess_key = self._cache.get(key)
+        if guess_key is not None:
+            self._rows_evaluated = 0
+            self.last_guess_exact = True
+            return guess_key
+        guess_key = self._search_best_guess()
+        # A search truncated by the time budget is not cached, so that a later search can complete it.
+        if self.last_guess_exact:
+            self._cache.put(key, guess_key)
+        return guess_key
+
+    def _search_best_guess(self) -> int:
         # Make the next guess.
         # - Find how often a score appears in scores_by_answer_dict, get max (worst case).
         # Sort by score, then by guess possibility (prefer possible guesses over impossible ones.), get min (best case).
@@ -241,6 +433,14 @@ class NerdleSolver:
         # scipy-mode implementation. Is it really faster?
         #         return min((b, k not in self._answer_keys, k)
         #                    for k, b in enumerate(scipy.stats.mode(self._score_db, axis=1, keepdims=False)[1]))[-1]
+        self.last_guess_exact = True
+        # The answer sample would be all answers, so sampling would not save anything over the exact search.
+        if self._exact_threshold is not None and len(self._answers) > max(self._exact_threshold,
+                                                                          self._answer_sample_size):
+            return self._approximate_best_guess()
+        if self._time_budget is not None:
+            return self._anytime_best_guess(time.perf_counter() + self._time_budget)
+        self._rows_evaluated = len(self._all_keys)
         return min(
             (max(collections.Counter(self._score_db[guess_key]).values()),
              guess_key not in self._answer_keys,
@@ -248,6 +448,329 @@ class NerdleSolver:
             for guess_key in self._all_keys
         )[-1]
 
+    def _anytime_best_guess(self, deadline: float) -> int:
+        is_candidate = np.zeros(len(self._all_keys), dtype=bool)
+        is_candidate[self._answer_keys] = True
+        is_preferred = np.zeros(len(self._all_keys), dtype=bool)
+        is_preferred[self._preferred_keys] = True
+        order = np.concatenate((self._answer_keys, np.flatnonzero(is_preferred & ~is_candidate),
+                                np.flatnonzero(~is_preferred & ~is_candidate)))
+        chunk = max(1, ANYTIME_CHUNK_SIZE // max(len(self._answers), 1))
+        best = None
+        for start in range(0, len(order), chunk):
+            keys = order[start:start + chunk]
+            bucket_sizes = _max_bucket_sizes(self._score_db[keys])
+            # Same order as the exact search: max bucket size, then possible answers first, then key.
+            i = np.lexsort((keys, ~is_candidate[keys], bucket_sizes))[0]
+            candidate = (bucket_sizes[i], not is_candidate[keys[i]], keys[i])
+            best = candidate if best is None or candidate < best else best
+            self._rows_evaluated = start + len(keys)
+            if time.perf_counter() >= deadline:
+                break
+        self.last_guess_exact = self._rows_evaluated == len(order)
+        return best[-1]
+
+    def _approximate_best_guess(self) -> int:
+        # Imported here since analysis imports this module.
+        from .analysis import max_bucket_sizes, min_biased_multilevel_sampling
+        guess_keys = self._all_keys
+        if self._guess_sample_size is not None and len(guess_keys) > self._guess_sample_size:
+            guess_keys = np.sort(self._random.choice(guess_keys, self._guess_sample_size, replace=False))
+        self._rows_evaluated = len(guess_keys)
+        is_candidate = np.zeros(len(self._all_keys), dtype=bool)
+        is_candidate[self._answer_keys] = True
+        # Same order as the exact search: max bucket size, then possible answers first, then key (guess_keys is
+        # sorted).
+        _, _, _, argmin = min_biased_multilevel_sampling(
+            self._score_db[guess_keys], lambda a: max_bucket_sizes(a) / a.shape[1],
+            min_sample_size=self._answer_sample_size, rng=self._random, tolerance=self._tolerance,
+            return_bounds=True, tie_break=~is_candidate[guess_keys])
+        return guess_keys[argmin]
+
+    @property
+    def num_answers(self) -> int:
+        """Number of possible answers remaining."""
+        return len(self._answers)
+
+
+class MultiBoardNerdleSolver:
+    """
+    Solves several Nerdle boards simultaneously (e.g., Quordle-style variants): every guess is played on all unsolved
+    boards, and a board is solved once the guess equals its answer.
+
+    Keeps one set of possible answer keys per board over the shared score database. A guess is picked by the sum over
+    boards of its largest bucket size on that board, where the all-correct bucket counts 0 (the board is solved);
+    ties are broken in favor of guesses that are possible answers of some board. The bucket sizes of all guesses on
+    all boards are computed in one vectorized pass over the score database columns of all boards' answers.
+    """
+
+    def __init__(self, data: NerdleData, num_boards: int):
+        self._data = data
+        self._num_boards = num_boards
+        self._score_db = data.score_db
+        self._all_keys = data.all_keys
+        self._answers = [data.initial_answers for _ in range(num_boards)]
+        self._solved = [False] * num_boards
+        self._num_slots = data.num_slots
+        self._all_correct = hints_to_score([Hint.CORRECT] * self._num_slots)
+
+    def solve(self,
+              answers: List[str],
+              max_guesses: Optional[int] = None,
+              initial_guess: Optional[str] = None,
+              debug: bool = False) -> Tuple[List[str],
+                                            List[List[int]],
+                                            List[List[int]]]:
+        return self.solve_adversary(
+            lambda guess: [score_guess(guess, answer) for answer in answers],
+            max_guesses=max_guesses,
+            initial_guess=initial_guess,
+            debug=debug)
+
+    def guess_key(self, guess):
+        return self._data.key(guess)
+
+    def guess_value(self, guess_key):
+        return self._data.value(guess_key)
+
+    def solve_adversary(self,
+                        hint_generator,
+                        max_guesses: Optional[int] = None,
+                        initial_guess: Optional[str] = None,
+                        debug: bool = False) -> Tuple[List[str],
+                                                      List[List[int]],
+                                                      List[List[int]]]:
+        """hint_generator(guess) returns the list of scores of the guess on all boards (solved boards' scores are
+        ignored). max_guesses defaults to num_boards + 5."""
+        if max_guesses is None:
+            max_guesses = self._num_boards + 5
+        hint_history = []
+        answer_size_history = []
+        guess = initial_guess if initial_guess is not None else INITIAL_GUESS[self._num_slots]
+        guess_key = self.guess_key(guess)
+        guess_history = [guess]
+        for guesses_left in range(max_guesses - 1, -1, -1):
+            if debug:
+                print("--> guess {} guesses_left {}".format(guess, guesses_left))
+            scores = hint_generator(guess)
+            hint_history.append(scores)
+            if debug:
+                print("scores {}".format(" ".join(score_to_hint_string(score, self._num_slots) for score in scores)))
+            guess_key = self.make_guess(guess_key, scores)
+            if guess_key is None:
+                return guess_history, hint_history, answer_size_history
+            guess = self.guess_value(guess_key)
+            if debug:
+                print("answers {}".format(self.num_answers))
+            guess_history.append(guess)
+            answer_size_history.append(self.num_answers)
+
+        # Failed to solve all boards within the allotted number of guesses.
+        return None, None, None
+
+    def make_guess(self, guess_key: int, scores: List[int]) -> Optional[int]:
+        """Updates all boards with the scores of a guess. Returns the next guess key, or None if all are solved."""
+        self.update(guess_key, scores)
+        if all(self._solved):
+            return None
+        return self.best_guess()
+
+    def update(self, guess_key: int, scores: List[int]):
+        """Restricts the possible answers of each unsolved board to those consistent with its score of the guess."""
+        for board, score in enumerate(scores):
+            if self._solved[board]:
+                continue
+            answers = self._answers[board]
+            self._answers[board] = answers[self._score_db[guess_key, answers] == score]
+            self._solved[board] = score == self._all_correct
+
+    def best_guess(self) -> int:
+        """Returns the key of the best next guess given the current possible answers of all unsolved boards."""
+        boards = [board for board in range(self._num_boards) if not self._solved[board]]
+        columns = np.concatenate([self._answers[board] for board in boards])
+        board_of_column = np.repeat(np.arange(len(boards)), [len(self._answers[board]) for board in boards])
+        worst = _worst_bucket_sizes(self._score_db, columns, board_of_column, len(boards), self._num_slots)
+        feasible = np.isin(self._all_keys, columns)
+        return self._all_keys[np.lexsort((self._all_keys, ~feasible, worst.sum(axis=1)))[0]]
+
+    @property
+    def num_answers(self) -> List[int]:
+        """Number of possible answers remaining on each board (0 for solved boards)."""
+        return [0 if solved else len(answers) for answers, solved in zip(self._answers, self._solved)]
+
+    @property
+    def solved(self) -> List[bool]:
+        return list(self._solved)
+
+
+def _worst_bucket_sizes(score_db: np.ndarray, columns: np.ndarray, board_of_column: np.ndarray, num_boards: int,
+                        num_slots: int, max_chunk_size: int = 1 << 22) -> np.ndarray:
+    """Returns the #guesses x num_boards array of the largest bucket size of each guess (score_db row) over the
+    answers (columns) of each board, counting the all-correct bucket as 0.
+
+    Each row's scores are offset by board so that one sort per row groups them by (board, score); bucket sizes are the
+    run lengths of the sorted rows. Rows are processed in chunks of at most max_chunk_size entries."""
+    m, n = score_db.shape[0], len(columns)
+    worst = np.zeros((m, num_boards), dtype=int)
+    all_correct = hints_to_score([Hint.CORRECT] * num_slots)
+    base = 1 << (2 * num_slots)
+    offset = board_of_column.astype(np.int64) * base
+    chunk = max(1, max_chunk_size // max(n, 1))
+    for start in range(0, m, chunk):
+        codes = np.sort(score_db[start:start + chunk][:, columns].astype(np.int64) + offset, axis=1)
+        new_run = np.ones(codes.shape, dtype=bool)
+        new_run[:, 1:] = codes[:, 1:] != codes[:, :-1]
+        row, col = np.nonzero(new_run)
+        # Runs never cross rows, since every row starts a new run.
+        sizes = np.diff(np.append(row * n + col, codes.size))
+        code = codes[row, col]
+        sizes[code % base == all_correct] = 0
+        # Runs are ordered by (row, board); reduce each (row, board) group to its maximum.
+        group = row * num_boards + code // base
+        group_start = np.flatnonzero(np.concatenate(([True], group[1:] != group[:-1])))
+        worst[start:start + codes.shape[0]].flat[group[group_start]] = np.maximum.reduceat(sizes, group_start)
+    return worst
+
+
+def load_openers(file_name: Optional[str] = None) -> Dict[int, str]:
+    """Returns the saved openers (see save_opener()) by #slots; none if the file does not exist."""
+    file_name = file_name or OPENERS_FILE
+    if not os.path.exists(file_name):
+        return {}
+    with open(file_name) as f:
+        return {int(num_slots): guess for num_slots, guess in json.load(f).items()}
+
+
+def save_opener(num_slots: int, guess: str, file_name: Optional[str] = None):
+    """Saves 'guess' as the default initial guess of 'num_slots' slots, keeping the other #slots' openers."""
+    file_name = file_name or OPENERS_FILE
+    openers = load_openers(file_name)
+    openers[num_slots] = guess
+    tmp_file_name = file_name + ".tmp"
+    with open(tmp_file_name, "w") as f:
+        json.dump({str(k): v for k, v in sorted(openers.items())}, f, indent=2)
+    os.replace(tmp_file_name, file_name)
+
+
+def default_initial_guess(num_slots: int, openers: Optional[Dict[int, str]] = None) -> str:
+    """Returns the opener of 'num_slots' slots in 'openers' (see load_openers()) if there is one, otherwise
+    INITIAL_GUESS[num_slots]."""
+    opener = (openers or {}).get(num_slots)
+    return opener if opener is not None else INITIAL_GUESS[num_slots]
+
+
+def _max_bucket_sizes(score: np.ndarray, return_statistics: bool = False):
+    """Returns the largest bucket size (most frequent value count) of each row of 'score', from the run lengths of the
+    sorted rows. return_statistics=True --> also returns the #buckets and the sum of squared bucket sizes of each
+    row."""
+    m, n = score.shape
+    codes = np.sort(score, axis=1)
+    new_run = np.ones(codes.shape, dtype=bool)
+    new_run[:, 1:] = codes[:, 1:] != codes[:, :-1]
+    row, col = np.nonzero(new_run)
+    sizes = np.diff(np.append(row * n + col, codes.size))
+    num_buckets = new_run.sum(axis=1)
+    # Every row starts a new run, so row i's runs start after those of rows 0..i-1.
+    row_start = np.concatenate(([0], np.cumsum(num_buckets)[:-1]))
+    max_bucket = np.maximum.reduceat(sizes, row_start)
+    if return_statistics:
+        return max_bucket, num_buckets, np.add.reduceat(sizes * sizes, row_start)
+    return max_bucket
+
+
+class OnlineNerdleSolver:
+    """
+    Solves a Nerdle game without a score database, e.g., 10- and 12-slot Maxi Nerdle, whose n x n database does not
+    fit in memory.
+
+    The possible answers are generated from the first hint with generator.consistent_answers() and filtered by
+    scoring on the fly afterwards. The next guess is the possible answer with the smallest maximum bucket size, out of
+    (a random sample of) at most 'guess_sample_size' possible answers, each scored against all possible answers.
+    """
+
+    def __init__(self, num_slots: int, guess_sample_size: int = 1000, seed: Optional[int] = None):
+        self._num_slots = num_slots
+        self._guess_sample_size = guess_sample_size
+        self._random = np.random.default_rng(seed)
+        # Possible answers (bytes); None until the first update(), standing for all answers.
+        self._answers = None
+        self._all_correct = hints_to_score([Hint.CORRECT] * num_slots)
+
+    def solve(self,
+              answer: str,
+              max_guesses: int = 6,
+              initial_guess: Optional[str] = None,
+              debug: bool = False) -> Tuple[List[str],
+                                            List[int],
+                                            List[int]]:
+        return self.solve_adversary(
+            lambda guess: score_guess(guess, answer),
+            max_guesses=max_guesses,
+            initial_guess=initial_guess,
+            debug=debug)
+
+    def is_correct(self, score):
+        return score == self._all_correct
+
+    def solve_adversary(self,
+                        hint_generator,
+                        max_guesses: int = 6,
+                        initial_guess: Optional[str] = None,
+                        debug: bool = False) -> Tuple[List[str],
+                                                      List[int],
+                                                      List[int]]:
+        hint_history = []
+        answer_size_history = []
+        guess = initial_guess if initial_guess is not None else INITIAL_GUESS[self._num_slots]
+        guess_history = [guess]
+        for guesses_left in range(max_guesses - 1, -1, -1):
+            if debug:
+                print("--> guess {} guesses_left {}".format(guess, guesses_left))
+            score = hint_generator(guess)
+            hint_history.append(score)
+            if debug:
+                print("score {} {}".format(score_to_hint_string(score, self._num_slots), score))
+            if self.is_correct(score):
+                return guess_history, hint_history, answer_size_history
+            guess = self.make_guess(guess, score)
+            if debug:
+                print("answers {}".format(self.num_answers))
+            guess_history.append(guess)
+            answer_size_history.append(self.num_answers)
+
+        # Failed to solve within the allotted number of guesses.
+        return None, None, None
+
+    def make_guess(self, guess: str, score: int) -> Optional[str]:
+        self.update(guess, score)
+        if self.is_correct(score):
+            return None
+        return self.best_guess()
+
+    def update(self, guess: str, score: int):
+        """Restricts the possible answers to those consistent with the score of the guess."""
+        if self._answers is None:
+            self._answers = np.array(list(generator.consistent_answers(self._num_slots, [(guess, score)])),
+                                     dtype="S{}".format(self._num_slots))
+        else:
+            self._answers = self._answers[score_guesses(guess, self._answers) == score]
+
+    def best_guess(self) -> str:
+        """Returns the best next guess given the current possible answers."""
+        guesses = self._answers
+        if len(guesses) > self._guess_sample_size:
+            guesses = guesses[np.sort(self._random.choice(len(guesses), self._guess_sample_size, replace=False))]
+        if len(guesses) <= 2:
+            return guesses[0].decode()
+        bucket_size = [np.unique(score_guesses(guess.decode(), self._answers), return_counts=True)[1].max()
+                       for guess in guesses]
+        return guesses[np.argmin(bucket_size)].decode()
+
+    @property
+    def num_answers(self) -> Optional[int]:
+        """Number of possible answers remaining (None before the first update())."""
+        return None if self._answers is None else len(self._answers)
+
 
 def parse_args():
     """Defines and parses command-line flags."""
@@ -264,6 +787,10 @@ def parse_args():
         default=0,
         type=int,
         help="Number of parallel jobs.")
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Update an existing database to the current answer list instead of rebuilding it.")
     return parser.parse_args()
 
 
@@ -273,7 +800,10 @@ def create_solver_data(
         overwrite: bool = False,
         max_answers: Optional[int] = None,
         num_processes: int = 2,
-        min_parallel_n: int = 20000) -> NerdleData:
+        min_parallel_n: int = 20000,
+        score_dtype=int,
+        update: bool = False,
+        partition_index: bool = False) -> NerdleData:
     """Creates/load solver data from existing h5py database file."""
     return NerdleData(
         num_slots,
@@ -281,13 +811,78 @@ def create_solver_data(
         overwrite=overwrite,
         max_answers=max_answers,
         num_processes=num_processes,
-        min_parallel_n=min_parallel_n)
-
-
-def _score_guess(args):
-    guess, answer = args
-    """Must be a top-level function (closure) to be pickeable and used within a joblib pool."""
-    return sgo.score_guess(str(guess).encode(), str(answer).encode())
+        min_parallel_n=min_parallel_n,
+        score_dtype=score_dtype,
+        update=update,
+        partition_index=partition_index)
+
+
+def update_score_database(file_name: str, answers: List[str]) -> Dict[str, int]:
+    """Rewrites the h5py score database 'file_name' for a new answer list 'answers' (stored sorted and unique),
+    scoring only the rows and columns of the answers not in the old list. The scores of the answers in both lists are
+    copied over in blocks, so the scoring work is proportional to the change rather than to a full rebuild. The file
+    is replaced atomically and keeps its score type.
+
+    Returns the #answers 'added', 'removed' and 'kept'."""
+    import h5py
+    answers = np.unique(answers)
+    with h5py.File(file_name, "r") as f:
+        old_answers = np.array([x.decode() for x in f["answers"][:]])
+        old_score_db = f["score_db"]
+        _, new_pos, old_pos = np.intersect1d(answers, old_answers, assume_unique=True, return_indices=True)
+        added = np.setdiff1d(np.arange(len(answers)), new_pos)
+        stats = dict(added=len(added), removed=len(old_answers) - len(old_pos), kept=len(old_pos))
+        if stats["added"] == 0 and stats["removed"] == 0 and np.array_equal(old_answers, answers):
+            return stats
+
+        score_db = np.zeros((len(answers), len(answers)), dtype=old_score_db.dtype)
+        # Runs of kept answers that are consecutive in both lists: (old start, new start, length). Each pair of row and
+        # column runs is one block copy; with many runs (scattered changes), columns are gathered instead.
+        breaks = np.flatnonzero((np.diff(new_pos) != 1) | (np.diff(old_pos) != 1)) + 1
+        starts = np.concatenate(([0], breaks)).astype(int) if len(new_pos) else breaks
+        runs = list(zip(old_pos[starts], new_pos[starts], np.diff(np.append(starts, len(new_pos)))))
+        for old_row, new_row, num_rows in runs:
+            rows = old_score_db[old_row:old_row + num_rows]
+            if len(runs) <= MAX_BLOCK_RUNS:
+                for old_column, new_column, num_columns in runs:
+                    score_db[new_row:new_row + num_rows, new_column:new_column + num_columns] = \
+                        rows[:, old_column:old_column + num_columns]
+            else:
+                score_db[new_row:new_row + num_rows, new_pos] = rows[:, old_pos]
+    # Only pairs involving an added answer are scored.
+    if len(added):
+        # Encoded once, since score_guesses() would otherwise convert the answer array on every call.
+        encoded = answers.astype("S{}".format(len(answers[0])))
+        added_answers = encoded[added]
+        for key in new_pos:
+            score_db[key, added] = score_guesses(answers[key], added_answers)
+        for key in added:
+            score_db[key] = score_guesses(answers[key], encoded)
+
+    tmp_file_name = file_name + ".tmp"
+    with h5py.File(tmp_file_name, "w") as f:
+        f.create_dataset("answers", data=np.array([x.encode() for x in answers]))
+        f.create_dataset("score_db", data=score_db)
+    os.replace(tmp_file_name, file_name)
+    return stats
+
+
+# Worker process state of NerdleData._create_score_database_parallel().
+_SCORE_WORKER = {}
+
+
+def _init_score_worker(answers: np.ndarray, score_db_spec):
+    _SCORE_WORKER["answers"] = answers
+    _SCORE_WORKER["score_db"] = attach_array(score_db_spec, writable=True)
+
+
+def _score_rows(block: Tuple[int, int]):
+    """Scores the guess rows start:end of the shared score database."""
+    answers, score_db = _SCORE_WORKER["answers"], _SCORE_WORKER["score_db"]
+    start, end = block
+    for i in range(start, end):
+        score_db[i] = score_guesses(answers[i].decode(), answers)
+    score_db.flush()
 
 
 class Node:
@@ -301,5 +896,6 @@ if __name__ == "__main__":
     solver_data_cy = create_solver_data(
         args.num_slots,
         args.score_db,
-        overwrite=True,
-        num_processes=args.num_jobs)
+        overwrite=not args.update,
+        num_processes=args.num_jobs,
+        update=args.update)
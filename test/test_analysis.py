@@ -3,6 +3,7 @@ import collections
 import os
 import numpy as np
 import pytest
+from numpy.testing import assert_array_equal
 
 import nerdle
 
@@ -65,35 +66,141 @@ class TestAnalysis:
         assert num_leaves == len(solver_data.answers)
         assert freq == {3: 173, 2: 31, 4: 2}
 
-    def test_min_biased_multilevel_sampling_score_db_6_slots(self, solver_data):
+    def test_num_guesses_5slots(self):
         np.random.seed(0)
+        solver_data = create_solver_data(5)
+        freq, paths = nerdle.analysis.GameTreeBuilder(solver_data).num_guesses()
+
+        # The tree of test_game_tree_builder_5slots, except that the root's guess solves its own answer in 1 guess,
+        # and the answer of a leaf whose parent guessed it is not guessed again.
+        assert freq == {1: 1, 2: 25, 3: 79, 4: 60, 5: 48, 6: 4}
+        assert paths is None
+
+    def test_num_guesses_solution_paths(self, solver_data):
+        freq, paths = nerdle.analysis.GameTreeBuilder(solver_data).num_guesses(
+            guess_coarsening_factor=1, solution_paths=True)
+
+        assert freq == {1: 1, 2: 38, 3: 165, 4: 2}
+        assert sorted(paths) == list(solver_data.all_keys)
+        assert len(set(path[0] for path in paths.values())) == 1
+        assert all(path[-1] == answer for answer, path in paths.items())
+        assert collections.Counter(len(path) for path in paths.values()) == freq
+
+    def test_num_guesses_parallel(self, solver_data):
+        builder = nerdle.analysis.GameTreeBuilder(solver_data)
+        freq, paths = builder.num_guesses(guess_coarsening_factor=1, solution_paths=True)
+        freq_parallel, paths_parallel = builder.num_guesses(
+            guess_coarsening_factor=1, solution_paths=True, num_processes=2, min_parallel_size=10)
+
+        assert freq_parallel == freq
+        assert paths_parallel == paths
+
+    def test_num_guesses_root_guess(self, solver_data):
+        builder = nerdle.analysis.GameTreeBuilder(solver_data)
+        root_guess = solver_data.key("10-5=5")
+        freq, paths = builder.num_guesses(guess_coarsening_factor=1, solution_paths=True, root_guess=root_guess)
+        freq_parallel, paths_parallel = builder.num_guesses(
+            guess_coarsening_factor=1, solution_paths=True, root_guess=root_guess, num_processes=2,
+            min_parallel_size=10)
+
+        assert sorted(paths) == list(solver_data.all_keys)
+        assert all(path[0] == root_guess for path in paths.values())
+        assert paths[root_guess] == (root_guess,)
+        assert collections.Counter(len(path) for path in paths.values()) == freq
+        assert freq_parallel == freq
+        assert paths_parallel == paths
+
+    def test_root_guess_key_matches_build(self, solver_data):
+        builder = nerdle.analysis.GameTreeBuilder(solver_data)
+        tree = builder.build(guess_coarsening_factor=1)
+        root = nerdle.analysis.Node(None, solver_data.all_keys, np.arange(len(solver_data.answers)), [])
+
+        builder._process_node(root, lambda a: nerdle.analysis.max_bucket_sizes(a) / a.shape[1],
+                              guess_coarsening_factor=1, guess_key=tree.key[0])
+
+        # The bucket size is the fraction of answers left, as at every other node.
+        assert root.key == tree.key
+        assert [child.hint for child in root.children] == [child.hint for child in tree.children]
+
+    def test_save_and_load_tree(self, solver_data, tmp_path):
+        builder = nerdle.analysis.GameTreeBuilder(solver_data)
+        tree = builder.build(guess_coarsening_factor=1)
+        _, paths = builder.num_guesses(guess_coarsening_factor=1, solution_paths=True)
+        file_name = str(tmp_path / "tree6.h5")
+        nerdle.analysis.save_tree(tree, file_name)
+
+        flat_tree = nerdle.analysis.load_tree(file_name)
+
+        tdc = nerdle.analysis.TreeDepthCalculator(tree)
+        assert flat_tree.num_nodes == len(tdc.depth)
+        assert flat_tree.num_guesses() == {1: 1, 2: 38, 3: 165, 4: 2}
+        assert all(flat_tree.solution_path(answer) == path for answer, path in paths.items())
+        depths = []
+        flat_tree.pre_traversal(lambda node, depth: depths.append(depth))
+        assert depths == list(tdc.depth.values())
+
+    def test_min_biased_multilevel_sampling_score_db_6_slots(self, solver_data):
         a = solver_data.score_db
 
         quantity = lambda a: nerdle.analysis.max_bucket_sizes(a) / a.shape[1]
         exact = quantity(a)
-        approx = nerdle.analysis.min_biased_multilevel_sampling(a, quantity, min_sample_size=100)
+        approx = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, rng=np.random.default_rng(0))
 
         assert min(approx) == min(exact)
 
+    def test_min_biased_multilevel_sampling_is_deterministic(self, solver_data):
+        a = solver_data.score_db
+        quantity = lambda a: nerdle.analysis.max_bucket_sizes(a) / a.shape[1]
+
+        approx1 = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, rng=np.random.default_rng(1))
+        approx2 = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, rng=np.random.default_rng(1))
+
+        assert_array_equal(approx1, approx2)
+
+    def test_min_biased_multilevel_sampling_tolerance(self):
+        rng = np.random.default_rng(0)
+        a = rng.integers(0, 50, (1000, 4000))
+        quantity = lambda a: nerdle.analysis.max_bucket_sizes(a) / a.shape[1]
+        exact = quantity(a)
+
+        tolerance = 0.02
+        approx, lower, upper, argmin = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=500, tolerance=tolerance, return_bounds=True, rng=rng)
+
+        assert np.all(lower <= exact)
+        assert np.all(exact <= upper)
+        assert exact[argmin] <= min(exact) + tolerance
+
     def test_min_biased_multilevel_sampling_random_matrix(self, solver_data):
-        np.random.seed(0)
-        a = np.random.randint(0, 50, (1000, 1000))
+        a = np.random.default_rng(0).integers(0, 50, (1000, 1000))
 
         quantity = lambda a: nerdle.analysis.max_bucket_sizes(a) / a.shape[1]
         exact = quantity(a)
         exact_min = min(exact)
 
-        approx = nerdle.analysis.min_biased_multilevel_sampling(a, quantity, min_sample_size=100, sample_factor=1.9)
+        approx = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, sample_factor=1.9, rng=np.random.default_rng(0))
         assert min(approx) == exact_min
 
-        approx = nerdle.analysis.min_biased_multilevel_sampling(a, quantity, min_sample_size=100, sample_factor=1.5)
+        approx = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, sample_factor=1.5, rng=np.random.default_rng(0))
         assert min(approx) <= 1.05 * exact_min
 
+        # Zero tolerance: rows are only dropped when their bounds rule them out.
+        approx, _, _, argmin = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, tolerance=0, return_bounds=True, rng=np.random.default_rng(0))
+        assert min(approx) == exact_min
+        assert exact[argmin] == exact_min
+
     def test_min_biased_multilevel_sampling_small_matrix(self, solver_data):
-        np.random.seed(0)
-        a = np.random.randint(0, 50, (217, 9))
+        rng = np.random.default_rng(0)
+        a = rng.integers(0, 50, (217, 9))
         quantity = lambda a: nerdle.analysis.max_bucket_sizes(a) / a.shape[1]
 
-        approx = nerdle.analysis.min_biased_multilevel_sampling(a, quantity, min_sample_size=100, sample_factor=1.9)
+        approx = nerdle.analysis.min_biased_multilevel_sampling(
+            a, quantity, min_sample_size=100, sample_factor=1.9, rng=rng)
 
         assert len(approx) == 217
\ No newline at end of file
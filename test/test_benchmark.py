@@ -0,0 +1,84 @@
+"""Benchmark suite unit tests."""
+import json
+import os
+import subprocess
+import sys
+
+import nerdle
+from nerdle.benchmark import build, sampling, suite
+
+
+class TestBenchmark:
+    def test_run_benchmarks(self):
+        results = suite.run_benchmarks(5, repeat=1, num_games=3)
+
+        assert set(results) >= {"generate", "db_build", "db_build_parallel", "db_load", "score_single", "score_batch",
+                                "make_guess", "solve", "tree_build"}
+        assert all(t >= 0 for t in results.values())
+
+    def test_run_benchmarks_db_dir(self, tmp_path):
+        file_name = str(tmp_path / "nerdle5.db")
+        suite.run_benchmarks(5, db_dir=str(tmp_path), repeat=1, num_games=3, max_answers=100, tree=False)
+        assert len(suite._stored_answers(file_name)) == 100
+
+        # A database of another answer list is not reused, nor replaced.
+        results = suite.run_benchmarks(5, db_dir=str(tmp_path), repeat=1, num_games=3, tree=False)
+        assert len(suite._stored_answers(file_name)) == 100
+        assert "solve" in results
+
+    def test_import_is_lazy(self):
+        for module in suite.IMPORT_MODULES:
+            assert suite.heavy_imports(module) == [], module
+
+    def test_import_times(self):
+        times = suite.import_times(repeat=1)
+
+        assert set(times) == {"import_{}".format(module) for module in suite.IMPORT_MODULES}
+        assert all(t > 0 for t in times.values())
+
+    def test_benchmark_approximate_solver(self):
+        data = nerdle.solver.create_solver_data(6, os.path.join(nerdle.DB_DIR, "nerdle6.db"))
+        solver_options = [dict(), dict(exact_threshold=20, guess_sample_size=100, answer_sample_size=10)]
+
+        results = sampling.benchmark_approximate_solver(
+            data, ["4*7=28", "4*3=12", "10-5=5"], "54/9=6", solver_options=solver_options)
+
+        assert [r["options"] for r in results] == solver_options
+        assert all(r["failures"] == 0 for r in results)
+        assert all(2 <= r["mean_guesses"] <= r["max_guesses"] <= 6 for r in results)
+
+    def test_benchmark_build_scaling(self):
+        results = build.benchmark_build_scaling(5, [1, 2])
+
+        assert [r["num_processes"] for r in results] == [1, 2]
+        assert results[0]["speedup"] == results[0]["efficiency"] == 1
+        assert all(r["time"] > 0 and r["num_answers"] == 217 for r in results)
+
+    def test_compare(self):
+        baseline = dict(results={"6": dict(generate=1.0, solve=0.01)})
+        results = dict(results={"6": dict(generate=1.1, solve=0.02, make_guess=0.5)})
+
+        regressions = suite.compare(results, baseline, threshold=0.2)
+
+        assert [(r["num_slots"], r["name"]) for r in regressions] == [("6", "solve")]
+
+    def test_cli(self, tmp_path):
+        output = str(tmp_path / "bench.json")
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(nerdle.__file__)))
+        command = [sys.executable, "-m", "nerdle.benchmark", "--num_slots", "5", "--repeat", "1", "--num_games",
+                   "2", "--no_tree", "--output", output]
+        subprocess.run(command, env=env, check=True, capture_output=True)
+        with open(output) as f:
+            results = json.load(f)
+        assert "cpu_count" in results["machine"]
+        assert "solve" in results["results"]["5"]
+        assert "import_nerdle" in results["results"]["import"]
+
+        # Comparing against a much faster baseline is a regression.
+        baseline = dict(results={"5": {name: t / 10 for name, t in results["results"]["5"].items()}})
+        with open(str(tmp_path / "baseline.json"), "w") as f:
+            json.dump(baseline, f)
+        process = subprocess.run(command + ["--baseline", str(tmp_path / "baseline.json")], env=env,
+                                 capture_output=True, text=True)
+        assert process.returncode == 1
+        assert "REGRESSION" in process.stdout
@@ -0,0 +1,53 @@
+"""Bitset index unit tests."""
+import numpy as np
+import os
+import pytest
+from numpy.testing import assert_array_equal
+
+import nerdle
+from nerdle.bitset import BitsetIndex
+from nerdle.score import score_guesses
+
+NUM_SLOTS = 6
+
+
+@pytest.fixture()
+def solver_data():
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+class TestBitsetIndex:
+    def test_answers_of_score_matches_score_db(self, solver_data):
+        index = BitsetIndex(solver_data.answers)
+        score_db = solver_data.score_db
+
+        for guess in range(len(solver_data.answers)):
+            for score in np.unique(score_db[guess]):
+                assert_array_equal(index.answers_of_score(solver_data.answers[guess], score),
+                                   np.flatnonzero(score_db[guess] == score))
+
+    def test_guess_outside_answer_list(self, solver_data):
+        index = BitsetIndex(solver_data.answers)
+
+        # Not valid answers, or with symbols repeated more than any answer has them.
+        for guess in ("1+1=3+", "000000", "9*9*9=", "=12+34"):
+            scores = score_guesses(guess, solver_data.answers)
+            for score in np.unique(scores):
+                assert_array_equal(index.answers_of_score(guess, int(score)), np.flatnonzero(scores == score))
+
+    def test_successive_filters(self, solver_data):
+        index = BitsetIndex(solver_data.answers)
+        answer = "4*7=28"
+
+        bits = index.all()
+        for guess in ("54/9=6", "10-5=5"):
+            bits = index.filter(guess, nerdle.score.score_guess(guess, answer), bits)
+
+        expected = [a for a in solver_data.answers if all(
+            nerdle.score.score_guess(guess, a) == nerdle.score.score_guess(guess, answer)
+            for guess in ("54/9=6", "10-5=5"))]
+        assert list(solver_data.answers[index.keys(bits)]) == expected
+        assert index.count(bits) == len(expected)
+        assert index.count(index.all()) == len(solver_data.answers)
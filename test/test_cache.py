@@ -0,0 +1,74 @@
+"""Best-guess transposition cache unit tests."""
+import os
+import numpy as np
+import pytest
+
+import nerdle
+from nerdle.cache import GuessCache
+
+NUM_SLOTS = 6
+
+
+@pytest.fixture()
+def solver_data():
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+class TestGuessCache:
+    def test_fingerprint(self):
+        key = GuessCache.fingerprint(np.array([3, 1, 2]), "a")
+
+        assert GuessCache.fingerprint(np.array([1, 2, 3]), "a") == key
+        assert GuessCache.fingerprint(np.array([1, 2, 3]), "b") != key
+        assert GuessCache.fingerprint(np.array([1, 2]), "a") != key
+
+    def test_lru_eviction_and_stats(self):
+        cache = GuessCache(max_size=2)
+        cache.put(b"a", 1)
+        cache.put(b"b", 2)
+        assert cache.get(b"a") == 1
+        cache.put(b"c", 3)
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == 1
+        assert cache.get(b"c") == 3
+        assert cache.stats() == dict(hits=3, disk_hits=0, misses=1, hit_rate=0.75, size=2)
+
+    def test_disk_store_is_shared(self, tmp_path):
+        file_name = str(tmp_path / "guesses.sqlite")
+        with GuessCache(max_size=1, file_name=file_name) as cache:
+            cache.put(b"a", 1)
+            cache.put(b"b", 2)
+            # Evicted from memory, served by the store.
+            assert cache.get(b"a") == 1
+        with GuessCache(file_name=file_name) as other:
+            assert other.get(b"b") == 2
+            assert other.get(b"c") is None
+            assert other.stats()["disk_hits"] == 1
+
+    def test_solver_uses_cache(self, solver_data):
+        cache = GuessCache()
+        answers = ["4*7=28", "4*3=12", "10-5=5", "4*7=28"]
+
+        for answer in answers:
+            expected = nerdle.solver.NerdleSolver(solver_data).solve(answer, initial_guess="54/9=6")
+            assert nerdle.solver.NerdleSolver(solver_data, cache=cache).solve(answer, initial_guess="54/9=6") == \
+                expected
+        stats = cache.stats()
+
+        # The last game repeats the first one's states.
+        assert stats["hits"] >= 2
+        assert stats["misses"] == stats["size"]
+
+    def test_solver_cache_namespace(self, solver_data):
+        def namespace(data, **options):
+            return nerdle.solver.NerdleSolver(data, cache=GuessCache(), **options)._cache_namespace
+
+        # An answer list of the same size, but with different answers behind the same keys.
+        other_data = nerdle.solver.NerdleData.from_arrays(
+            NUM_SLOTS, solver_data.answers[::-1], solver_data.score_db[::-1, ::-1])
+        assert namespace(other_data) != namespace(solver_data)
+        assert namespace(solver_data, seed=1) == namespace(solver_data, seed=2)
+        assert namespace(solver_data, exact_threshold=10, seed=1) != namespace(solver_data, exact_threshold=10, seed=2)
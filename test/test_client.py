@@ -53,9 +53,78 @@ class TestClient:
             '?-??++-?',
             '++++++++']
 
+    def test_play_game_local_page(self, solver_data):
+        solver = nerdle.solver.NerdleSolver(solver_data)
+        with nerdle.client.LocalGamePage() as page:
+            success, guess_history, hint_history = self.client.play_game(
+                solver, page.url("2+1+8=11"), live=False)
+        assert success
+        assert guess_history == ['9*8-7=65', '14+18=32', '2+1+8=11']
+        assert [
+            score_to_hint_string(
+                hint,
+                NUM_SLOTS) for hint in hint_history] == [
+            '--?--+--',
+            '?-??++-?',
+            '++++++++']
+
+    def test_grid_values_local_page(self):
+        with nerdle.client.LocalGamePage() as page:
+            self.client.load(page.url("2+1+8=11"))
+            self.client.input_guess("9*8-7=65")
+            value, status = self.client.grid_values()
+        assert value.shape == (MAX_GUESSES, NUM_SLOTS)
+        assert "".join(value[0]) == "9*8-7=65"
+        assert all(x == "." for x in value[1])
+        assert score_to_hint_string(nerdle.score.hints_to_score(status[0]), NUM_SLOTS) == '--?--+--'
+
     def test_live_game(self, solver_data):
         solver = nerdle.solver.NerdleSolver(solver_data)
         success, guess_history, hint_history = self.client.play_game(
             solver, "https://nerdlegame.com", live=True)
         assert success
         assert len(guess_history) <= 4
+
+    def test_reload_uses_cached_button_map(self):
+        with nerdle.client.LocalGamePage() as page:
+            self.client.load(page.url("2+1+8=11"))
+            actions = self.client._actions
+            # Reloading the page makes its button elements stale, but not the cached button indices.
+            self.client.load(page.url("56/7-1=7"))
+            assert self.client._actions is actions
+            self.client.input_guess("9*8-7=65")
+            value, status = self.client.grid_values()
+        assert "".join(value[0]) == "9*8-7=65"
+        assert score_to_hint_string(nerdle.score.hints_to_score(status[0]), NUM_SLOTS) == '---?????'
+
+
+class TestSessionPool:
+    ANSWERS = ["2+1+8=11", "14+18=32", "9*8-7=65", "56/7-1=7"]
+
+    def test_play_games(self, solver_data):
+        with nerdle.client.LocalGamePage() as page, \
+                nerdle.client.SessionPool(2, warm_url=page.url(self.ANSWERS[0])) as pool:
+            results = pool.play_games(solver_data, [page.url(answer) for answer in self.ANSWERS],
+                                      initial_guess="9*8-7=65")
+
+        assert [result["success"] for result in results] == [True] * len(self.ANSWERS)
+        assert [result["guesses"][-1] for result in results] == self.ANSWERS
+        assert pool.num_recycled == 0
+
+    def test_recycles_crashed_session(self, solver_data):
+        drivers = []
+
+        def driver_factory():
+            drivers.append(nerdle.client.headless_chrome_driver())
+            return drivers[-1]
+
+        with nerdle.client.LocalGamePage() as page, \
+                nerdle.client.SessionPool(1, driver_factory=driver_factory) as pool:
+            # Simulates a browser crash.
+            drivers[0].quit()
+            success, guess_history, _ = pool.play_game(solver_data, page.url("2+1+8=11"), initial_guess="9*8-7=65")
+
+        assert success
+        assert guess_history == ['9*8-7=65', '14+18=32', '2+1+8=11']
+        assert pool.num_recycled == 1
+        assert len(drivers) == 2
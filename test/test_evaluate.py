@@ -0,0 +1,80 @@
+"""Solver evaluation harness unit tests."""
+import json
+import os
+import pytest
+
+import nerdle
+from nerdle import evaluate
+
+NUM_SLOTS = 6
+ANSWERS = ["4*7=28", "4*3=12", "10-5=5", "54/9=6"]
+
+
+def create_solver_data(num_slots: int):
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(num_slots))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(num_slots, file_name)
+
+
+class TestEvaluate:
+    def test_evaluate_all_answers(self):
+        data = create_solver_data(5)
+
+        result = evaluate.evaluate(data)
+
+        assert result["num_games"] == len(data.answers)
+        assert result["failures"] == []
+        assert sum(result["num_guesses"].values()) == len(data.answers)
+        assert 1 <= result["mean_guesses"] <= result["max_guesses"] <= 6
+        assert result["games_per_second"] > 0
+
+    def test_evaluate_writes_and_resumes(self, tmp_path):
+        data = create_solver_data(NUM_SLOTS)
+        output = str(tmp_path / "eval.jsonl")
+
+        first = evaluate.evaluate(data, ANSWERS[:2], output=output, initial_guess="54/9=6")
+        # Simulates a run interrupted while writing a line.
+        with open(output, "a") as f:
+            f.write('{"answer": "10-')
+        second = evaluate.evaluate(data, ANSWERS, output=output, initial_guess="54/9=6")
+
+        assert first["num_games"] == 2
+        assert second["num_games"] == 4
+        results = evaluate.load_results(output)
+        assert set(results) == set(ANSWERS)
+        assert all(r["guesses"][0] == "54/9=6" and r["guesses"][-1] == r["answer"] for r in results.values())
+        assert results["54/9=6"]["num_guesses"] == 1
+        assert evaluate.load_config(output) == dict(num_slots=NUM_SLOTS, initial_guess="54/9=6", max_guesses=6,
+                                                    solver_options={})
+        with open(output) as f:
+            # The header line, then one line per answer.
+            assert sum(1 for _ in f) == 5
+
+    def test_evaluate_refuses_other_config(self, tmp_path):
+        data = create_solver_data(NUM_SLOTS)
+        output = str(tmp_path / "eval.jsonl")
+        evaluate.evaluate(data, ANSWERS[:2], output=output, initial_guess="54/9=6")
+
+        for options in (dict(initial_guess="4*7=28"), dict(initial_guess="54/9=6", max_guesses=5),
+                        dict(initial_guess="54/9=6", solver_options=dict(exact_threshold=0))):
+            with pytest.raises(ValueError):
+                evaluate.evaluate(data, ANSWERS, output=output, **options)
+        assert len(evaluate.load_results(output)) == 2
+
+    def test_evaluate_parallel_equals_serial(self, tmp_path):
+        data = create_solver_data(NUM_SLOTS)
+        output = str(tmp_path / "eval.jsonl")
+
+        serial = evaluate.evaluate(data, ANSWERS)
+        parallel = evaluate.evaluate(data, ANSWERS, output=output, num_processes=2, chunksize=1)
+
+        for key in ("num_games", "num_guesses", "mean_guesses", "max_guesses", "failures"):
+            assert parallel[key] == serial[key]
+        with open(output) as f:
+            assert all(json.loads(line)["answer"] in ANSWERS for line in list(f)[1:])
+
+    def test_summary_failures(self):
+        result = evaluate.summary([dict(answer="1+2=3", guesses=None, num_guesses=None),
+                                   dict(answer="2+2=4", guesses=["1+2=3", "2+2=4"], num_guesses=2)])
+
+        assert result == dict(num_games=2, num_guesses={2: 1}, mean_guesses=2.0, max_guesses=2, failures=["1+2=3"])
@@ -0,0 +1,112 @@
+"""Local Nerdle game server unit tests."""
+import os
+import threading
+import urllib.error
+import pytest
+
+import nerdle
+import nerdle.game_server
+
+NUM_SLOTS = 6
+
+
+@pytest.fixture()
+def solver_data():
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+@pytest.fixture()
+def server(solver_data):
+    with nerdle.game_server.GameServer(answers={NUM_SLOTS: list(solver_data.answers)}, seed=0) as server:
+        yield server
+
+
+class TestGameServer:
+    def test_play_game(self, server):
+        client = nerdle.game_server.GameClient(server.url)
+        game = client.new_game(NUM_SLOTS, answer="4*7=28")
+
+        result = client.guess(game["game_id"], "54/9=6")
+        assert result["hint"] == "-?--?-"
+        assert not result["solved"]
+        assert result["guesses_left"] == game["max_guesses"] - 1
+
+        result = client.guess(game["game_id"], "4*7=28")
+        assert result["hint"] == "++++++"
+        assert result["solved"]
+
+    def test_errors(self, server):
+        client = nerdle.game_server.GameClient(server.url)
+        game = client.new_game(NUM_SLOTS, answer="4*7=28")
+
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.guess(game["game_id"], "1+1=2")
+        assert e.value.code == 400
+
+        client.guess(game["game_id"], "4*7=28")
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.guess(game["game_id"], "4*7=28")
+        assert e.value.code == 404
+
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.new_game(12)
+        assert e.value.code == 400
+
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.new_game(18, answer="1" * 9 + "=" + "1" * 8)
+        assert e.value.code == 400
+
+        for body in ([], 1, "x"):
+            with pytest.raises(urllib.error.HTTPError) as e:
+                client._post("/games", body)
+            assert e.value.code == 400
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client._post("/games/{}/guess".format(client.new_game(NUM_SLOTS)["game_id"]), dict(guess=5))
+        assert e.value.code == 400
+
+    def test_generates_answers_without_blocking(self, server, monkeypatch):
+        generating, release = threading.Event(), threading.Event()
+
+        def all_answers(num_slots):
+            generating.set()
+            release.wait()
+            return iter(["1+2=3"])
+
+        monkeypatch.setattr(nerdle.game_server.generator, "all_answers", all_answers)
+        games = []
+        new_game = threading.Thread(target=lambda: games.append(server.new_game(5)))
+        new_game.start()
+        assert generating.wait(10)
+
+        # Other games are played while the 5-slot answers are being generated.
+        def play():
+            game = server.new_game(NUM_SLOTS, answer="4*7=28")
+            server.guess(game["game_id"], "4*7=28")
+
+        other_game = threading.Thread(target=play)
+        other_game.start()
+        other_game.join(10)
+        played = not other_game.is_alive()
+        release.set()
+        new_game.join()
+        assert played
+        assert server.guess(games[0]["game_id"], "1+2=3")["solved"]
+
+    def test_12_slots(self, server):
+        client = nerdle.game_server.GameClient(server.url)
+        game = client.new_game(12, answer="12+34+56=102")
+
+        result = client.guess(game["game_id"], "12+34+56=102")
+        assert result["hint"] == "+" * 12
+        assert result["solved"]
+
+    def test_run_load(self, server, solver_data):
+        result = nerdle.game_server.run_load(server.url, solver_data, num_games=20, concurrency=4)
+
+        assert result["num_games"] == 20
+        assert result["failures"] == 0
+        assert sum(result["num_guesses"].values()) == 20
+        assert result["games_per_second"] > 0
+        assert result["request_latency"]["p50"] <= result["request_latency"]["p99"]
@@ -1,7 +1,7 @@
 """Nerdle game solver unit tests."""
 
 import nerdle.generator
-from nerdle.score import OPERATIONS
+from nerdle.score import OPERATIONS, score_guess
 
 
 class TestGenerator:
@@ -20,10 +20,44 @@ class TestGenerator:
         assert len(list(nerdle.generator.all_answers(7))) == 7561
         assert len(list(nerdle.generator.all_answers(8))) == 17723
 
+    def test_all_answers_values(self):
+        # Answers are generated without eval(); check their values against it.
+        for answer in nerdle.generator.all_answers(8):
+            lhs, rhs = answer.split("=")
+            assert lhs == rhs or eval(lhs) == int(rhs), answer
+
     def test_num_answers_debug(self):
         print("\n")
         a = list(nerdle.generator.all_answers(7, debug=True))
 
+    def test_consistent_answers_empty_history_equals_all_answers(self):
+        for num_slots in range(4, 8):
+            assert list(nerdle.generator.consistent_answers(num_slots, [])) == \
+                list(nerdle.generator.all_answers(num_slots))
+
+    def test_consistent_answers(self):
+        for num_slots, guesses, answer in (
+                (6, ("54/9=6", "1+9=10"), "4*3=12"),
+                (7, ("12+3=15", "9*9=81"), "12*4=48"),
+                (7, ("12*4=48",), "12*4=48"),
+                (7, ("777=777", "1+2+3=6"), "123=123"),
+                (8, ("9*8-7=65", "14+18=32"), "2+1+8=11")):
+            history = [(guess, score_guess(guess, answer)) for guess in guesses]
+            expected = [a for a in nerdle.generator.all_answers(num_slots)
+                        if all(score_guess(guess, a) == score for guess, score in history)]
+
+            assert list(nerdle.generator.consistent_answers(num_slots, history)) == expected
+            assert answer in expected
+
+    def test_consistent_answers_10_slots(self):
+        guess, answer = "17-9+54=62", "84-5+19=98"
+        score = score_guess(guess, answer)
+
+        answers = list(nerdle.generator.consistent_answers(10, [(guess, score)]))
+
+        assert answer in answers
+        assert all(score_guess(guess, a) == score for a in answers)
+
 
 # A fantastic dynamic programming implementation from https://github.com/starypatyk/nerdle-solver/blob/main/gen_perms.py
 # Simplified and generalized to any #slots.
@@ -0,0 +1,63 @@
+"""Solver metrics and profiling unit tests."""
+import os
+import json
+import pytest
+
+import nerdle
+import nerdle.metrics
+
+NUM_SLOTS = 6
+
+
+@pytest.fixture()
+def solver_data():
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+class TestMetrics:
+    def test_aggregate_turn_metrics(self, solver_data, tmp_path):
+        metrics = nerdle.metrics.MetricsAggregator()
+        answers = ["4*7=28", "4*3=12", "10-5=5"]
+        for answer in answers:
+            solver = nerdle.solver.NerdleSolver(solver_data, metrics=metrics)
+            guess_history, _, _ = solver.solve(answer, initial_guess="54/9=6")
+            assert guess_history[-1] == answer
+
+        summary = metrics.summary()
+        assert summary["num_games"] == len(answers)
+        assert summary["num_turns"] == len(metrics.records)
+        assert set(summary["phases"]) == {"filter", "restrict", "search"}
+        assert all(r["candidates_after"] <= r["candidates_before"] for r in metrics.records)
+        assert metrics.records[0]["candidates_before"] == len(solver_data.answers)
+        assert metrics.records[0]["rows_evaluated"] == len(solver_data.answers)
+        assert metrics.records[0]["bytes_allocated"] > 0
+
+        file_name = str(tmp_path / "metrics.json")
+        metrics.export(file_name)
+        with open(file_name) as f:
+            assert json.load(f)["summary"]["num_turns"] == summary["num_turns"]
+
+    def test_instrumented_solver_makes_same_guesses(self, solver_data):
+        expected = nerdle.solver.NerdleSolver(solver_data).solve("4*3=12", initial_guess="54/9=6")
+        profiler = nerdle.metrics.SamplingProfiler(interval=0.0001)
+        solver = nerdle.solver.NerdleSolver(
+            solver_data, metrics=nerdle.metrics.MetricsAggregator(), profiler=profiler)
+        assert solver.solve("4*3=12", initial_guess="54/9=6") == expected
+
+    def test_sampling_profiler(self):
+        profiler = nerdle.metrics.SamplingProfiler(interval=0.0005)
+        with profiler:
+            busy_loop()
+
+        assert profiler.num_samples > 0
+        assert "busy_loop" in profiler.top(1)[0][0]
+        assert any("busy_loop" in name for name in profiler.total_counts)
+
+
+def busy_loop():
+    x = 0
+    for i in range(2000000):
+        x += i
+    return x
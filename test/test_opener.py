@@ -0,0 +1,66 @@
+"""Opener search unit tests."""
+import collections
+import os
+import numpy as np
+
+import nerdle
+from nerdle import opener
+
+
+def create_solver_data(num_slots: int):
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(num_slots))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(num_slots, file_name)
+
+
+class TestOpener:
+    def test_screen(self):
+        data = create_solver_data(5)
+        n = len(data.answers)
+
+        stats = opener.screen(data.score_db, max_chunk_size=10 * n)
+
+        for guess_key in range(len(data.all_keys)):
+            sizes = np.array(list(collections.Counter(data.score_db[guess_key].tolist()).values()))
+            assert stats["max_bucket"][guess_key] == sizes.max()
+            assert stats["num_buckets"][guess_key] == len(sizes)
+            assert stats["expected_bucket"][guess_key] == (sizes ** 2).sum() / n
+
+    def test_evaluate_opener(self):
+        data = create_solver_data(6)
+        guess = "54/9=6"
+
+        result = opener.evaluate_opener(data, data.key(guess))
+
+        assert result["guess"] == guess
+        assert sum(result["num_guesses"].values()) == len(data.answers)
+        # Only the opener's own answer is solved in one guess.
+        assert result["num_guesses"][1] == 1
+        assert result["failures"] == 0
+        assert 1 < result["mean_guesses"] <= result["max_guesses"] <= 6
+
+    def test_search_openers(self):
+        data = create_solver_data(5)
+
+        table = opener.search_openers(data, top_k=4)
+        table_parallel = opener.search_openers(data, top_k=4, num_processes=2)
+
+        assert len(table) == 4
+        assert sorted(row["screen_rank"] for row in table) == [1, 2, 3, 4]
+        keys = [(row["failures"], row["mean_guesses"], row["max_guesses"]) for row in table]
+        assert keys == sorted(keys)
+        assert table_parallel == table
+        assert opener.format_table(table).splitlines()[1].split()[1] == table[0]["guess"]
+
+    def test_save_opener(self, tmp_path):
+        file_name = str(tmp_path / "openers.json")
+
+        assert nerdle.solver.load_openers(file_name) == {}
+        nerdle.solver.save_opener(6, "28/7=4", file_name)
+        nerdle.solver.save_opener(5, "3+1=4", file_name)
+
+        openers = nerdle.solver.load_openers(file_name)
+        assert openers == {5: "3+1=4", 6: "28/7=4"}
+        assert nerdle.solver.default_initial_guess(6, openers) == "28/7=4"
+        assert nerdle.solver.default_initial_guess(7, openers) == nerdle.solver.INITIAL_GUESS[7]
+        assert nerdle.solver.default_initial_guess(6) == nerdle.solver.INITIAL_GUESS[6]
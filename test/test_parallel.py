@@ -1,5 +1,4 @@
 """Nerdle game solver unit tests."""
-import ctypes
 import itertools
 import os
 import multiprocessing
@@ -9,7 +8,8 @@ import pytest
 from numpy.testing import assert_array_equal
 
 import nerdle
-sgo = ctypes.CDLL(nerdle.score.SCORE_GUESS_SO)
+import nerdle.parallel
+from nerdle.score import score_guess
 
 # By default, all tests are for mini-nerdle unless #slots explicitly
 # stated in a test function.
@@ -39,6 +39,18 @@ class TestParallel:
                     a_args, itertools.repeat(second_arg))) == [
                 2, 3, 4]
 
+    def test_shared_array(self):
+        a = np.arange(12).reshape(3, 4)
+        with nerdle.parallel.SharedArray(a) as shared:
+            with multiprocessing.Pool(processes=2) as pool:
+                assert pool.map(shared_row_sum, [(shared.spec, i) for i in range(3)]) == list(a.sum(axis=1))
+
+    def test_shared_array_written_by_workers(self):
+        with nerdle.parallel.SharedArray(shape=(4, 3), dtype=np.int32) as shared:
+            with multiprocessing.Pool(processes=2) as pool:
+                pool.map(fill_shared_row, [(shared.spec, i) for i in range(4)])
+            assert_array_equal(shared.array, np.repeat(np.arange(4)[:, None], 3, axis=1))
+
     def test_starmap_score_guess(self):
         guess = "54/9=6"
         answer = "4*7=28"
@@ -48,6 +60,16 @@ class TestParallel:
                 guess, n), itertools.repeat(answer, n))) == [520] * (n ** 2)
 
 
+def shared_row_sum(args):
+    spec, i = args
+    return nerdle.parallel.attach_array(spec)[i].sum()
+
+
+def fill_shared_row(args):
+    spec, i = args
+    nerdle.parallel.attach_array(spec, writable=True)[i] = i
+
+
 def square(x):
     return x * x
 
@@ -58,15 +80,15 @@ def add(a, b):
 
 def process(guess, answer):
     """Must be a top-level function (closure) to be pickeable and used within a joblib pool."""
-    return sgo.score_guess(str(guess).encode(), str(answer).encode())
+    return score_guess(guess, answer)
 
 
 def process_one_arg(answer):
     """Must be a top-level function (closure) to be pickeable and used within a joblib pool."""
-    return sgo.score_guess(str(GUESS).encode(), str(answer).encode())
+    return score_guess(GUESS, answer)
 
 
 def process_args(args):
     guess, answer = args
     """Must be a top-level function (closure) to be pickeable and used within a joblib pool."""
-    return sgo.score_guess(str(guess).encode(), str(answer).encode())
+    return score_guess(guess, answer)
@@ -0,0 +1,91 @@
+"""Hint-partition index unit tests."""
+import os
+import shutil
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+import nerdle
+from nerdle.analysis import _partition
+from nerdle.partition import PartitionIndex, sidecar_file_name
+
+NUM_SLOTS = 6
+
+
+@pytest.fixture()
+def solver_data():
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+class TestPartitionIndex:
+    def test_answers_of_score_matches_score_db(self, solver_data):
+        score_db = solver_data.score_db
+        index = PartitionIndex.build(score_db, max_chunk_size=1000)
+
+        for guess in range(len(solver_data.answers)):
+            for score in np.unique(score_db[guess]):
+                assert_array_equal(index.answers_of_score(guess, score), np.flatnonzero(score_db[guess] == score))
+            assert len(index.answers_of_score(guess, score_db.max() + 1)) == 0
+
+    def test_partition_matches_partition_of_score_row(self, solver_data):
+        score_db = solver_data.score_db
+        index = PartitionIndex.build(score_db)
+        answers = np.arange(0, score_db.shape[1], 3)
+
+        for guess in range(0, len(solver_data.answers), 7):
+            for subset in (None, answers):
+                keys = np.arange(score_db.shape[1]) if subset is None else subset
+                expected_hints, expected_buckets = _partition(score_db[guess, keys])
+                hints, buckets = index.partition(guess, subset)
+                assert_array_equal(hints, expected_hints)
+                assert len(buckets) == len(expected_buckets)
+                for bucket, expected_bucket in zip(buckets, expected_buckets):
+                    assert_array_equal(bucket, keys[expected_bucket])
+
+    def test_sidecar_file(self, solver_data, tmp_path):
+        file_name = str(tmp_path / "nerdle6.db")
+        shutil.copy(os.path.join(nerdle.DB_DIR, "nerdle6.db"), file_name)
+
+        data = nerdle.solver.create_solver_data(NUM_SLOTS, file_name, partition_index=True)
+        assert os.path.exists(sidecar_file_name(file_name))
+        loaded = nerdle.solver.create_solver_data(NUM_SLOTS, file_name, partition_index=True).partition_index
+
+        assert isinstance(loaded.keys, np.memmap)
+        for name in ("keys", "hint_ptr", "hints", "starts"):
+            assert_array_equal(getattr(loaded, name), getattr(data.partition_index, name))
+
+        # A stale index is rebuilt.
+        nerdle.solver.update_score_database(file_name, data.answers[:100])
+        data = nerdle.solver.create_solver_data(NUM_SLOTS, file_name, partition_index=True)
+        assert data.partition_index.shape == (100, 100)
+
+    def test_solver_and_tree_builder_use_index(self, solver_data, tmp_path):
+        file_name = str(tmp_path / "nerdle6.db")
+        shutil.copy(os.path.join(nerdle.DB_DIR, "nerdle6.db"), file_name)
+        data = nerdle.solver.create_solver_data(NUM_SLOTS, file_name, partition_index=True)
+
+        for answer in ("4*7=28", "4*3=12", "10-5=5"):
+            assert nerdle.solver.NerdleSolver(data).solve(answer, initial_guess="54/9=6") == \
+                nerdle.solver.NerdleSolver(solver_data).solve(answer, initial_guess="54/9=6")
+        np.random.seed(0)
+        expected = nerdle.analysis.GameTreeBuilder(solver_data).num_guesses(solution_paths=True)
+        np.random.seed(0)
+        assert nerdle.analysis.GameTreeBuilder(data).num_guesses(solution_paths=True) == expected
+
+    def test_solver_contradictory_hints(self, solver_data, tmp_path):
+        file_name = str(tmp_path / "nerdle6.db")
+        shutil.copy(os.path.join(nerdle.DB_DIR, "nerdle6.db"), file_name)
+        data = nerdle.solver.create_solver_data(NUM_SLOTS, file_name, partition_index=True)
+        guess, other_guess = data.key("54/9=6"), data.key("4*7=28")
+        score, other_score = data.score_db[guess, guess], data.score_db[guess, other_guess]
+
+        for d in (data, solver_data):
+            s = nerdle.solver.NerdleSolver(d)
+            s.update(guess, score)
+            s.update(guess, other_score)
+            assert s.num_answers == 0
+            # The next hint's bucket is not empty, but no answer is left to intersect it with.
+            s.update(other_guess, data.score_db[other_guess, other_guess])
+            assert s.num_answers == 0
@@ -0,0 +1,103 @@
+"""Game log replay unit tests."""
+import io
+import json
+import os
+import pytest
+
+import nerdle
+from nerdle import replay
+from nerdle.score import score_guess, score_to_hint_string
+
+NUM_SLOTS = 6
+
+
+@pytest.fixture()
+def solver_data():
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+def solver_record(solver_data, answer: str, game_id: str):
+    guesses, _, _ = nerdle.solver.NerdleSolver(solver_data).solve(answer, initial_guess="54/9=6")
+    return dict(id=game_id, answer=answer, guesses=[str(g) for g in guesses])
+
+
+class TestReplay:
+    def test_replay_matching_play(self, solver_data):
+        record = solver_record(solver_data, "4*3=12", "g1")
+
+        result = replay.replay_game(solver_data, record)
+
+        assert result["diverged_at"] is None
+        assert result["decisions"][:-1] == record["guesses"][1:]
+        assert result["decisions"][-1] is None
+        assert result["logged_num_guesses"] == result["solver_num_guesses"] == len(record["guesses"])
+
+    def test_replay_hint_log_divergence(self, solver_data):
+        # A guess outside the solver's choice (and a hint log without the answer).
+        guesses = ["54/9=6", "4*7=28", "4*3=12"]
+        hints = [score_to_hint_string(score_guess(guess, "4*3=12"), NUM_SLOTS) for guess in guesses]
+        record = dict(guesses=guesses, hints=hints)
+
+        result = replay.replay_game(solver_data, record)
+
+        assert "error" not in result
+        assert result["diverged_at"] == 1
+        assert result["logged_num_guesses"] == 3
+        assert "solver_num_guesses" not in result
+
+    def test_replay_opener_outside_answer_list(self, solver_data):
+        record = dict(id="o", guesses=["9*9*9=", "4*7=28"], answer="4*7=28")
+
+        result = replay.replay_game(solver_data, record)
+
+        assert "error" not in result
+        assert result["logged_num_guesses"] == 2
+        s = nerdle.solver.NerdleSolver(solver_data)
+        s.update_with_guess("9*9*9=", score_guess("9*9*9=", "4*7=28"))
+        guess_history, _, _ = s.solve("4*7=28", max_guesses=5, initial_guess=result["decisions"][0])
+        assert result["solver_num_guesses"] == 1 + len(guess_history)
+
+    def test_replay_bad_record(self, solver_data):
+        result = replay.replay_game(solver_data, dict(id="bad", guesses=["54/9=6"], hints=[]))
+
+        assert result["id"] == "bad" and "ValueError" in result["error"]
+        result = replay.replay_game(solver_data, dict(guesses=["54/9=6", "4*3=12"], hints=["++++--", "++++++"]))
+        assert "No answer is consistent" in result["error"]
+
+    def test_replay_stream(self, solver_data):
+        records = [solver_record(solver_data, answer, str(i))
+                   for i, answer in enumerate(["4*7=28", "4*3=12", "10-5=5", "54/9=6", "9*8=72"])]
+        log = io.StringIO("".join(json.dumps(r) + "\n\n" for r in records) + '{"id": "x", "guesses": ["1"]}\n')
+
+        for num_processes in (0, 2):
+            log.seek(0)
+            output = io.StringIO()
+            summary = replay.replay(solver_data, replay.read_records(log), output, num_processes=num_processes,
+                                    batch_size=2, max_batches_in_flight=1)
+            results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+            assert [r["id"] for r in results] == [r["id"] for r in records] + ["x"]
+            assert summary["num_games"] == 6
+            assert summary["num_errors"] == 1
+            assert summary["num_diverged"] == 0
+            assert summary["mean_logged_guesses"] == summary["mean_solver_guesses"]
+
+    def test_replay_stream_malformed_lines(self, solver_data):
+        records = [solver_record(solver_data, answer, str(i)) for i, answer in enumerate(["4*7=28", "4*3=12"])]
+        log = io.StringIO(json.dumps(records[0]) + "\n[1, 2]\n" + json.dumps(records[1])[:-5] + "\n" +
+                          json.dumps(records[1]) + "\n")
+
+        for num_processes in (0, 2):
+            log.seek(0)
+            output = io.StringIO()
+            summary = replay.replay(solver_data, replay.read_records(log), output, num_processes=num_processes,
+                                    batch_size=1, max_batches_in_flight=1)
+            results = [json.loads(line) for line in output.getvalue().splitlines()]
+
+            assert [r["id"] for r in results] == ["0", None, None, "1"]
+            assert "TypeError" in results[1]["error"]
+            assert "JSONDecodeError" in results[2]["error"]
+            assert summary["num_games"] == 4
+            assert summary["num_errors"] == 2
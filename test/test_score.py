@@ -20,6 +20,33 @@ class TestScore:
         assert sgo.score_guess(b"1+9=10", b"1+9=10") == \
             hints_to_score([Hint.CORRECT] * 6)
 
+    def test_score_guess(self):
+        assert s.score_guess("54/9=6", "4*7=28") == sgo.score_guess(b"54/9=6", b"4*7=28")
+        assert s.score_guess("1+9=10", "1+9=10") == hints_to_score([Hint.CORRECT] * 6)
+        assert s.native_scorer() is s.native_scorer()
+
+    def test_score_guesses(self):
+        answers = ["4*7=28", "54/9=6", "1+9=10"]
+        assert list(s.score_guesses("54/9=6", answers)) == [s.score_guess("54/9=6", answer) for answer in answers]
+
+    def test_score_10_12_slots(self):
+        assert s.score_guess("17-9+54=62", "100/4-5=20") == hints_to_score(
+            (Hint.CORRECT, Hint.ABSENT, Hint.PRESENT, Hint.ABSENT, Hint.ABSENT, Hint.PRESENT, Hint.PRESENT,
+             Hint.CORRECT, Hint.ABSENT, Hint.PRESENT))
+        assert s.score_guess("12+34+56=102", "48/6*7+19=75") == hints_to_score(
+            (Hint.PRESENT, Hint.ABSENT, Hint.PRESENT, Hint.ABSENT, Hint.PRESENT, Hint.ABSENT, Hint.PRESENT,
+             Hint.PRESENT, Hint.PRESENT, Hint.ABSENT, Hint.ABSENT, Hint.ABSENT))
+        # Scores of 12 slots need more than 16 bits.
+        assert s.score_guess("12+34+56=102", "12+34+56=102") == hints_to_score([Hint.CORRECT] * 12)
+        assert list(s.score_guesses("48/6*7+19=75", ["12+34+56=102"])) == \
+            [s.score_guess("48/6*7+19=75", "12+34+56=102")]
+
+    def test_score_dtype(self):
+        assert s.score_dtype(8) == "uint16"
+        assert s.score_dtype(10) == "uint32"
+        with pytest.raises(ValueError):
+            s.score_dtype(17)
+
     def test_score_8slots(self):
         assert sgo.score_guess(b"10-43=66",
                                b"12+34=56") == hints_to_score((Hint.CORRECT,
@@ -0,0 +1,103 @@
+"""Nerdle solver service unit tests."""
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import pytest
+
+import nerdle
+import nerdle.service
+
+NUM_SLOTS = 6
+# Initial guesses the service tests play, independent of any saved openers.
+OPENERS = {5: "3+2=5", 6: "54/9=6"}
+
+
+@pytest.fixture()
+def solver_data():
+    return {num_slots: create_solver_data(num_slots) for num_slots in (5, 6)}
+
+
+def create_solver_data(num_slots: int):
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(num_slots))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(num_slots, file_name)
+
+
+class TestService:
+    def test_next_guess_matches_solver(self, solver_data):
+        service = nerdle.service.SolverService(solver_data, initial_guess=OPENERS)
+        solver = nerdle.solver.NerdleSolver(solver_data[NUM_SLOTS])
+        guess_history, hint_history, _ = solver.solve("4*3=12", initial_guess="54/9=6")
+
+        history = []
+        for guess, hint in zip(guess_history, hint_history):
+            assert service.next_guess(NUM_SLOTS, history)[0] == guess
+            history.append((guess, hint))
+        assert service.next_guess(NUM_SLOTS, history)[0] is None
+        assert nerdle.service.SolverService(solver_data, initial_guess={NUM_SLOTS: "4*7=28"}).next_guess(
+            NUM_SLOTS, [])[0] == "4*7=28"
+
+    def test_cache(self, solver_data):
+        service = nerdle.service.SolverService(solver_data, cache=nerdle.cache.GuessCache())
+        history = [("54/9=6", "-?--?-")]
+
+        guess = service.next_guess(NUM_SLOTS, history)
+        assert service.next_guess(NUM_SLOTS, history) == guess
+        assert service.cache.stats()["hits"] == 1
+
+    def test_time_budget(self, solver_data):
+        history = [("54/9=6", "-?--?-")]
+        service = lambda time_budget=None: nerdle.service.SolverService(
+            solver_data, initial_guess=OPENERS, time_budget=time_budget)
+        guess, num_answers = service().next_guess(NUM_SLOTS, history)
+
+        assert service(100).next_guess_status(NUM_SLOTS, history) == (guess, num_answers, True)
+        assert service(0).next_guess_status(NUM_SLOTS, []) == ("54/9=6", 206, True)
+
+    def test_batches_concurrent_requests(self, solver_data):
+        service = nerdle.service.SolverService(solver_data)
+        history = [("54/9=6", "-?--?-")]
+        compute = service._compute
+
+        def slow_compute(*args):
+            # Hold the computation until all requests have arrived.
+            while service.num_requests < 8:
+                time.sleep(0.001)
+            return compute(*args)
+
+        service._compute = slow_compute
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.next_guess(NUM_SLOTS, history)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 1
+        assert service.num_requests == 8
+        assert service.num_computations == 1
+
+    def test_server(self, solver_data):
+        service = nerdle.service.SolverService(solver_data, initial_guess=OPENERS)
+        with nerdle.service.SolverServer(service) as server:
+            client = nerdle.service.SolverClient(server.url)
+
+            assert client.next_guess(NUM_SLOTS, []) == {"guess": "54/9=6", "num_answers": 206}
+            response = client.next_guess(NUM_SLOTS, [["54/9=6", "-?--?-"]])
+            assert response["guess"] is not None
+            assert response["num_answers"] < 206
+            assert client.next_guess(5, [])["guess"] == OPENERS[5]
+
+            with pytest.raises(urllib.error.HTTPError) as e:
+                client.next_guess(7, [])
+            assert e.value.code == 400
+
+            for body in ([], 1, dict(num_slots=NUM_SLOTS, history=5)):
+                request = urllib.request.Request(server.url + "/next_guess", data=json.dumps(body).encode())
+                with pytest.raises(urllib.error.HTTPError) as e:
+                    urllib.request.urlopen(request)
+                assert e.value.code == 400
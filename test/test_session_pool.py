@@ -0,0 +1,157 @@
+"""Browser session pool tests against a fake web driver (no browser needed)."""
+import os
+import urllib.parse
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import nerdle
+import nerdle.client
+from nerdle.client import _BUTTONS_SCRIPT, _CLICK_SCRIPT, _GRID_LABELS_SCRIPT
+from nerdle.score import score_guess
+
+NUM_SLOTS = 6
+ANSWERS = ["4*7=28", "4*3=12", "10-5=5", "54/9=6", "9*8=72"]
+# Keypad button labels of the fake game page, in page order.
+KEYS = list("0123456789") + ["+", "minus", "*", "/", "=", "ENTER"]
+HINT_TO_BUTTON_LABEL = {hint: label for label, hint in nerdle.client.BUTTON_LABEL_TO_HINT.items()}
+
+
+@pytest.fixture()
+def solver_data(monkeypatch):
+    monkeypatch.setattr(nerdle.client, "NUM_SLOTS", NUM_SLOTS)
+    file_name = os.path.join(nerdle.DB_DIR, "nerdle{}.db".format(NUM_SLOTS))
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    return nerdle.solver.create_solver_data(NUM_SLOTS, file_name)
+
+
+def game_url(answer: str) -> str:
+    return "http://localhost/nerdle.html?answer=" + urllib.parse.quote(answer)
+
+
+class FakeDriver:
+    """Plays the local game page of the answer in the loaded URL. Every call raises once the driver is 'dead'."""
+
+    def __init__(self):
+        self.dead = False
+        self.quit_called = False
+        self.num_button_scans = 0
+        self._answer = None
+        self._rows = []
+        self._current = ""
+
+    def get(self, url: str):
+        self._check()
+        self._answer = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)["answer"][0]
+        self._rows = []
+        self._current = ""
+
+    def find_element(self, by, value):
+        self._check()
+        return object()
+
+    def quit(self):
+        self.quit_called = True
+
+    def execute_script(self, script: str, *args):
+        self._check()
+        if script == _BUTTONS_SCRIPT:
+            self.num_button_scans += 1
+            return list(KEYS)
+        if script == _CLICK_SCRIPT:
+            indices, labels, _ = args
+            if any(KEYS[index] != label for index, label in zip(indices, labels)):
+                return False
+            for index in indices:
+                if KEYS[index] == "ENTER":
+                    self._rows.append(self._current)
+                    self._current = ""
+                else:
+                    self._current += "-" if KEYS[index] == "minus" else KEYS[index]
+            return True
+        if script == _GRID_LABELS_SCRIPT:
+            labels = []
+            for row in range(nerdle.client.MAX_GUESSES):
+                if row < len(self._rows):
+                    guess = self._rows[row]
+                    score = score_guess(guess, self._answer)
+                    labels += ["{} {}".format(guess[j], HINT_TO_BUTTON_LABEL[(score >> (2 * j)) & 3])
+                               for j in range(NUM_SLOTS)]
+                else:
+                    labels += ["undefined"] * NUM_SLOTS
+            return labels
+        raise ValueError("Unexpected script")
+
+    def _check(self):
+        if self.dead:
+            raise WebDriverException("Browser crashed")
+
+
+class FakeDriverFactory:
+    """Creates fake drivers until 'fail' is set."""
+
+    def __init__(self):
+        self.drivers = []
+        self.fail = False
+
+    def __call__(self):
+        if self.fail:
+            raise WebDriverException("Cannot start a browser")
+        driver = FakeDriver()
+        self.drivers.append(driver)
+        return driver
+
+
+class TestSessionPool:
+    def test_play_games(self, solver_data):
+        factory = FakeDriverFactory()
+        with nerdle.client.SessionPool(2, driver_factory=factory, warm_url=game_url(ANSWERS[0])) as pool:
+            results = pool.play_games(solver_data, [game_url(answer) for answer in ANSWERS], initial_guess="54/9=6")
+
+        assert [result["url"] for result in results] == [game_url(answer) for answer in ANSWERS]
+        assert all(result["success"] and result["guesses"][-1] == answer for result, answer in zip(results, ANSWERS))
+        assert all(result["guesses"][0] == "54/9=6" for result in results)
+        assert pool.num_recycled == 0
+        assert len(factory.drivers) == 2
+        # The button map of the game page is scanned once per session, when the pool warms it up.
+        assert [driver.num_button_scans for driver in factory.drivers] == [1, 1]
+        assert all(driver.quit_called for driver in factory.drivers)
+
+    def test_recycles_crashed_sessions(self, solver_data):
+        factory = FakeDriverFactory()
+        # A game may draw both crashed sessions before a new one, so it needs two retries.
+        with nerdle.client.SessionPool(2, driver_factory=factory, max_retries=2) as pool:
+            for driver in factory.drivers:
+                driver.dead = True
+            results = pool.play_games(solver_data, [game_url(answer) for answer in ANSWERS], initial_guess="54/9=6")
+
+        # Each crashed session is replaced, and its game is retried in another session.
+        assert all(result["success"] and result["guesses"][-1] == answer for result, answer in zip(results, ANSWERS))
+        assert pool.num_recycled == 2
+        assert len(factory.drivers) == 4
+        assert all(driver.quit_called for driver in factory.drivers)
+
+    def test_no_retry(self, solver_data):
+        factory = FakeDriverFactory()
+        with nerdle.client.SessionPool(2, driver_factory=factory, max_retries=0) as pool:
+            factory.drivers[0].dead = True
+            results = pool.play_games(solver_data, [game_url(answer) for answer in ANSWERS], initial_guess="54/9=6")
+
+        # The game that drew the crashed session fails; the others are played by the remaining and the new session.
+        failed = [result for result in results if not result["success"]]
+        assert len(failed) == 1 and failed[0]["error"].startswith("WebDriverException")
+        assert pool.num_recycled == 1
+        assert len(factory.drivers) == 3
+
+    def test_no_session_left(self, solver_data):
+        factory = FakeDriverFactory()
+        with nerdle.client.SessionPool(2, driver_factory=factory) as pool:
+            factory.fail = True
+            for driver in factory.drivers:
+                driver.dead = True
+            results = pool.play_games(solver_data, [game_url(answer) for answer in ANSWERS], initial_guess="54/9=6")
+
+        assert all(not result["success"] for result in results)
+        assert all("No browser session left" in result["error"] or "WebDriverException" in result["error"]
+                   for result in results)
+        assert any("No browser session left" in result["error"] for result in results)
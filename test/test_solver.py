@@ -1,10 +1,12 @@
 """Nerdle game solver unit tests."""
+import collections
 import ctypes
 import itertools
 import io
 import os
 import pytest
 #from joblib import Parallel, delayed, wrap_non_picklable_objects
+import numpy as np
 from numpy.testing import assert_array_equal
 
 import nerdle
@@ -38,8 +40,51 @@ class TestSolver:
         assert solver_data.score_db.shape == (n, n)
 
         # Parallel version.
-        solver_data = create_solver_data(6, min_parallel_n=n // 2)
-        assert solver_data.score_db.shape == (n, n)
+        parallel_solver_data = create_solver_data(6, min_parallel_n=n // 2)
+        assert_array_equal(parallel_solver_data.score_db, solver_data.score_db)
+
+    def test_create_score_database_parallel(self, solver_data):
+        score_db = nerdle.solver.NerdleData._create_score_database_parallel(
+            solver_data.answers, num_processes=3, dtype="uint16", blocks_per_process=5)
+
+        assert score_db.dtype == "uint16"
+        assert_array_equal(score_db, solver_data.score_db)
+
+    def test_solver_data_score_dtype(self, tmp_path):
+        file_name = str(tmp_path / "nerdle6.db")
+        solver_data = nerdle.solver.create_solver_data(
+            6, file_name, overwrite=True, score_dtype=nerdle.score.score_dtype(6))
+        assert solver_data.score_db.dtype == "uint16"
+        assert nerdle.solver.create_solver_data(6, file_name).score_db.dtype == "uint16"
+        run_solver(solver_data, "4*7=28", "54/9=6", 3)
+
+    def test_update_score_database(self, tmp_path):
+        file_name = str(tmp_path / "nerdle6.db")
+        full = create_solver_data(6)
+        nerdle.solver.create_solver_data(
+            6, file_name, overwrite=True, max_answers=150, score_dtype=nerdle.score.score_dtype(6))
+
+        # Adds answers.
+        stats = nerdle.solver.update_score_database(file_name, full.answers)
+        assert stats == dict(added=56, removed=0, kept=150)
+        solver_data = nerdle.solver.create_solver_data(6, file_name)
+        assert_array_equal(solver_data.answers, full.answers)
+        assert_array_equal(solver_data.score_db, full.score_db)
+        assert solver_data.score_db.dtype == "uint16"
+
+        # Adds and removes answers, so that the kept answers are not contiguous.
+        nerdle.solver.update_score_database(file_name, list(full.answers[::3]) + list(full.answers[1::6]))
+        stats = nerdle.solver.update_score_database(file_name, list(full.answers[::2]) + list(full.answers[:10]))
+        solver_data = nerdle.solver.create_solver_data(6, file_name)
+        keys = np.array([full.key(answer) for answer in solver_data.answers])
+        assert stats["removed"] > 0 and stats["added"] > 0 and stats["kept"] > 0
+        assert_array_equal(solver_data.answers, sorted(solver_data.answers))
+        assert_array_equal(solver_data.score_db, full.score_db[np.ix_(keys, keys)])
+
+        # Updating from the generator through create_solver_data().
+        solver_data = nerdle.solver.create_solver_data(6, file_name, update=True)
+        assert_array_equal(solver_data.answers, full.answers)
+        assert_array_equal(solver_data.score_db, full.score_db)
 
     def test_solve(self, solver_data):
         run_solver(solver_data, "4*7=28", "54/9=6", 3)
@@ -68,6 +113,70 @@ class TestSolver:
         assert len(guess_history) == 3
         assert guess_history[-1] == answer
 
+    def test_solve_approximate(self, solver_data):
+        # Every guess search while more than 10 answers remain samples 50 guesses and 20-column answer samples.
+        for tolerance in (None, 0.1):
+            solver = nerdle.solver.NerdleSolver(solver_data, exact_threshold=10, guess_sample_size=50,
+                                                answer_sample_size=20, tolerance=tolerance, seed=0)
+            guess_history, _, _ = solver.solve("4*3=12", initial_guess="54/9=6")
+            assert guess_history is not None
+            assert guess_history[-1] == "4*3=12"
+
+    def test_solve_approximate_all_answers(self, solver_data):
+        # Once few answers are left, many guesses tie on the estimated bucket size; like the exact search, the
+        # approximate search must prefer a possible answer.
+        for answer_sample_size in (2000, 5):
+            for answer in solver_data.answers:
+                solver = nerdle.solver.NerdleSolver(solver_data, exact_threshold=0,
+                                                    answer_sample_size=answer_sample_size, seed=0)
+                guess_history, _, _ = solver.solve(answer, initial_guess="54/9=6")
+                assert guess_history is not None
+                assert guess_history[-1] == answer
+
+    def test_approximate_best_guess(self, solver_data):
+        # The approximate search evaluates the sampled guesses only and is reproducible given a seed.
+        guesses = [nerdle.solver.NerdleSolver(solver_data, exact_threshold=0, guess_sample_size=50,
+                                              answer_sample_size=20, seed=1).best_guess() for _ in range(2)]
+        assert guesses[0] == guesses[1]
+
+        solver = nerdle.solver.NerdleSolver(solver_data, exact_threshold=1000)
+        solver.best_guess()
+        assert solver._rows_evaluated == len(solver_data.answers)
+
+    def test_update_with_guess(self, solver_data):
+        # A guess outside the answer list filters the same answers as scoring it against every answer.
+        guess, answer = "9*9*9=", "4*7=28"
+        solver = nerdle.solver.NerdleSolver(solver_data)
+        solver.update_with_guess(guess, nerdle.score.score_guess(guess, answer))
+
+        assert solver.num_answers == sum(nerdle.score.score_guess(guess, a) == nerdle.score.score_guess(guess, answer)
+                                         for a in solver_data.answers)
+        guess_history, _, _ = solver.solve(answer, initial_guess=solver.guess_value(solver.best_guess()))
+        assert guess_history[-1] == answer
+
+    def test_time_budget_large_equals_exact(self, solver_data):
+        for answer in ("4*7=28", "4*3=12", "10-5=5"):
+            s = nerdle.solver.NerdleSolver(solver_data, time_budget=100)
+            assert s.solve(answer, initial_guess="54/9=6") == \
+                nerdle.solver.NerdleSolver(solver_data).solve(answer, initial_guess="54/9=6")
+            assert s.last_guess_exact
+
+    def test_time_budget_truncated(self, solver_data, monkeypatch):
+        monkeypatch.setattr(nerdle.solver, "ANYTIME_CHUNK_SIZE", 1)
+        metrics = nerdle.metrics.MetricsAggregator()
+        cache = nerdle.cache.GuessCache()
+        s = nerdle.solver.NerdleSolver(solver_data, metrics=metrics, cache=cache, time_budget=0)
+
+        guess_key = s.make_guess(s.guess_key("54/9=6"), nerdle.score.hint_string_to_score("-?--?-"))
+
+        # Only the first chunk (one row), a possible answer, was evaluated.
+        assert not s.last_guess_exact
+        assert s._rows_evaluated == 1
+        assert guess_key == s._answer_keys[0]
+        assert metrics.records[-1]["exact"] is False
+        assert metrics.summary()["truncated"] == 1
+        assert cache.stats()["size"] == 0
+
 
 def run_solver(
         solver_data,
@@ -81,3 +190,50 @@ def run_solver(
     assert guess_history is not None
     assert len(guess_history) == num_guesses
     assert guess_history[-1] == answer
+
+
+class TestMultiBoardSolver:
+    def test_solve(self, solver_data):
+        answers = ["4*7=28", "4*3=12", "10-5=5", "54/9=6"]
+        solver = nerdle.solver.MultiBoardNerdleSolver(solver_data, len(answers))
+
+        guess_history, hint_history, answer_size_history = solver.solve(answers, initial_guess="54/9=6")
+
+        assert guess_history is not None
+        assert set(answers) <= set(guess_history)
+        assert guess_history[-1] in answers
+        assert len(hint_history) == len(guess_history)
+        assert all(solver.solved)
+        assert answer_size_history[-1] == [1 if answer == guess_history[-1] else 0 for answer in answers]
+
+    def test_worst_bucket_sizes(self, solver_data):
+        score_db = solver_data.score_db
+        all_correct = nerdle.score.hints_to_score([nerdle.score.Hint.CORRECT] * NUM_SLOTS)
+        boards = [np.arange(0, 206, 3), np.arange(1, 50), np.array([5])]
+        columns = np.concatenate(boards)
+        board_of_column = np.repeat(np.arange(len(boards)), [len(b) for b in boards])
+
+        # Small chunks exercise the chunked loop.
+        worst = nerdle.solver._worst_bucket_sizes(
+            score_db, columns, board_of_column, len(boards), NUM_SLOTS, max_chunk_size=1000)
+
+        expected = [[max(collections.Counter(x for x in score_db[guess, b] if x != all_correct).values(), default=0)
+                     for b in boards] for guess in range(score_db.shape[0])]
+        assert_array_equal(worst, expected)
+
+
+class TestOnlineSolver:
+    def test_solve(self):
+        solver = nerdle.solver.OnlineNerdleSolver(6)
+        guess_history, _, _ = solver.solve("4*7=28", initial_guess="54/9=6")
+        assert guess_history is not None
+        assert guess_history[-1] == "4*7=28"
+
+    def test_solve_10_slots(self):
+        for answer in ("84-5+19=98", "16-6*1-1=9"):
+            solver = nerdle.solver.OnlineNerdleSolver(10, seed=0)
+            guess_history, hint_history, answer_size_history = solver.solve(answer)
+            assert guess_history is not None
+            assert guess_history[0] == nerdle.solver.INITIAL_GUESS[10]
+            assert guess_history[-1] == answer
+            assert answer_size_history[-1] == 1